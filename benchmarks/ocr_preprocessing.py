@@ -0,0 +1,75 @@
+"""Compare fixed-scale and glyph-height adaptive OCR preprocessing on a labelled corpus.
+
+Usage: python benchmarks/ocr_preprocessing.py [ground_truth.json]
+
+Always reports the pixels sent to Tesseract and the preprocessing time; OCR time and
+accuracy are added when Tesseract is installed.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+from number_detector.application.evaluation import PageScores, load_labelled_pages, score_result
+from number_detector.application.settings import DetectionSettings
+from number_detector.infrastructure.bootstrap import create_scan_single_image_use_case
+from number_detector.infrastructure.imaging import OpenCVRedDetector
+from number_detector.infrastructure.ocr import TesseractService
+from number_detector.infrastructure.runtime import TESSERACT_CMD, check_tesseract_installed
+
+MODES = {
+    "fixed": DetectionSettings(ocr_adaptive_scale=False, ocr_cascade=False),
+    "adaptive": DetectionSettings(ocr_adaptive_scale=True, ocr_cascade=False),
+}
+
+
+def _prep_cost(settings: DetectionSettings, images: list) -> tuple[int, float]:
+    detector = OpenCVRedDetector(settings)
+    service = TesseractService(TESSERACT_CMD, settings=settings)
+    jobs = [
+        (detector.find_part_regions, settings.ocr_part_glyph_px, 2.5),
+        (detector.find_motor_regions, settings.ocr_motor_glyph_px, 2.5),
+        (detector.find_free_text_regions, settings.ocr_free_text_glyph_px, 2.5),
+        (detector.find_body_text_regions, settings.ocr_body_text_glyph_px, 3.0),
+    ]
+    pixels = 0
+    elapsed = 0.0
+    for img in images:
+        for find, glyph_px, scale in jobs:
+            for region in find(img):
+                t0 = time.perf_counter()
+                pixels += service._prep(region.image, scale=scale, glyph_px=glyph_px).size
+                elapsed += time.perf_counter() - t0
+    return pixels, elapsed
+
+
+def main(argv: list[str]) -> None:
+    corpus = Path(argv[1]) if len(argv) > 1 else Path(__file__).with_name("ground_truth.json")
+    pages = load_labelled_pages(corpus)
+    images = [cv2.imread(str(page.image)) for page in pages]
+    has_tesseract = check_tesseract_installed()
+
+    print(f"{'mode':<10}{'Mpx OCR':>10}{'prep s':>9}{'scan s/pag':>12}{'recall num':>12}{'recall txt':>12}")
+    for mode, settings in MODES.items():
+        pixels, prep_s = _prep_cost(settings, images)
+        row = f"{mode:<10}{pixels / 1e6:>10.2f}{prep_s:>9.3f}"
+        if has_tesseract:
+            use_case = create_scan_single_image_use_case(settings)
+            total = PageScores()
+            t0 = time.perf_counter()
+            for page in pages:
+                total.add(score_result(use_case.execute(page.image), page))
+            per_page = (time.perf_counter() - t0) / len(pages)
+            row += f"{per_page:>12.2f}{total.parts.recall:>12.1%}{total.texts.recall:>12.1%}"
+        print(row)
+
+    if not has_tesseract:
+        print("Tesseract no disponible: solo se mide el coste de preprocesado.")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,100 @@
+"""Pages/second against part-number recall and precision for named pipeline configurations.
+
+Usage: python benchmarks/pareto_report.py [ground_truth.json] [--repeat N] [--csv pareto.csv]
+                                          [--config nombre=ajustes.json ...] [--only nombre ...]
+
+Every configuration runs the labelled corpus (repeated ``--repeat`` times, so the pool warms up)
+through the same ``ProcessFolderUseCase`` as a scan, Excel export included. The table marks the
+Pareto frontier (``*``: no other configuration is at least as fast, as accurate and as precise);
+the CSV holds the same points for plotting. Without Tesseract only detection runs, so only the
+throughput column is meaningful.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from number_detector.application.evaluation import PageScores, load_labelled_pages, pareto_front, score_result
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.settings_profile import load_settings_profile
+from number_detector.infrastructure.bootstrap import create_process_folder_use_case
+from number_detector.infrastructure.runtime import check_tesseract_installed
+
+# OCR backend (cascade or full pass only), preprocessing, detection resolution and executor/batching mode.
+CONFIGS: dict[str, dict[str, object]] = {
+    "base": {},
+    "cascada": {"ocr_cascade": True},
+    "escala-adaptativa": {"ocr_adaptive_scale": True},
+    "coarse-2": {"coarse_factor": 2},
+    "sin-censo": {"census_enabled": False},
+    "1-proceso": {"workers": 1},
+    "sin-lectura-anticipada": {"prefetch_threads": 0},
+    "memoria-compartida": {"shm_slots": 8},
+}
+
+
+def run_config(settings: DetectionSettings, pages, repeat: int, work_dir: Path) -> tuple[float, PageScores]:
+    """(pages per second, summed scores) of one configuration over the corpus."""
+    by_name = {page.image.stem: page for page in pages}
+    images = [page.image for page in pages] * repeat
+    work_dir.mkdir(parents=True, exist_ok=True)
+    uc = create_process_folder_use_case(settings=settings)
+    t0 = time.perf_counter()
+    results, _ = uc.execute(input_dir=pages[0].image.parent, output_dir=work_dir, images=images)
+    elapsed = time.perf_counter() - t0
+    scores = PageScores()
+    for result in results:
+        scores.add(score_result(result, by_name[result.image_name]))
+    return len(results) / elapsed, scores
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus", nargs="?", default=str(Path(__file__).with_name("ground_truth.json")))
+    parser.add_argument("--repeat", type=int, default=3, help="Veces que se recorre el corpus por configuración")
+    parser.add_argument("--csv", default="pareto.csv", help="Puntos para graficar")
+    parser.add_argument("--config", action="append", default=[], metavar="NOMBRE=AJUSTES.json",
+                        help="Añade una configuración desde un perfil de ajustes; repetible")
+    parser.add_argument("--only", action="append", help="Ejecuta solo estas configuraciones; repetible")
+    args = parser.parse_args()
+
+    pages = load_labelled_pages(args.corpus)
+    has_tesseract = check_tesseract_installed()
+    base = DetectionSettings(journal_enabled=False, run_ocr=has_tesseract)
+    configs = {name: replace(base, **changes) for name, changes in CONFIGS.items()}
+    for spec in args.config:
+        name, _, path = spec.partition("=")
+        configs[name] = replace(load_settings_profile(path, base), journal_enabled=False, run_ocr=has_tesseract)
+    if args.only:
+        configs = {name: configs[name] for name in args.only}
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, settings in configs.items():
+            pages_s, scores = run_config(settings, pages, args.repeat, Path(tmp) / name)
+            rows.append((name, pages_s, scores.parts.recall, scores.parts.precision, scores.texts.recall))
+            print(f"{name}: {pages_s:.2f} pág/s")
+
+    frontier = pareto_front([(pages_s, recall, precision) for _, pages_s, recall, precision, _ in rows])
+    print()
+    print(f"{'configuración':<24}{'pág/s':>8}{'recall num':>12}{'prec num':>10}{'recall txt':>12}  frontera")
+    for (name, pages_s, recall, precision, text_recall), best in zip(rows, frontier):
+        print(f"{name:<24}{pages_s:>8.2f}{recall:>12.1%}{precision:>10.1%}{text_recall:>12.1%}  {'*' if best else ''}")
+
+    with open(args.csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["config", "pages_per_second", "part_recall", "part_precision", "text_recall", "pareto"])
+        for (name, *values), best in zip(rows, frontier):
+            writer.writerow([name, *(f"{v:.4f}" for v in values), int(best)])
+    print(f"\nPuntos guardados en {args.csv}")
+    if not has_tesseract:
+        print("Tesseract no disponible: solo se mide la detección (recall/precisión no significativos).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""Soak test: a large synthetic folder through ``ProcessFolderUseCase`` with a stub OCR.
+
+Usage: python benchmarks/soak.py [--images 100000] [--variants 64] [--dir soak_input] [--csv soak.csv]
+
+Writes ``--variants`` distinct pages (the test fixtures, shifted and with a red callout drawn on
+them) and hard-links them up to ``--images`` files. The folder is then scanned like the CLI does,
+with real decoding and detection, but the OCR is a stub that returns fixed text, so Tesseract is not
+needed. While the scan runs, a sampler records RSS (parent and workers), open file descriptors and
+images/second. The run fails (exit code 1) when, after the warm-up:
+
+- the workers' RSS grows more than ``--max-worker-mb`` per 1000 images;
+- the parent's RSS grows more than ``--max-parent-mb`` per 1000 images (the parent keeps every
+  result for the Excel, so some growth is expected);
+- open file descriptors keep growing;
+- throughput in the last quarter of the run falls more than ``--max-slowdown`` below the first quarter.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import shutil
+import sys
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.use_cases.scan_single_image_use_case import ScanSingleImageUseCase
+from number_detector.infrastructure.bootstrap import create_process_folder_use_case
+from number_detector.infrastructure.imaging import OpenCVImageReader, OpenCVRedDetector
+
+FIXTURES = Path(__file__).resolve().parents[1] / "tests" / "fixtures"
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+class StubOcr:
+    """Fixed text per region class: exercises parsing and export without Tesseract."""
+
+    def read_digits(self, image) -> str:
+        return "47"
+
+    def read_text(self, image) -> str:
+        return "CAXA 1.4 TSI"
+
+    read_motor_text = read_text
+
+    def read_free_text(self, image) -> str:
+        return "Plug-in Hybrid"
+
+    def read_body_text(self, image) -> str:
+        return "Station Wagon"
+
+
+@lru_cache(maxsize=1)
+def _stub_use_case(settings_items: tuple) -> ScanSingleImageUseCase:
+    settings = DetectionSettings(**dict(settings_items))
+    detector = OpenCVRedDetector(settings=settings)
+    return ScanSingleImageUseCase(
+        image_reader=OpenCVImageReader(coarse_factor=settings.coarse_factor),
+        detector=detector,
+        ocr=StubOcr(),
+        settings=settings,
+        census=detector,
+    )
+
+
+def stub_scan_one(image_path: str, settings_dict: dict, debug: bool, debug_dir: str | None, data=None, name=None):
+    return _stub_use_case(tuple(settings_dict.items())).execute(image_path, data, name)
+
+
+def make_folder(folder: Path, images: int, variants: int, seed: int = 0) -> None:
+    """``variants`` distinct JPEG pages, hard-linked (or copied) up to ``images`` files."""
+    folder.mkdir(parents=True, exist_ok=True)
+    existing = len(list(folder.glob("*.jpg")))
+    if existing >= images:
+        return
+    rng = np.random.default_rng(seed)
+    sources = [cv2.imread(str(p)) for p in sorted(FIXTURES.glob("test*.jpg"))]
+    originals = []
+    for i in range(variants):
+        page = np.roll(sources[i % len(sources)], shift=(int(rng.integers(-40, 40)), int(rng.integers(-40, 40))),
+                       axis=(0, 1))
+        x, y = int(rng.integers(200, 1600)), int(rng.integers(300, 900))
+        cv2.putText(page, str(int(rng.integers(10, 9999))), (x, y), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 230), 3)
+        path = folder / f"v{i:04d}.jpg"
+        cv2.imwrite(str(path), page, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        originals.append(path)
+    for n in range(variants, images):
+        target = folder / f"p{n:06d}.jpg"
+        if target.exists():
+            continue
+        source = originals[n % variants]
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+
+
+def _children(pid: int) -> list[int]:
+    out = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        try:
+            out += [int(c) for c in (task / "children").read_text().split()]
+        except OSError:
+            pass
+    return out
+
+
+def _rss_mb(pid: int) -> float:
+    try:
+        pages = int(Path(f"/proc/{pid}/statm").read_text().split()[1])
+    except (OSError, IndexError):
+        return 0.0
+    return pages * PAGE_SIZE / 2**20
+
+
+def _fds(pid: int) -> int:
+    try:
+        return len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return 0
+
+
+class Sampler(threading.Thread):
+    """Every ``interval`` seconds: (t, images done, parent RSS MB, workers RSS MB, parent fds, worker fds)."""
+
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.done = 0
+        self.samples: list[tuple[float, int, float, float, int, int]] = []
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        pid = os.getpid()
+        t0 = time.perf_counter()
+        while not self._halt.wait(self.interval):
+            workers = _children(pid)
+            self.samples.append((
+                time.perf_counter() - t0,
+                self.done,
+                _rss_mb(pid),
+                sum(_rss_mb(w) for w in workers),
+                _fds(pid),
+                sum(_fds(w) for w in workers),
+            ))
+
+    def stop(self) -> None:
+        self._halt.set()
+        self.join()
+
+
+def _slope_per_1k(xs: list[float], ys: list[float]) -> float:
+    """Least-squares slope of ``ys`` per 1000 units of ``xs``."""
+    if len(xs) < 2 or max(xs) == min(xs):
+        return 0.0
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    num = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    den = sum((x - mx) ** 2 for x in xs)
+    return num / den * 1000
+
+
+def _rate(samples) -> float:
+    (t0, d0, *_), (t1, d1, *_) = samples[0], samples[-1]
+    return (d1 - d0) / (t1 - t0) if t1 > t0 else 0.0
+
+
+def check(samples, args) -> list[str]:
+    """Failed checks (empty = pass) over the samples taken after the warm-up."""
+    # from the warm-up to the last image, while the pool is up (the Excel export afterwards does not count)
+    finished = next((i for i, s in enumerate(samples) if s[1] == samples[-1][1]), len(samples))
+    steady = [s for s in samples[:finished + 1] if s[1] >= args.warmup and s[3] > 0]
+    if len(steady) < 8:
+        return [f"Muy pocas muestras tras el calentamiento ({len(steady)}): usa más imágenes o --interval menor"]
+    done = [s[1] for s in steady]
+    failures = []
+    worker_growth = _slope_per_1k(done, [s[3] for s in steady])
+    parent_growth = _slope_per_1k(done, [s[2] for s in steady])
+    print(f"RSS workers: {worker_growth:+.2f} MB/1000 imágenes · RSS proceso principal: {parent_growth:+.2f} MB/1000")
+    if worker_growth > args.max_worker_mb:
+        failures.append(f"La memoria de los workers crece {worker_growth:.2f} MB/1000 imágenes (> {args.max_worker_mb})")
+    if parent_growth > args.max_parent_mb:
+        failures.append(f"La memoria del proceso principal crece {parent_growth:.2f} MB/1000 imágenes "
+                        f"(> {args.max_parent_mb})")
+    quarter = len(steady) // 4
+    first_fds, last_fds = sum(steady[quarter][4:]), sum(steady[-1][4:])
+    if last_fds > first_fds + args.max_fd_growth:
+        failures.append(f"Descriptores abiertos: {first_fds} -> {last_fds}")
+    first, last = _rate(steady[:quarter + 1]), _rate(steady[-quarter - 1:])
+    print(f"Ritmo: {first:.1f} img/s al principio · {last:.1f} img/s al final")
+    if first and last < first * (1 - args.max_slowdown):
+        failures.append(f"El ritmo cae de {first:.1f} a {last:.1f} img/s (> {args.max_slowdown:.0%})")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", type=int, default=100_000)
+    parser.add_argument("--variants", type=int, default=64, help="Páginas distintas (el resto son enlaces)")
+    parser.add_argument("--dir", default="soak_input", help="Carpeta de entrada (se reutiliza si ya existe)")
+    parser.add_argument("--output", default="soak_output")
+    parser.add_argument("--workers", type=int, default=0, help="0 = ajustes por defecto")
+    parser.add_argument("--interval", type=float, default=2.0, help="Segundos entre muestras")
+    parser.add_argument("--warmup", type=int, default=1000, help="Imágenes antes de empezar a medir")
+    parser.add_argument("--max-worker-mb", type=float, default=1.0)
+    parser.add_argument("--max-parent-mb", type=float, default=8.0)
+    parser.add_argument("--max-fd-growth", type=int, default=16)
+    parser.add_argument("--max-slowdown", type=float, default=0.25)
+    parser.add_argument("--csv", default="soak.csv", help="Muestras tomadas")
+    args = parser.parse_args()
+
+    folder = Path(args.dir)
+    t0 = time.perf_counter()
+    make_folder(folder, args.images, args.variants)
+    print(f"Carpeta lista: {args.images} imágenes en {folder} ({time.perf_counter() - t0:.0f} s)")
+
+    settings = DetectionSettings(journal_enabled=False)
+    if args.workers:
+        settings.workers = args.workers
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    uc = create_process_folder_use_case(settings=settings, scan_one=stub_scan_one)
+
+    sampler = Sampler(args.interval)
+
+    def on_progress(done: int, total: int, filename: str) -> None:
+        sampler.done = done
+
+    sampler.start()
+    start = time.perf_counter()
+    results, excel_path = uc.execute(input_dir=folder, output_dir=output, on_progress=on_progress)
+    elapsed = time.perf_counter() - start
+    sampler.stop()
+
+    errors = sum(1 for r in results if r.error)
+    print(f"{len(results)} imágenes en {elapsed:.0f} s ({len(results) / elapsed:.1f} img/s), {errors} con error")
+    with open(args.csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["seconds", "images", "parent_rss_mb", "workers_rss_mb", "parent_fds", "workers_fds"])
+        writer.writerows(sampler.samples)
+
+    failures = check(sampler.samples, args)
+    if errors:
+        failures.append(f"{errors} imágenes con error")
+    for failure in failures:
+        print(f"FALLO: {failure}", file=sys.stderr)
+    print("OK" if not failures else f"{len(failures)} comprobaciones fallidas")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,161 +1,146 @@
+"""
+Ajuste interactivo de las máscaras de color del detector (una clase de región cada vez).
+
+Usa el propio detector del paquete (``PreviewPipeline``): la máscara, la dilatación y las cajas que se
+muestran son las de ``find_*_bboxes``. Solo se recalcula al mover un control y solo las etapas afectadas;
+por defecto trabaja sobre una decodificación reducida de la página (tecla ``f`` = resolución completa).
+El resultado se guarda como perfil de ajustes (.json) que leen la GUI y ``number-detector-cli scan --settings``.
+
+    python hsv_mask_tuner.py input/pagina.jpg --class motors --settings ajustes.json --save ajustes.json
+"""
+
+import argparse
+from dataclasses import asdict, replace
+from pathlib import Path
+
 import cv2
-import numpy as np
-
-# =========================
-# CONFIG BÁSICA
-# =========================
-IMAGE_PATH = "input/TEST_4.jpg"  # <- cambia esto a tu ruta
-
-img = cv2.imread(IMAGE_PATH)
-if img is None:
-    raise FileNotFoundError(f"No se pudo leer la imagen: {IMAGE_PATH}")
-
-hsv_img = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
-
-win_controls = "HSV Controls"
-win_mask = "Mask"
-win_overlay = "Overlay"
-win_image = "Image (click to sample HSV)"
-
-# =========================
-# UTILIDADES
-# =========================
-def nothing(_=None):
-    pass
-
-def clamp(v, lo, hi):
-    return max(lo, min(hi, v))
-
-def on_mouse(event, x, y, flags, param):
-    if event == cv2.EVENT_LBUTTONDOWN:
-        h, s, v = hsv_img[y, x]
-        b, g, r = img[y, x]
-        print(f"[CLICK] x={x}, y={y}  HSV(OpenCV)={int(h)},{int(s)},{int(v)}  BGR={int(b)},{int(g)},{int(r)}")
-        # Sugerencia: centra un rango alrededor de H con +-5..10
-        # (OJO: H está en 0-179)
-        hmin = clamp(int(h) - 10, 0, 179)
-        hmax = clamp(int(h) + 10, 0, 179)
-        smin = clamp(int(s) - 60, 0, 255)
-        vmin = clamp(int(v) - 60, 0, 255)
-
-        cv2.setTrackbarPos("H min", win_controls, hmin)
-        cv2.setTrackbarPos("H max", win_controls, hmax)
-        cv2.setTrackbarPos("S min", win_controls, smin)
-        cv2.setTrackbarPos("V min", win_controls, vmin)
-        print(f"      Sugerido: H[{hmin},{hmax}] S>={smin} V>={vmin}")
-
-def get_trackbar(name):
-    return cv2.getTrackbarPos(name, win_controls)
-
-# =========================
-# UI: Trackbars
-# =========================
-cv2.namedWindow(win_controls, cv2.WINDOW_NORMAL)
-cv2.resizeWindow(win_controls, 520, 260)
-
-cv2.createTrackbar("H min", win_controls, 90, 179, nothing)
-cv2.createTrackbar("H max", win_controls, 130, 179, nothing)
-cv2.createTrackbar("S min", win_controls, 50, 255, nothing)
-cv2.createTrackbar("S max", win_controls, 255, 255, nothing)
-cv2.createTrackbar("V min", win_controls, 50, 255, nothing)
-cv2.createTrackbar("V max", win_controls, 255, 255, nothing)
-
-# Morfología / unión de letras (clave para texto)
-cv2.createTrackbar("Open iters",  win_controls, 1, 5, nothing)
-cv2.createTrackbar("Close iters", win_controls, 2, 8, nothing)
-
-# Dilatación horizontal para unir palabras en una línea
-cv2.createTrackbar("Dilate X", win_controls, 25, 80, nothing)  # ancho kernel
-cv2.createTrackbar("Dilate Y", win_controls, 3, 30, nothing)   # alto kernel
-cv2.createTrackbar("Dilate iters", win_controls, 1, 5, nothing)
-
-# =========================
-# Ventanas de visualización
-# =========================
-cv2.namedWindow(win_image, cv2.WINDOW_NORMAL)
-cv2.namedWindow(win_mask, cv2.WINDOW_NORMAL)
-cv2.namedWindow(win_overlay, cv2.WINDOW_NORMAL)
-
-cv2.resizeWindow(win_image, 900, 600)
-cv2.resizeWindow(win_mask, 900, 600)
-cv2.resizeWindow(win_overlay, 900, 600)
-
-cv2.setMouseCallback(win_image, on_mouse)
-
-print("Controles:")
-print("- Mueve sliders para ajustar la máscara.")
-print("- Click en el texto azul para imprimir HSV y auto-ajustar rangos base.")
-print("- Teclas:  q/ESC = salir,  p = imprimir parámetros actuales")
-
-# =========================
-# Loop principal
-# =========================
-while True:
-    hmin = get_trackbar("H min")
-    hmax = get_trackbar("H max")
-    smin = get_trackbar("S min")
-    smax = get_trackbar("S max")
-    vmin = get_trackbar("V min")
-    vmax = get_trackbar("V max")
-
-    # Asegura min <= max
-    if hmin > hmax:
-        hmin, hmax = hmax, hmin
-        cv2.setTrackbarPos("H min", win_controls, hmin)
-        cv2.setTrackbarPos("H max", win_controls, hmax)
-    if smin > smax:
-        smin, smax = smax, smin
-        cv2.setTrackbarPos("S min", win_controls, smin)
-        cv2.setTrackbarPos("S max", win_controls, smax)
-    if vmin > vmax:
-        vmin, vmax = vmax, vmin
-        cv2.setTrackbarPos("V min", win_controls, vmin)
-        cv2.setTrackbarPos("V max", win_controls, vmax)
-
-    lower = np.array([hmin, smin, vmin], dtype=np.uint8)
-    upper = np.array([hmax, smax, vmax], dtype=np.uint8)
-
-    mask = cv2.inRange(hsv_img, lower, upper)
-
-    # Morfología
-    open_iters = get_trackbar("Open iters")
-    close_iters = get_trackbar("Close iters")
-
-    k3 = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-    if open_iters > 0:
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, k3, iterations=open_iters)
-    if close_iters > 0:
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, k3, iterations=close_iters)
-
-    # Dilatación para unir caracteres/palabras
-    dx = max(1, get_trackbar("Dilate X"))
-    dy = max(1, get_trackbar("Dilate Y"))
-    dil_iters = get_trackbar("Dilate iters")
-
-    k_line = cv2.getStructuringElement(cv2.MORPH_RECT, (dx, dy))
-    if dil_iters > 0:
-        mask_d = cv2.dilate(mask, k_line, iterations=dil_iters)
-    else:
-        mask_d = mask.copy()
-
-    # Overlay: pinta lo detectado sobre la imagen
-    overlay = img.copy()
-    colored = cv2.bitwise_and(img, img, mask=mask_d)
-    overlay = cv2.addWeighted(overlay, 0.7, colored, 0.9, 0)
-
-    # Mostrar
-    cv2.imshow(win_image, img)
-    cv2.imshow(win_mask, mask_d)
-    cv2.imshow(win_overlay, overlay)
-
-    key = cv2.waitKey(15) & 0xFF
-    if key in (27, ord('q')):  # ESC o q
-        break
-    if key == ord('p'):
-        print("=== PARÁMETROS ACTUALES ===")
-        print(f"lower = np.array([{hmin}, {smin}, {vmin}])")
-        print(f"upper = np.array([{hmax}, {smax}, {vmax}])")
-        print(f"open_iters={open_iters}, close_iters={close_iters}")
-        print(f"dilate_kernel=({dx},{dy}), dilate_iters={dil_iters}")
-
-cv2.destroyAllWindows()
+
+from number_detector.application.constants import REGION_CLASSES
+from number_detector.application.settings import DetectionSettings, scale_pixel_settings
+from number_detector.application.settings_profile import load_settings_profile, save_settings_profile
+from number_detector.infrastructure.imaging import OpenCVImageReader
+from number_detector.infrastructure.preview import DILATE_FIELDS, MASK_FIELDS, PreviewPipeline, render_preview
+
+WIN_CONTROLS = "Controles"
+WIN_MASK = "Mascara"
+WIN_OVERLAY = "Cajas (click = muestrear HSV)"
+
+
+def controls(region_class: str, settings: DetectionSettings) -> list[tuple[str, str, int | None, int, float]]:
+    """Trackbars of a class: (label, settings field, tuple index or None, max position, units per position)."""
+    out = []
+    for name in (*MASK_FIELDS[region_class], *DILATE_FIELDS[region_class]):
+        value = getattr(settings, name)
+        if isinstance(value, tuple):
+            out += [(f"{name}[{i}]", name, i, 61, 1) for i in range(len(value))]
+        elif isinstance(value, float):
+            out.append((name, name, None, 100, 0.01))
+        elif name.endswith("_iters"):
+            out.append((name, name, None, 8, 1))
+        else:
+            out.append((name, name, None, 179 if "_h_" in name else 255, 1))
+    return out
+
+
+def read_controls(specs, settings: DetectionSettings) -> DetectionSettings:
+    changes: dict[str, object] = {}
+    for label, name, index, _, unit in specs:
+        pos = cv2.getTrackbarPos(label, WIN_CONTROLS)
+        if index is None:
+            changes[name] = round(pos * unit, 2) if isinstance(unit, float) else pos
+        else:
+            kernel = list(changes.get(name, getattr(settings, name)))
+            kernel[index] = max(1, pos)
+            changes[name] = tuple(kernel)
+    return replace(settings, **changes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ajuste interactivo de máscaras de color")
+    parser.add_argument("image", help="Imagen de prueba")
+    parser.add_argument("--class", dest="region_class", choices=REGION_CLASSES, default="parts")
+    parser.add_argument("--settings", help="Perfil de ajustes de partida (.json)")
+    parser.add_argument("--save", default="ajustes.json", help="Dónde guardar el perfil (tecla s)")
+    parser.add_argument("--preview-factor", type=int, choices=(1, 2, 4, 8), default=2,
+                        help="Reducción de la vista previa (1 = resolución completa)")
+    args = parser.parse_args()
+
+    loaded = load_settings_profile(args.settings) if args.settings else DetectionSettings()
+    base = replace(loaded, enabled_classes=(args.region_class,))  # preview only the tuned class
+    factor = args.preview_factor
+
+    preview_page = OpenCVImageReader(coarse_factor=factor).read(Path(args.image))
+    if preview_page is None:
+        raise FileNotFoundError(f"No se pudo leer la imagen: {args.image}")
+    preview = PreviewPipeline()
+    preview.set_page(preview_page if factor == 1 else preview_page.coarse, Path(args.image))
+    full: PreviewPipeline | None = None  # decoded on the first 'f'
+
+    specs = controls(args.region_class, base)
+    cv2.namedWindow(WIN_CONTROLS, cv2.WINDOW_NORMAL)
+    cv2.resizeWindow(WIN_CONTROLS, 520, 40 * len(specs))
+    for label, name, index, maximum, unit in specs:
+        value = getattr(base, name) if index is None else getattr(base, name)[index]
+        cv2.createTrackbar(label, WIN_CONTROLS, min(maximum, round(value / unit)), maximum, lambda _: None)
+    for win in (WIN_MASK, WIN_OVERLAY):
+        cv2.namedWindow(win, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(win, 900, 600)
+
+    state = {"full_res": False, "dilated": True, "shown": None}
+
+    def on_mouse(event, x, y, flags, param):
+        if event != cv2.EVENT_LBUTTONDOWN:
+            return
+        pipeline = full if state["full_res"] else preview
+        b, g, r = (int(c) for c in pipeline.page[y, x])
+        h, s, v = (int(c) for c in cv2.cvtColor(pipeline.page[y:y + 1, x:x + 1], cv2.COLOR_BGR2HSV)[0, 0])
+        print(f"[CLICK] x={x}, y={y}  HSV(OpenCV)={h},{s},{v}  BGR={b},{g},{r}")
+
+    cv2.setMouseCallback(WIN_OVERLAY, on_mouse)
+
+    print("Controles:")
+    print("- Mueve los controles para ajustar la máscara de la clase.")
+    print("- Teclas: q/ESC = salir, f = resolución completa/reducida, d = máscara dilatada/sin dilatar,")
+    print(f"          s = guardar perfil en {args.save}, p = imprimir ajustes cambiados")
+
+    while True:
+        settings = read_controls(specs, base)
+        view = (settings, state["full_res"], state["dilated"])
+        if view != state["shown"]:
+            if state["full_res"]:
+                if full is None:
+                    full = PreviewPipeline()
+                    full.load(args.image)
+                pipeline, tuned = full, settings
+            else:
+                pipeline, tuned = preview, settings if factor == 1 else scale_pixel_settings(settings, factor)
+            result = pipeline.run(tuned)
+            mask = pipeline.mask(tuned, args.region_class, dilated=state["dilated"])
+            cv2.imshow(WIN_MASK, mask)
+            cv2.imshow(WIN_OVERLAY, render_preview(pipeline.page, result))
+            boxes = len(result.boxes[args.region_class])
+            print(f"{boxes} cajas · recalculado: {', '.join(result.recomputed) or 'nada'}")
+            state["shown"] = view
+
+        key = cv2.waitKey(30) & 0xFF
+        if key in (27, ord("q")):
+            break
+        if key == ord("f"):
+            state["full_res"] = not state["full_res"]
+        if key == ord("d"):
+            state["dilated"] = not state["dilated"]
+        if key == ord("s"):
+            path = save_settings_profile(replace(settings, enabled_classes=loaded.enabled_classes), args.save)
+            print(f"Perfil guardado en {path}")
+        if key == ord("p"):
+            defaults = asdict(DetectionSettings())
+            changed = {k: v for k, v in asdict(settings).items() if k != "enabled_classes" and v != defaults[k]}
+            print("=== AJUSTES CAMBIADOS ===")
+            for k, v in changed.items():
+                print(f"{k} = {v!r}")
+
+    cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+from number_detector.application.settings import DetectionSettings
+
+# Peak bytes per pixel of a page in a worker: the decoded BGR frame, plus about eight frame-sized
+# intermediates of OpenCVRedDetector (HSV, channel planes, masks, dilation, scratch buffers).
+FRAME_BYTES_PER_PIXEL = 3
+INTERMEDIATE_BYTES_PER_PIXEL = 8 * 3
+# Smallest band the low-memory path tiles a page into
+MIN_TILE_PIXELS = 1_000_000
+
+
+def _frame_bytes(pixels: int, factor: int) -> int:
+    """The full-resolution frame, plus the coarse decode detection runs on."""
+    return pixels * FRAME_BYTES_PER_PIXEL + (pixels // (factor * factor) * FRAME_BYTES_PER_PIXEL if factor > 1 else 0)
+
+
+def peak_page_bytes(width: int, height: int, settings: DetectionSettings) -> int:
+    """Estimated peak memory of scanning a ``width`` x ``height`` page with ``settings``.
+
+    Detection intermediates cover the coarse decode (``coarse_factor``) and, on pages large enough
+    to be tiled, only one band of ``tile_pixels``; the full-resolution frame is always decoded.
+    """
+    pixels = width * height
+    factor = max(1, settings.coarse_factor)
+    work = pixels // (factor * factor)
+    if settings.tile_pixels > 0 and work > 2 * settings.tile_pixels:
+        work = settings.tile_pixels
+    return _frame_bytes(pixels, factor) + work * INTERMEDIATE_BYTES_PER_PIXEL
+
+
+def low_memory_settings(width: int, height: int, settings: DetectionSettings, budget: int) -> DetectionSettings:
+    """``settings`` with tiles small enough for the page's estimate to fit ``budget`` (down to ``MIN_TILE_PIXELS``)."""
+    if peak_page_bytes(width, height, settings) <= budget:
+        return settings
+    frame = _frame_bytes(width * height, max(1, settings.coarse_factor))
+    tile = max(MIN_TILE_PIXELS, (budget - frame) // INTERMEDIATE_BYTES_PER_PIXEL)
+    if settings.tile_pixels > 0:
+        tile = min(tile, settings.tile_pixels)
+    return replace(settings, tile_pixels=tile)
+
+
+class MemoryAdmission:
+    """Admits pages while the sum of their estimated peaks stays under ``budget`` bytes.
+
+    A page is always admitted when nothing else is in flight, so a page larger than the budget
+    runs alone instead of waiting forever.
+    """
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.in_flight = 0
+        self.pages = 0
+
+    def try_admit(self, cost: int) -> bool:
+        if self.pages and self.in_flight + cost > self.budget:
+            return False
+        self.in_flight += cost
+        self.pages += 1
+        return True
+
+    def release(self, cost: int) -> None:
+        self.in_flight -= cost
+        self.pages -= 1
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class ConcurrencyStep:
+    """One measurement window: pages/second completed while ``limit`` tasks were allowed in flight."""
+
+    limit: int
+    pages_per_second: float
+    pages: int
+
+
+class HillClimbingLimit:
+    """In-flight task limit tuned online by hill climbing on completed pages per second.
+
+    Starts at ``start`` and measures throughput over windows of at least ``window_seconds`` and a
+    few completions per task in flight; the first window is a warm-up. After each window the limit
+    takes one step in the current direction while throughput beats the best level so far by more
+    than ``tolerance`` (or, at a higher level, stays within ``tolerance`` of the fastest window, so a
+    flat curve never settles on a low level); otherwise it turns around and probes the other side of
+    that level. After ``max_reversals`` turns it settles on the best level and stops moving.
+    :attr:`history` is the measured throughput curve.
+    """
+
+    def __init__(
+        self,
+        minimum: int,
+        maximum: int,
+        start: int | None = None,
+        window_seconds: float = 2.0,
+        tolerance: float = 0.05,
+        max_reversals: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(self.maximum, max(self.minimum, start if start is not None else self.minimum))
+        self.window_seconds = window_seconds
+        self.tolerance = tolerance
+        self.max_reversals = max_reversals
+        self.clock = clock
+        self.history: list[ConcurrencyStep] = []
+        self.settled = self.minimum == self.maximum
+        self._direction = 1
+        self._step = max(1, (self.maximum - self.minimum) // 8)
+        self._best: ConcurrencyStep | None = None
+        self._peak = 0.0  # fastest window so far
+        self._reversals = 0
+        self._window_start = clock()
+        self._window_pages = 0
+        self._warmed_up = False
+
+    def completed(self, count: int = 1) -> None:
+        """Record finished tasks; closes the measurement window (and may move the limit) when it is long enough."""
+        if self.settled:
+            return
+        self._window_pages += count
+        elapsed = self.clock() - self._window_start
+        if self._window_pages < max(4, 2 * self.limit) or elapsed < self.window_seconds:
+            return
+        step = ConcurrencyStep(self.limit, self._window_pages / elapsed, self._window_pages)
+        self._window_start, self._window_pages = self.clock(), 0
+        if not self._warmed_up:  # the first window pays for the pool start-up
+            self._warmed_up = True
+            return
+        self.history.append(step)
+        self._peak = max(self._peak, step.pages_per_second)
+
+        best = self._best
+        if (
+            best is None
+            or step.pages_per_second > best.pages_per_second * (1 + self.tolerance)
+            or (step.limit > best.limit and step.pages_per_second >= self._peak * (1 - self.tolerance))
+        ):
+            self._best = step
+        else:
+            self._turn()
+        if not self.settled:
+            self._move()
+
+    def _turn(self) -> None:
+        self._reversals += 1
+        self._direction = -self._direction
+        if self._reversals >= self.max_reversals:
+            self._settle()
+
+    def _move(self) -> None:
+        """Step from the best level in the current direction; at a bound, probe the other side instead."""
+        for _ in range(2):
+            target = self._best.limit + self._direction * self._step
+            if self.minimum <= target <= self.maximum:
+                self.limit = target
+                return
+            self._turn()
+            if self.settled:
+                return
+        self._settle()
+
+    def _settle(self) -> None:
+        self.settled = True
+        if self._best is not None:
+            self.limit = self._best.limit
+
+
+def format_concurrency_report(limiter: HillClimbingLimit) -> list[str]:
+    """Human readable lines for logs and the CLI: the chosen level and the measured curve."""
+    if not limiter.history:
+        return []
+    state = "estable" if limiter.settled else "sin estabilizar"
+    lines = [f"Concurrencia: {limiter.limit} tareas en vuelo ({state})"]
+    lines += [f"  {s.limit:>3} en vuelo: {s.pages_per_second:.2f} pág/s ({s.pages} págs)" for s in limiter.history]
+    return lines
@@ -2,3 +2,12 @@ from __future__ import annotations
 
 
 DEFAULT_OUTPUT_FILENAME = "numeros_rojos.xlsx"
+DEFAULT_DB_FILENAME = "numeros_rojos.sqlite"
+DEFAULT_JOURNAL_FILENAME = "numeros_rojos.journal.jsonl"
+
+# Region classes handled by the detector, in scan order.
+PARTS = "parts"
+MOTORS = "motors"
+FREE_TEXT = "free_text"
+BODY_TEXT = "body_text"
+REGION_CLASSES = (PARTS, MOTORS, FREE_TEXT, BODY_TEXT)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Callable, Sequence
+
+HASH_BITS = 64
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two perceptual hashes."""
+    return (a ^ b).bit_count()
+
+
+def _chunks(value: int, count: int) -> list[int]:
+    """``value`` split into ``count`` non-empty runs of bits (widths differing by at most one)."""
+    width, wider = divmod(HASH_BITS, count)
+    chunks = []
+    shift = 0
+    for i in range(count):
+        bits = width + (i < wider)
+        chunks.append((value >> shift) & ((1 << bits) - 1))
+        shift += bits
+    return chunks
+
+
+def cluster_duplicates(
+    hashes: Sequence[int | None],
+    max_distance: int,
+    same_page: Callable[[int, int], bool] | None = None,
+) -> list[int]:
+    """Representative index of each entry of ``hashes``, clustering hashes within ``max_distance`` bits.
+
+    Entries are taken in order and join the first earlier representative close enough to them (and,
+    with ``same_page(representative, entry)``, confirmed by it), else become one; ``None`` (a page that
+    could not be hashed) is always its own representative. Candidates are looked up by splitting hashes
+    into ``max_distance + 1`` chunks: two hashes within the distance share at least one chunk exactly,
+    so only representatives with a common chunk are compared.
+    """
+    count = min(HASH_BITS, max(0, max_distance) + 1)
+    index: dict[tuple[int, int], list[int]] = defaultdict(list)
+    representatives: list[int] = []
+    for i, value in enumerate(hashes):
+        rep = i
+        if value is not None:
+            chunks = _chunks(value, count)
+            candidates = sorted({j for pos, chunk in enumerate(chunks) for j in index.get((pos, chunk), ())})
+            rep = next(
+                (
+                    j for j in candidates
+                    if hamming(value, hashes[j]) <= max_distance and (same_page is None or same_page(j, i))
+                ),
+                i,
+            )
+            if rep == i:
+                for pos, chunk in enumerate(chunks):
+                    index[(pos, chunk)].append(i)
+        representatives.append(rep)
+    return representatives
+
+
+def duplicate_groups(representatives: Sequence[int]) -> dict[int, list[int]]:
+    """Indices of the copies of each representative that has any, in order."""
+    groups: dict[int, list[int]] = defaultdict(list)
+    for i, rep in enumerate(representatives):
+        if rep != i:
+            groups[rep].append(i)
+    return dict(groups)
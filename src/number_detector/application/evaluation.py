@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Sequence
+
+from number_detector.domain.models.detection_result import DetectionResult
+
+
+@dataclass(frozen=True)
+class LabelledPage:
+    """Expected detections for one page of a labelled corpus."""
+
+    image: Path
+    part_numbers: frozenset[int] = frozenset()
+    parts_exhaustive: bool = False  # only then do extra part numbers count as false positives
+    motor_texts: tuple[str, ...] = ()  # substrings expected among the motor codes
+    free_text: tuple[str, ...] = ()
+    body_text: tuple[str, ...] = ()
+
+
+@dataclass
+class Score:
+    true_positives: int = 0
+    false_negatives: int = 0
+    false_positives: int = 0
+
+    @property
+    def recall(self) -> float:
+        expected = self.true_positives + self.false_negatives
+        return self.true_positives / expected if expected else 1.0
+
+    @property
+    def precision(self) -> float:
+        found = self.true_positives + self.false_positives
+        return self.true_positives / found if found else 1.0
+
+    def add(self, other: Score) -> None:
+        self.true_positives += other.true_positives
+        self.false_negatives += other.false_negatives
+        self.false_positives += other.false_positives
+
+
+@dataclass
+class PageScores:
+    parts: Score = field(default_factory=Score)
+    texts: Score = field(default_factory=Score)
+
+    def add(self, other: PageScores) -> None:
+        self.parts.add(other.parts)
+        self.texts.add(other.texts)
+
+
+def load_labelled_pages(path: str | Path) -> list[LabelledPage]:
+    """Load a labelled corpus JSON; image paths are relative to the JSON file."""
+    p = Path(path)
+    data = json.loads(p.read_text(encoding="utf-8"))
+    return [
+        LabelledPage(
+            image=(p.parent / page["image"]).resolve(),
+            part_numbers=frozenset(page.get("part_numbers", [])),
+            parts_exhaustive=page.get("parts_exhaustive", False),
+            motor_texts=tuple(page.get("motor_texts", [])),
+            free_text=tuple(page.get("free_text", [])),
+            body_text=tuple(page.get("body_text", [])),
+        )
+        for page in data["pages"]
+    ]
+
+
+def _score_texts(expected: tuple[str, ...], found: list[str]) -> Score:
+    hits = sum(1 for text in expected if any(text in f for f in found))
+    return Score(true_positives=hits, false_negatives=len(expected) - hits)
+
+
+def score_result(result: DetectionResult, page: LabelledPage) -> PageScores:
+    """Part numbers are scored as sets; texts by substring, so they only count recall."""
+    found = set(result.part_numbers)
+    parts = Score(
+        true_positives=len(found & page.part_numbers),
+        false_negatives=len(page.part_numbers - found),
+        false_positives=len(found - page.part_numbers) if page.parts_exhaustive else 0,
+    )
+    texts = Score()
+    texts.add(_score_texts(page.motor_texts, result.motor_codes))
+    texts.add(_score_texts(page.free_text, result.free_text))
+    texts.add(_score_texts(page.body_text, result.body_text))
+    return PageScores(parts=parts, texts=texts)
+
+
+def pareto_front(points: Sequence[Sequence[float]]) -> list[bool]:
+    """Which points are Pareto-optimal when every coordinate is maximized (no other point is at least
+    as good everywhere and better somewhere)."""
+    def dominates(a: Sequence[float], b: Sequence[float]) -> bool:
+        return all(x >= y for x, y in zip(a, b)) and any(x > y for x, y in zip(a, b))
+
+    return [not any(dominates(other, point) for other in points) for point in points]
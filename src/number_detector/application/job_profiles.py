@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+from number_detector.application.constants import MOTORS, PARTS, REGION_CLASSES
+from number_detector.application.settings import DetectionSettings
+
+
+@dataclass(frozen=True)
+class JobProfile:
+    label: str  # shown in the GUI
+    enabled_classes: tuple[str, ...]
+    run_ocr: bool = True
+
+
+DEFAULT_JOB_PROFILE = "full"
+
+JOB_PROFILES: dict[str, JobProfile] = {
+    "full": JobProfile("Completo", REGION_CLASSES),
+    "parts": JobProfile("Solo números rojos", (PARTS,)),
+    "motors": JobProfile("Solo motores", (MOTORS,)),
+    "detect-only": JobProfile("Solo detección (sin OCR)", REGION_CLASSES, run_ocr=False),
+}
+
+
+def apply_job_profile(settings: DetectionSettings, name: str) -> DetectionSettings:
+    """Return a copy of ``settings`` restricted to the classes/stages of the named profile."""
+    try:
+        profile = JOB_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown job profile: {name!r}") from None
+    return replace(settings, enabled_classes=profile.enabled_classes, run_ocr=profile.run_ocr)
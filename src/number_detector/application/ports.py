@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Protocol
+from typing import Any, Iterable, Protocol
 
+from number_detector.domain.models.archive_member import ArchiveMember
+from number_detector.domain.models.detection_result import DetectionResult
 from number_detector.domain.models.image_region import ImageRegion
 
 
@@ -10,8 +12,46 @@ Image = Any
 
 
 class ImageReader(Protocol):
-    def read(self, image_path: str | Path) -> Image | None:
-        """Read an image from disk or return None when it cannot be opened."""
+    def read(self, source: str | Path | bytes | object) -> Image | None:
+        """Read an image from disk (or decode its file bytes, map a ``FrameHandoff`` handle, or
+        decode one ``TiffPage``) or return None when it cannot be opened."""
+
+
+class PageCounter(Protocol):
+    def count_pages(self, image_path: Path) -> int:
+        """Return the number of pages (frames) in a multi-page image file, reading headers only."""
+
+
+class ArchiveReader(Protocol):
+    def is_archive(self, path: Path) -> bool:
+        """Whether ``path`` is an archive whose images can be scanned in place."""
+
+    def list_members(self, archive: Path, extensions: Iterable[str]) -> list[ArchiveMember]:
+        """Image members (by file extension) of ``archive``, reading only its index."""
+
+    def read_member(self, item: ArchiveMember) -> bytes:
+        """Bytes of one member; raises OSError when it cannot be read."""
+
+    def close(self) -> None:
+        """Close the archives opened to read members."""
+
+
+class PageSizer(Protocol):
+    def page_size(self, item: object, data: object | None = None) -> tuple[int, int] | None:
+        """(width, height) of a work item from its header (or its already fetched ``data``), without
+        decoding the pixels; None when it cannot be told."""
+
+
+class PageHasher(Protocol):
+    def page_hash(self, item: object, data: object | None = None) -> int | None:
+        """64-bit perceptual hash of a work item from a reduced-size decode (or its already fetched
+        ``data``); near-identical pages differ in few bits. None when it cannot be computed."""
+
+    def page_thumbnail(self, item: object, data: object | None = None) -> object | None:
+        """Reduced copy of a work item for :meth:`same_page`; None when it cannot be decoded."""
+
+    def same_page(self, a: object, b: object) -> bool:
+        """Whether two :meth:`page_thumbnail` copies are the same page up to re-encoding, compared pixel by pixel."""
 
 
 class OcrReader(Protocol):
@@ -45,6 +85,59 @@ class RedRegionDetector(Protocol):
         """Find pink body-text regions to OCR."""
 
 
+class ColorCensus(Protocol):
+    def present_classes(self, image: Image) -> set[str]:
+        """Return the region classes (see ``REGION_CLASSES``) whose colors appear in the image."""
+
+
+class FrameHandoff(Protocol):
+    """Hands decoded pages to worker processes without pickling the pixels (e.g. shared memory)."""
+
+    def __enter__(self) -> FrameHandoff:
+        """Allocate the shared frame storage."""
+
+    def __exit__(self, *exc) -> None:
+        """Free the shared frame storage, including slots still leased."""
+
+    def lease(self, data: bytes) -> object | None:
+        """Decode image file bytes into shared storage and return a picklable handle for ``ImageReader.read``,
+        or None when the frame cannot be handed off (the caller passes ``data`` instead)."""
+
+    def release(self, lease: object) -> None:
+        """Give back the storage of a handle returned by :meth:`lease`."""
+
+
 class ResultsExporter(Protocol):
-    def export(self, rows: list[list[object]], output_path: str | Path) -> Path:
-        """Persist exported result rows and return the destination path."""
+    def export(
+        self,
+        rows: list[list[object]],
+        output_path: str | Path,
+        detection_rows: list[list[object]] | None = None,
+        duplicate_rows: list[list[object]] | None = None,
+    ) -> Path:
+        """Persist exported result rows (optionally one row per detection, and per page copied from a
+        duplicate) and return the destination path."""
+
+
+class ResultSink(Protocol):
+    """Receives each scan result as soon as it is available (e.g. a results database)."""
+
+    def add(self, result: DetectionResult, source: str = "", item: str = "") -> None:
+        """Record one result; ``source`` is the scanned folder it came from and ``item`` the work item's
+        key within it (see ``item_key``), which unlike ``image_name`` is unique in the source."""
+
+    def close(self) -> None:
+        """Flush pending results and release the sink."""
+
+
+class ResultJournal(Protocol):
+    """Checkpoint of a batch run, written as each work item finishes, used to resume the run."""
+
+    def completed(self) -> dict[str, DetectionResult]:
+        """Results already journaled (by work item key) that don't need scanning again."""
+
+    def record(self, item: str, result: DetectionResult) -> None:
+        """Durably append the result of work item ``item``."""
+
+    def close(self) -> None:
+        """Flush and close the journal."""
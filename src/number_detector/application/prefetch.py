@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterator, Sequence
+
+from number_detector.domain.models.archive_member import ArchiveMember
+from number_detector.domain.models.list_images_result import ImageItem
+from number_detector.domain.models.tiff_page import TiffPage
+
+ReadPayload = Callable[[ImageItem], object]
+
+
+def _read_file(path: Path) -> bytes:
+    return path.read_bytes()
+
+
+def _size_hint(path: ImageItem) -> int:
+    if isinstance(path, ArchiveMember):
+        return path.size
+    if isinstance(path, TiffPage):
+        return 0  # decoded page by page in the worker, never read ahead
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+class ReadAhead:
+    """Read the bytes of upcoming files on a small thread pool, ahead of the consumer.
+
+    Yields ``(index, path, data)`` in input order. At most ``max_bytes`` (by file size) are held
+    ahead of demand between being read and :meth:`release` being called for their index; once
+    the consumer asks for an item that was not read ahead it is read on demand. ``data`` is
+    whatever ``read`` returns (the file bytes by default), or ``None`` when the read failed,
+    leaving the consumer to open (and report) the path itself.
+    Iteration and :meth:`release` must happen on the same thread.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[ImageItem],
+        threads: int = 4,
+        max_bytes: int = 256 * 1024 * 1024,
+        read: ReadPayload = _read_file,
+    ):
+        self.paths = list(paths)
+        self.max_bytes = max_bytes
+        self._read = read
+        self._pool = ThreadPoolExecutor(max_workers=max(1, threads), thread_name_prefix="read-ahead")
+        self._pending: deque[tuple[int, Future[object]]] = deque()
+        self._held: dict[int, int] = {}
+        self._next = 0
+        self.held_bytes = 0
+
+    def _submit_next(self, size: int) -> None:
+        self._pending.append((self._next, self._pool.submit(self._read, self.paths[self._next])))
+        self._held[self._next] = size
+        self.held_bytes += size
+        self._next += 1
+
+    def _fill(self) -> None:
+        while self._next < len(self.paths):
+            size = _size_hint(self.paths[self._next])
+            if self._held and self.held_bytes + size > self.max_bytes:
+                return
+            self._submit_next(size)
+
+    def __iter__(self) -> Iterator[tuple[int, ImageItem, object | None]]:
+        self._fill()
+        while self._pending or self._next < len(self.paths):
+            if not self._pending:
+                # The consumer wants more than the budget allows read ahead: read on demand.
+                self._submit_next(_size_hint(self.paths[self._next]))
+            idx, fut = self._pending.popleft()
+            try:
+                data = fut.result()
+            except OSError:
+                data = None
+            if data is None:
+                self.release(idx)
+            yield idx, self.paths[idx], data
+            self._fill()
+
+    def release(self, index: int) -> None:
+        """Return the budget held by item ``index`` once the consumer is done with its data."""
+        self.held_bytes -= self._held.pop(index, 0)
+        self._fill()
+
+    def close(self) -> None:
+        for _, fut in self._pending:
+            fut.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> ReadAhead:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
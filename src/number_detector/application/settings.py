@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+from dataclasses import asdict, dataclass, replace
+
+from number_detector.application.constants import REGION_CLASSES
 
 
 @dataclass
 class DetectionSettings:
     """All detection settings that can be tweaked from the GUI."""
 
+    # Job profile: which region classes to scan and whether to OCR them (see job_profiles.py)
+    enabled_classes: tuple[str, ...] = REGION_CLASSES
+    run_ocr: bool = True
+
     # HSV thresholds (UI sliders)
     s_min: int = 150
     v_min: int = 150
@@ -15,8 +23,69 @@ class DetectionSettings:
     min_part_digits: int = 2
     max_part_digits: int = 6
 
-    # Parallelism
-    workers: int = 10
+    # OCR cascade: cheap native-scale pass first, escalate to the heavy pass on failure (off until its
+    # recall/precision has been measured on the labelled corpus, see benchmarks/pareto_report.py)
+    ocr_cascade: bool = False
+    ocr_fast_scale: float = 1.0
+    ocr_fast_min_confidence: float = 70.0
+
+    # OCR preprocessing: resize each ROI so its median glyph height hits a per-class target (off until
+    # checked against the labelled corpus; off = the fixed 2.5x/3x upscale)
+    ocr_adaptive_scale: bool = False
+    ocr_part_glyph_px: int = 50
+    ocr_motor_glyph_px: int = 30
+    ocr_free_text_glyph_px: int = 30
+    ocr_body_text_glyph_px: int = 36
+    ocr_min_stroke_px: float = 2.0
+    ocr_min_scale: float = 0.5
+    ocr_max_scale: float = 3.0
+
+    # Coarse-to-fine: detect on a 1/2 or 1/4 reduced decode, crop ROIs from full resolution (1 = off)
+    coarse_factor: int = 1
+
+    # Tiled detection: pages above 2x this many pixels are processed in overlapping bands (0 = off)
+    tile_pixels: int = 16_000_000
+
+    # Color census: skip classes with (almost) no pixels on a downsampled copy of the page
+    census_enabled: bool = True
+    census_downscale: int = 4
+    census_min_pixels: int = 8
+
+    # Parallelism: worker processes (0 = one per available CPU, cgroup/affinity aware); each worker's
+    # OpenCV and Tesseract threads share what is left, so workers x threads never exceeds the CPUs
+    workers: int = 0
+    pin_workers: bool = False  # bind each worker (and its Tesseract processes) to its own CPUs
+    # Pages in flight: tuned during the run by hill climbing on pages/second, from one per worker down to
+    # 1 when fewer pages at once scan faster (off = always 2 x workers, one queued per worker)
+    adaptive_concurrency: bool = True
+
+    # RAM budget for the pages in flight, estimated from their headers (0 = 3/4 of the machine's or the
+    # container's memory); a page that does not fit alone is tiled more finely, and runs alone if it must
+    memory_budget_mb: int = 0
+
+    # Duplicate pages: hash every page (pHash of a reduced decode) before the run; pages within this many
+    # differing bits of an earlier one, and equal to it pixel by pixel at 1/4 size (catalog pages sharing
+    # a layout can differ only in a few small red numbers), get its result instead of being scanned
+    dedupe_pages: bool = False
+    dedupe_max_distance: int = 8
+
+    # Read-ahead: image bytes are read by this many threads, up to this many bytes ahead (0 = off)
+    prefetch_threads: int = 4
+    prefetch_bytes: int = 256 * 1024 * 1024
+
+    # Add a "Detecciones" sheet to the Excel: one row per detected region (class, box, text, confidence)
+    export_detections: bool = False
+
+    # Checkpoint every result to <output>/numeros_rojos.journal.jsonl so an interrupted run can resume
+    journal_enabled: bool = True
+
+    # Also stream results into <output>/numeros_rojos.sqlite (see SqliteResultsStore)
+    export_sqlite: bool = False
+
+    # Shared-memory handoff: read-ahead threads decode pages into this many fixed-size slots and
+    # workers map them instead of decoding (0 = off; needs prefetch_threads > 0)
+    shm_slots: int = 0
+    shm_slot_bytes: int = 64 * 1024 * 1024
 
     # RGB red dominance (helps with washed-out reds / compression)
     red_rgb_delta: int = 35
@@ -26,6 +95,12 @@ class DetectionSettings:
     text_dilate_kernel: tuple[int, int] = (3, 3)
     text_dilate_iters: int = 1
 
+    # Leader-line removal before dilation (thin/long red components)
+    line_max_h: int = 8
+    line_min_aspect: float = 12.0
+    line_long_aspect: float = 25.0
+    line_long_max_area: int = 2000
+
     # Callout bbox filtering (avoid big red text blocks)
     part_min_h: int = 18
     part_max_w: int = 120
@@ -80,3 +155,42 @@ class DetectionSettings:
     body_text_max_h: int = 220
     body_text_min_area: int = 150
     body_text_roi_padding: int = 8
+
+
+# Settings measured in pixels (lengths) and in pixel areas; everything else is a ratio or color.
+PIXEL_LENGTH_FIELDS = (
+    "line_max_h",
+    "part_min_h", "part_max_w", "part_max_h", "part_merge_gap",
+    "motor_min_w", "motor_min_h", "motor_max_w", "motor_max_h",
+    "free_text_min_w", "free_text_min_h", "free_text_max_w", "free_text_max_h",
+    "body_text_min_w", "body_text_min_h", "body_text_max_w", "body_text_max_h",
+)
+PIXEL_AREA_FIELDS = ("line_long_max_area", "motor_min_area", "free_text_min_area", "body_text_min_area")
+KERNEL_FIELDS = ("text_dilate_kernel", "motor_dilate_kernel", "free_text_dilate_kernel", "body_text_dilate_kernel")
+
+
+# Settings that change how a run uses the machine but not what it finds; a run interrupted with
+# other values can still be resumed.
+RESOURCE_FIELDS = (
+    "workers", "pin_workers", "adaptive_concurrency", "memory_budget_mb", "prefetch_threads",
+    "prefetch_bytes", "export_detections", "journal_enabled", "export_sqlite", "shm_slots", "shm_slot_bytes",
+)
+
+
+def settings_fingerprint(settings: DetectionSettings) -> str:
+    """Hash of the settings that affect scan results (everything but ``RESOURCE_FIELDS``)."""
+    values = {k: v for k, v in asdict(settings).items() if k not in RESOURCE_FIELDS}
+    return hashlib.sha256(json.dumps(values, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def scale_pixel_settings(settings: DetectionSettings, factor: float) -> DetectionSettings:
+    """Copy of ``settings`` for an image downscaled by ``factor``: lengths / factor, areas / factor²."""
+    changes: dict[str, object] = {}
+    for name in PIXEL_LENGTH_FIELDS:
+        changes[name] = max(1, round(getattr(settings, name) / factor))
+    for name in PIXEL_AREA_FIELDS:
+        changes[name] = max(1, round(getattr(settings, name) / factor ** 2))
+    for name in KERNEL_FIELDS:
+        # keep the dilation reach (k - 1) / 2 proportional rather than the kernel width itself
+        changes[name] = tuple(max(1, round((k - 1) / factor) + 1) for k in getattr(settings, name))
+    return replace(settings, **changes)
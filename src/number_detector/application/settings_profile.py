@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, fields, replace
+from pathlib import Path
+
+from number_detector.application.settings import DetectionSettings
+
+
+def settings_to_dict(settings: DetectionSettings) -> dict[str, object]:
+    return {name: list(value) if isinstance(value, tuple) else value for name, value in asdict(settings).items()}
+
+
+def settings_from_dict(data: dict[str, object], base: DetectionSettings | None = None) -> DetectionSettings:
+    """``base`` (default: the defaults) with the values in ``data``; lists become tuples again."""
+    base = base or DetectionSettings()
+    known = {f.name for f in fields(DetectionSettings)}
+    unknown = sorted(set(data) - known)
+    if unknown:
+        raise ValueError(f"Unknown detection settings: {', '.join(unknown)}")
+    changes = {}
+    for name, value in data.items():
+        default = getattr(base, name)
+        if isinstance(default, tuple):
+            value = tuple(value)
+        elif isinstance(default, float) and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if type(value) is not type(default):
+            raise ValueError(f"{name}: expected {type(default).__name__}, got {value!r}")
+        changes[name] = value
+    return replace(base, **changes)
+
+
+def save_settings_profile(settings: DetectionSettings, path: str | Path) -> Path:
+    """Write ``settings`` as a JSON settings profile (read back by :func:`load_settings_profile`)."""
+    path = Path(path)
+    path.write_text(json.dumps(settings_to_dict(settings), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+def load_settings_profile(path: str | Path, base: DetectionSettings | None = None) -> DetectionSettings:
+    """Read a JSON settings profile; fields it leaves out keep their value in ``base``."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: a settings profile is a JSON object")
+    return settings_from_dict(data, base)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of a :class:`StageGraph`.
+
+    ``run(params, *inputs)`` computes the output from the outputs of the ``inputs`` stages; it may
+    only read the ``fields`` of ``params`` (e.g. ``DetectionSettings``), which key its memo.
+    """
+
+    name: str
+    run: Callable[..., Any]
+    inputs: tuple[str, ...] = ()
+    fields: tuple[str, ...] = ()
+
+
+class StageGraph:
+    """Memoized pipeline: each stage output is cached on its own fields plus its inputs' keys.
+
+    Evaluating a stage after a parameter change recomputes only the stages that read that field
+    and the stages downstream of them; everything upstream is served from the cache. Each stage
+    keeps its last ``cache_size`` outputs (1 = just the current one; outputs may be whole-page
+    masks). :attr:`recomputed` lists the stages actually run since :meth:`reset_stats`.
+    """
+
+    def __init__(self, stages: Iterable[Stage], cache_size: int = 1):
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in self.stages.values():
+            missing = [name for name in stage.inputs if name not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name!r} depends on unknown stages {missing}")
+        self.cache_size = cache_size
+        self._cache: dict[str, OrderedDict[Hashable, Any]] = {name: OrderedDict() for name in self.stages}
+        self.recomputed: list[str] = []
+
+    def key(self, name: str, params: object) -> Hashable:
+        """Memo key of stage ``name``: its field values and, recursively, its inputs' keys."""
+        stage = self.stages[name]
+        own = tuple(getattr(params, field) for field in stage.fields)
+        return own, tuple(self.key(dep, params) for dep in stage.inputs)
+
+    def evaluate(self, name: str, params: object) -> Any:
+        key = self.key(name, params)
+        cache = self._cache[name]
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        stage = self.stages[name]
+        value = stage.run(params, *(self.evaluate(dep, params) for dep in stage.inputs))
+        self.recomputed.append(name)
+        cache[key] = value
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def reset_stats(self) -> None:
+        self.recomputed = []
+
+    def clear(self) -> None:
+        """Drop every cached output (e.g. when the input page changes)."""
+        for cache in self._cache.values():
+            cache.clear()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from collections import Counter
+
+from number_detector.application.constants import REGION_CLASSES
+from number_detector.domain.models.detection_result import DetectionResult
+
+
+def merge_stage_metrics(results: list[DetectionResult]) -> dict[str, int]:
+    """Sum the per-image stage counters of a batch run."""
+    total: Counter[str] = Counter()
+    for r in results:
+        total.update(r.metrics)
+    return dict(total)
+
+
+def escalation_rates(metrics: dict[str, int]) -> dict[str, float]:
+    """Share of fast-pass OCR reads that had to be escalated, per region class."""
+    rates: dict[str, float] = {}
+    for region_class in REGION_CLASSES:
+        fast = metrics.get(f"ocr.{region_class}.fast", 0)
+        if fast:
+            rates[region_class] = metrics.get(f"ocr.{region_class}.escalated", 0) / fast
+    return rates
+
+
+def format_stage_metrics(metrics: dict[str, int]) -> list[str]:
+    """Human readable summary lines for logs and the CLI."""
+    lines: list[str] = []
+    for region_class, rate in escalation_rates(metrics).items():
+        fast = metrics[f"ocr.{region_class}.fast"]
+        escalated = metrics.get(f"ocr.{region_class}.escalated", 0)
+        lines.append(f"OCR {region_class}: {escalated}/{fast} escalados ({rate:.0%})")
+    for region_class in REGION_CLASSES:
+        skipped = metrics.get(f"census.{region_class}.skipped", 0)
+        if skipped:
+            lines.append(f"Censo {region_class}: omitido en {skipped} imágenes")
+    low_memory = metrics.get("memory.low_memory", 0)
+    if low_memory:
+        lines.append(f"Memoria: {low_memory} imágenes escaneadas en franjas más pequeñas para no pasar del presupuesto")
+    duplicates = metrics.get("dedupe.skipped", 0)
+    if duplicates:
+        lines.append(f"Duplicados: {duplicates} imágenes iguales a otra (salvo la codificación), con su resultado copiado sin escanearlas")
+    return lines
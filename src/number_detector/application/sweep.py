@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import itertools
+import random
+from dataclasses import dataclass, field, fields
+from typing import Sequence
+
+from number_detector.application.evaluation import PageScores
+from number_detector.application.settings import DetectionSettings
+
+# One candidate of a sweep: the settings fields it changes on the base settings.
+Candidate = dict[str, object]
+
+_TRUE = ("1", "true", "si", "sí", "yes")
+_FALSE = ("0", "false", "no")
+
+
+def _parse_value(name: str, text: str, default: object) -> object:
+    text = text.strip()
+    if isinstance(default, bool):
+        if text.lower() in _TRUE:
+            return True
+        if text.lower() in _FALSE:
+            return False
+        raise ValueError(f"{name}: expected a boolean, got {text!r}")
+    if isinstance(default, tuple):
+        return tuple(int(part) for part in text.lower().split("x"))
+    return type(default)(text)
+
+
+def _parse_range(name: str, text: str, default: object) -> list[object]:
+    """``start:stop:step``, both ends included."""
+    start, stop, step = (_parse_value(name, part, default) for part in text.split(":"))
+    if step <= 0 or stop < start:
+        raise ValueError(f"{name}: bad range {text!r}")
+    count = int(round((stop - start) / step)) + 1
+    values = [start + i * step for i in range(count)]
+    return [round(v, 6) if isinstance(v, float) else v for v in values]
+
+
+def parse_sweep_axis(spec: str, base: DetectionSettings | None = None) -> tuple[str, list[object]]:
+    """Parse ``field=v1,v2,...`` or ``field=start:stop:step`` (kernels as ``9x5``) into its values."""
+    base = base or DetectionSettings()
+    name, sep, values = spec.partition("=")
+    name = name.strip()
+    if not sep or not values.strip():
+        raise ValueError(f"Expected field=values, got {spec!r}")
+    if name not in {f.name for f in fields(DetectionSettings)}:
+        raise ValueError(f"Unknown detection setting: {name}")
+    default = getattr(base, name)
+    if ":" in values and not isinstance(default, (bool, tuple)):
+        parsed = _parse_range(name, values, default)
+    else:
+        parsed = [_parse_value(name, v, default) for v in values.split(",") if v.strip()]
+    return name, list(dict.fromkeys(parsed))
+
+
+def grid_candidates(axes: dict[str, list[object]]) -> list[Candidate]:
+    """Every combination of the axes' values."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+
+
+def random_candidates(axes: dict[str, list[object]], count: int, seed: int | None = None) -> list[Candidate]:
+    """Up to ``count`` distinct combinations drawn at random from the grid."""
+    names = list(axes)
+    sizes = [len(axes[n]) for n in names]
+    total = 1
+    for size in sizes:
+        total *= size
+    rng = random.Random(seed)
+    picks = rng.sample(range(total), min(count, total))
+    out = []
+    for pick in picks:
+        values = []
+        for size in reversed(sizes):
+            pick, index = divmod(pick, size)
+            values.append(index)
+        out.append({n: axes[n][i] for n, i in zip(names, reversed(values))})
+    return out
+
+
+def order_for_reuse(candidates: list[Candidate], field_order: Sequence[str]) -> list[int]:
+    """Indexes of ``candidates`` sorted so fields early in ``field_order`` (upstream stages) change least often.
+
+    Consecutive candidates then share their upstream stage outputs, which a memo that only
+    keeps the last few outputs per stage can serve from cache.
+    """
+    rank = {name: i for i, name in enumerate(field_order)}
+
+    def key(candidate: Candidate) -> tuple:
+        ordered = sorted(candidate, key=lambda name: (rank.get(name, len(rank)), name))
+        return tuple((name, candidate[name]) for name in ordered)
+    return sorted(range(len(candidates)), key=lambda i: key(candidates[i]))
+
+
+@dataclass
+class SweepResult:
+    """Scores of one candidate over the whole labelled set."""
+
+    changes: Candidate
+    scores: PageScores = field(default_factory=PageScores)
+    pages: int = 0
+    seconds: float = 0.0  # evaluation time with the sweep caches warm (what this candidate added)
+    regions: int = 0  # detected regions, i.e. the ROIs a real scan would send to OCR
+    ocr_reads: int = 0  # ROIs this candidate actually had to OCR (not in the cache yet)
+
+    @property
+    def seconds_per_page(self) -> float:
+        return self.seconds / self.pages if self.pages else 0.0
+
+    @property
+    def regions_per_page(self) -> float:
+        return self.regions / self.pages if self.pages else 0.0
+
+
+def rank_sweep_results(results: list[SweepResult]) -> list[SweepResult]:
+    """Best first: part recall, then part precision, then text recall, then fewer ROIs per page."""
+    return sorted(
+        results,
+        key=lambda r: (
+            -r.scores.parts.recall, -r.scores.parts.precision, -r.scores.texts.recall, r.regions_per_page,
+        ),
+    )
+
+
+def format_sweep_results(results: list[SweepResult]) -> list[str]:
+    """Table lines for the CLI (results already ranked).
+
+    The time column is what each candidate added on top of the stages and OCR reads it shared with
+    the candidates evaluated before it (warm caches), not what a scan with its settings would take.
+    """
+    lines = [f"{'#':>3} {'recall num':>10} {'prec num':>9} {'recall txt':>10} {'ROIs/pag':>9} {'+ms/pag':>8}  ajustes"]
+    for i, r in enumerate(results, 1):
+        changes = " ".join(f"{k}={_format_value(v)}" for k, v in r.changes.items()) or "(base)"
+        lines.append(
+            f"{i:>3} {r.scores.parts.recall:>10.1%} {r.scores.parts.precision:>9.1%} "
+            f"{r.scores.texts.recall:>10.1%} {r.regions_per_page:>9.1f} {r.seconds_per_page * 1000:>8.1f}  {changes}"
+        )
+    lines.append("+ms/pag: tiempo que añade cada combinación con las cachés del barrido calientes")
+    return lines
+
+
+def _format_value(value: object) -> str:
+    if isinstance(value, tuple):
+        return "x".join(str(v) for v in value)
+    return str(value)
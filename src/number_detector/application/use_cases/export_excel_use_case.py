@@ -2,39 +2,62 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from number_detector.application.constants import BODY_TEXT, FREE_TEXT, MOTORS, PARTS
 from number_detector.application.ports import ResultsExporter
+from number_detector.application.settings import DetectionSettings
 from number_detector.domain.models.detection_result import DetectionResult
 
+FILE_COLUMN = "Archivo"
+CLASS_COLUMNS = {PARTS: "Numero", MOTORS: "Motor", BODY_TEXT: "Carroceria", FREE_TEXT: "Free text"}
+
+
+def _exported_classes(settings: DetectionSettings) -> list[str]:
+    return [c for c in CLASS_COLUMNS if c in settings.enabled_classes]
+
+
+def export_columns(settings: DetectionSettings) -> list[str]:
+    """Excel header for the job profile in ``settings`` (region counts when OCR is disabled)."""
+    if not settings.run_ocr:
+        return [FILE_COLUMN] + [f"{CLASS_COLUMNS[c]} (regiones)" for c in _exported_classes(settings)]
+    return [FILE_COLUMN] + [CLASS_COLUMNS[c] for c in _exported_classes(settings)]
+
 
 class ExportExcelUseCase:
 
-    def __init__(self, exporter: ResultsExporter):
+    def __init__(self, exporter: ResultsExporter, settings: DetectionSettings | None = None):
         self.exporter = exporter
+        self.settings = settings or DetectionSettings()
 
     def execute(self, results: list[DetectionResult], output_path: str | Path) -> Path:
+        classes = _exported_classes(self.settings)
         rows = []
         for r in results:
             if r.error:
                 continue
-            if r.part_numbers:
+            if not self.settings.run_ocr:
+                rows.append([r.image_name] + [r.region_counts.get(c, 0) for c in classes])
+                continue
+
+            texts = {
+                MOTORS: "".join(r.motor_codes) if r.motor_codes else "",
+                BODY_TEXT: " | ".join(r.body_text) if r.body_text else "",
+                FREE_TEXT: " | ".join(r.free_text) if r.free_text else "",
+            }
+            metadata = [texts[c] for c in classes if c != PARTS]
+            if PARTS in classes and r.part_numbers:
                 for n in r.part_numbers:
-                    rows.append([
-                        r.image_name,
-                        n,
-                        "".join(r.motor_codes) if r.motor_codes else "",
-                        " | ".join(r.body_text) if r.body_text else "",
-                        " | ".join(r.free_text) if r.free_text else "",
-                    ])
-            else:
+                    rows.append([r.image_name, n, *metadata])
+            elif any(metadata):
                 # still export metadata if no numbers
-                if r.motor_codes or r.body_text or r.free_text:
-                    rows.append([
-                        r.image_name,
-                        "",
-                        "".join(r.motor_codes) if r.motor_codes else "",
-                        " | ".join(r.body_text) if r.body_text else "",
-                        " | ".join(r.free_text) if r.free_text else "",
-                    ])
-
-        self.exporter.export(rows, output_path)
+                rows.append([r.image_name, *([""] if PARTS in classes else []), *metadata])
+
+        extra = {}
+        if self.settings.export_detections:
+            extra["detection_rows"] = [
+                [r.image_name, *row] for r in results if not r.error for row in r.detections.rows()
+            ]
+        duplicate_rows = [[r.image_name, r.duplicate_of] for r in results if r.duplicate_of]
+        if duplicate_rows:
+            extra["duplicate_rows"] = duplicate_rows
+        self.exporter.export(rows, output_path, **extra)
         return Path(output_path)
@@ -1,25 +1,62 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
 from pathlib import Path
+from typing import Iterable, Iterator
 
-from number_detector.domain.models.list_images_result import ListImagesResult
+from number_detector.application.ports import ArchiveReader, PageCounter
+from number_detector.domain.models.archive_member import ArchiveMember
+from number_detector.domain.models.list_images_result import ImageItem, ListImagesResult
+from number_detector.domain.models.tiff_page import TiffPage
 
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".webp"}
-
+MULTIPAGE_EXTENSIONS = {".tiff", ".tif"}
 
 
 class ListImagesUseCase:
-    """List images in a folder (non-recursive)."""
+    """List images in a folder (non-recursive), or, with ``archives``, inside an archive (all its folders).
+
+    With a ``page_counter``, multi-page TIFFs in a folder are expanded into one :class:`TiffPage`
+    per page so each page is scanned (and reported) separately.
+
+    :meth:`iter_found` yields the raw listing as the directory is read (one ``scandir`` pass, no
+    per-file ``stat`` on most filesystems), so callers can show progress or stop early;
+    :meth:`arrange` then sorts and expands it. :meth:`execute` does both.
+    """
+
+    def __init__(self, page_counter: PageCounter | None = None, archives: ArchiveReader | None = None):
+        self.page_counter = page_counter
+        self.archives = archives
+
+    def _expand(self, path: Path) -> list[ImageItem]:
+        if self.page_counter is None or path.suffix.lower() not in MULTIPAGE_EXTENSIONS:
+            return [path]
+        pages = self.page_counter.count_pages(path)
+        if pages <= 1:
+            return [path]
+        return [TiffPage(path=path, index=i) for i in range(pages)]
+
+    def iter_found(self, input_dir: str | Path) -> Iterator[ImageItem]:
+        """Images in ``input_dir`` in directory order, before sorting and TIFF page expansion."""
+        p = Path(input_dir)
+        if self.archives is not None and self.archives.is_archive(p):
+            yield from self.archives.list_members(p, IMAGE_EXTENSIONS)
+            return
+        if not p.is_dir():
+            return
+        with os.scandir(p) as entries:
+            for entry in entries:
+                if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS and entry.is_file():
+                    yield Path(entry.path)
+
+    def arrange(self, found: Iterable[ImageItem]) -> ListImagesResult:
+        """Scan order for a listing from :meth:`iter_found`."""
+        items = list(found)
+        if any(isinstance(item, ArchiveMember) for item in items):
+            items.sort(key=lambda m: m.member.lower())
+            return ListImagesResult(images=items)
+        items.sort(key=lambda x: x.name.lower())
+        return ListImagesResult(images=[item for f in items for item in self._expand(f)])
 
     def execute(self, input_dir: str | Path) -> ListImagesResult:
-        p = Path(input_dir)
-        if not p.exists() or not p.is_dir():
-            return ListImagesResult(images=[])
-
-        images = [
-            f for f in p.iterdir()
-            if f.is_file() and f.suffix.lower() in IMAGE_EXTENSIONS
-        ]
-        images.sort(key=lambda x: x.name.lower())
-        return ListImagesResult(images=images)
+        return self.arrange(self.iter_found(input_dir))
@@ -1,30 +1,50 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Optional, Callable, Sequence
 
-from number_detector.application.settings import DetectionSettings
-from number_detector.application.constants import DEFAULT_OUTPUT_FILENAME
+from number_detector.application.ports import ResultJournal, ResultSink
+from number_detector.application.settings import DetectionSettings, settings_fingerprint
+from number_detector.application.constants import (
+    DEFAULT_DB_FILENAME,
+    DEFAULT_JOURNAL_FILENAME,
+    DEFAULT_OUTPUT_FILENAME,
+)
 from .export_excel_use_case import ExportExcelUseCase
 from .scan_batch_images_use_case import ScanImagesBatchUseCase
 from ...domain.models.detection_result import DetectionResult
+from ...domain.models.list_images_result import ImageItem
 
 ProgressCallback = Callable[[int, int, str], None]
 ResultCallback = Callable[[DetectionResult, int, int, str], None]
+OpenResultSink = Callable[[Path], ResultSink]
+OpenJournal = Callable[[Path, bool, Path, str], ResultJournal]  # (path, resume, input folder, settings hash)
 
 
 class ProcessFolderUseCase:
-    """Scan a folder and automatically export an Excel to the output folder."""
+    """Scan a folder and automatically export an Excel to the output folder.
+
+    With ``results_store`` every result is also streamed, as it arrives, into the sink it opens
+    for ``<output>/numeros_rojos.sqlite``. With ``journal`` every result is checkpointed to
+    ``<output>/numeros_rojos.journal.jsonl``; ``execute(..., resume=True)`` then skips the items a
+    previous (interrupted) run over the same folder with the same settings already finished, reports
+    their journaled results through ``on_result`` first and exports them.
+    ``images`` is an already listed ``input_dir`` (see ``ScanImagesBatchUseCase.execute``).
+    """
 
     def __init__(
         self,
         settings: DetectionSettings,
         scan_uc: ScanImagesBatchUseCase,
         export_uc: ExportExcelUseCase,
+        results_store: Optional[OpenResultSink] = None,
+        journal: Optional[OpenJournal] = None,
     ):
         self.settings = settings
         self.scan_uc = scan_uc
         self.export_uc = export_uc
+        self.results_store = results_store
+        self.journal = journal
 
     def execute(
         self,
@@ -32,10 +52,43 @@ class ProcessFolderUseCase:
         output_dir: str | Path,
         on_progress: Optional[ProgressCallback] = None,
         on_result: Optional[ResultCallback] = None,
+        resume: bool = False,
+        images: Optional[Sequence[ImageItem]] = None,
     ) -> tuple[list[DetectionResult], Path]:
-        results = self.scan_uc.execute(input_dir=input_dir, on_progress=on_progress, on_result=on_result)
-
         output_dir_p = Path(output_dir)
+        sink = self.results_store(output_dir_p / DEFAULT_DB_FILENAME) if self.results_store else None
+        journal = (
+            self.journal(
+                output_dir_p / DEFAULT_JOURNAL_FILENAME, resume, Path(input_dir), settings_fingerprint(self.settings)
+            )
+            if self.journal
+            else None
+        )
+        completed = journal.completed() if journal else {}
+        source = str(Path(input_dir).resolve())  # one source per folder, however it was given
+
+        def record_result(result: DetectionResult, done: int, total: int, item: str) -> None:
+            if journal and item not in completed:
+                journal.record(item, result)
+            if sink:
+                sink.add(result, source=source, item=item)
+            if on_result:
+                on_result(result, done, total, item)
+
+        try:
+            results = self.scan_uc.execute(
+                input_dir=input_dir,
+                on_progress=on_progress,
+                on_result=record_result,
+                completed=completed,
+                images=images,
+            )
+        finally:
+            if sink:
+                sink.close()
+            if journal:
+                journal.close()
+
         excel_path = output_dir_p / DEFAULT_OUTPUT_FILENAME
 
         self.export_uc.execute(results=results, output_path=excel_path)
@@ -1,21 +1,58 @@
 from __future__ import annotations
 
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from dataclasses import asdict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from dataclasses import asdict, replace
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Mapping, Optional, Sequence
 
+from number_detector.application.admission import MemoryAdmission, low_memory_settings, peak_page_bytes
+from number_detector.application.concurrency import HillClimbingLimit
+from number_detector.application.dedupe import cluster_duplicates, duplicate_groups
+from number_detector.application.ports import ArchiveReader, FrameHandoff, PageCounter, PageHasher, PageSizer
+from number_detector.application.prefetch import ReadAhead
 from number_detector.application.settings import DetectionSettings
 from number_detector.application.use_cases.list_images_use_case import ListImagesUseCase
+from number_detector.domain.models.archive_member import ArchiveMember
 from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.domain.models.list_images_result import ImageItem, item_key
+from number_detector.domain.models.tiff_page import TiffPage
 
 ProgressCallback = Callable[[int, int, str], None]
 ResultCallback = Callable[[DetectionResult, int, int, str], None]
-ScanOne = Callable[[str, dict, bool, str | None], DetectionResult]
+# (path, settings, debug, debug_dir, fetched data or None, result name)
+ScanOne = Callable[[str, dict, bool, str | None, object | None, str], DetectionResult]
 
 
 class ScanImagesBatchUseCase:
-    """Use case: scan many images using ProcessPoolExecutor (max performance)."""
+    """Use case: scan many images using ProcessPoolExecutor (max performance).
+
+    With ``settings.prefetch_threads`` > 0 the image bytes are read ahead on a thread pool (see
+    :class:`ReadAhead`) and workers decode from memory, so slow network shares don't idle the CPUs.
+    At most ``2 x workers`` pages are in flight at a time to keep the prefetched bytes bounded; with
+    ``settings.adaptive_concurrency`` the limit starts lower and is tuned by :class:`HillClimbingLimit`
+    on the measured pages/second (the last run's controller is kept in :attr:`concurrency`).
+    With ``frames`` the read-ahead threads also decode each page into shared memory and workers
+    get a handle instead of the bytes; a page's slot is released as soon as its future completes.
+    With ``page_counter``, multi-page TIFFs are split into per-page work items that the workers
+    decode lazily (one page each), never reading the whole stack. With ``archives``, the images inside
+    an archive are scanned in place; their bytes are always read here and handed to the workers.
+    Workers are told each item's result name (its ``stem``), since the path they get does not carry it.
+    ``worker_init`` runs once in each worker process (e.g. to cap its threads or pin it to CPUs).
+    With ``page_sizer`` and ``memory_budget`` (bytes), each page's peak memory is estimated from its
+    header (see :func:`peak_page_bytes`) and pages are only submitted while the in-flight estimates fit
+    the budget; a page too big for it alone is scanned in smaller tiles, and alone if it still does not fit.
+    With ``page_hasher`` and ``settings.dedupe_pages``, every page is hashed first (see
+    :func:`cluster_duplicates`; matches are confirmed pixel by pixel by the hasher): only the first
+    page of each group of identical pages (up to re-encoding) is scanned, and its result is copied to
+    the others under their own ``image_name``, with ``duplicate_of`` set.
+    Items whose key (see ``item_key``) is in ``completed`` are not scanned again: their stored
+    result is returned in place and reported through the callbacks before any scan, e.g. when
+    resuming from a journal. Callbacks get the item key.
+    ``images`` skips listing ``input_dir`` when the caller already did (e.g. the GUI, while the
+    user picked the folder).
+    """
 
     def __init__(
         self,
@@ -23,57 +60,280 @@ class ScanImagesBatchUseCase:
         scan_one: ScanOne,
         debug: bool = False,
         debug_dir: str | None = None,
+        frames: FrameHandoff | None = None,
+        page_counter: PageCounter | None = None,
+        worker_init: Callable[[], None] | None = None,
+        page_sizer: PageSizer | None = None,
+        memory_budget: int | None = None,
+        page_hasher: PageHasher | None = None,
+        archives: ArchiveReader | None = None,
     ):
         self.settings = settings
         self.scan_one = scan_one
         self.debug = debug
         self.debug_dir = debug_dir
+        self.frames = frames
+        self.page_counter = page_counter
+        self.worker_init = worker_init
+        self.page_sizer = page_sizer
+        self.memory_budget = memory_budget
+        self.page_hasher = page_hasher
+        self.archives = archives
+        self.concurrency: HillClimbingLimit | None = None
+
+    def _load(self, path: ImageItem) -> object:
+        if isinstance(path, TiffPage):
+            return path
+        data = self._read_bytes(path)
+        if self.frames is not None:
+            return self.frames.lease(data) or data
+        return data
+
+    def _read_bytes(self, path: ImageItem) -> bytes:
+        """Bytes of an image file, or of an image stored in an archive."""
+        if isinstance(path, ArchiveMember):
+            if self.archives is None:
+                raise OSError(f"{path}: no archive reader")
+            return self.archives.read_member(path)
+        return path.read_bytes()
+
+    def _memory_plan(self, item: ImageItem, data: object | None, settings_dict: dict) -> tuple[int, dict, bool]:
+        """(estimated peak bytes, settings to scan with, whether they were cut down to fit the budget).
+
+        Pages whose size cannot be read from the header are charged a fair share of the budget.
+        """
+        size = self.page_sizer.page_size(item, data)
+        if size is None:
+            return self.memory_budget // max(1, self.settings.workers), settings_dict, False
+        settings = low_memory_settings(*size, self.settings, self.memory_budget)
+        if settings is self.settings:
+            return peak_page_bytes(*size, settings), settings_dict, False
+        return peak_page_bytes(*size, settings), asdict(settings), True
+
+    def _archive_bytes(self, path: ImageItem) -> bytes | None:
+        """The hasher opens files itself; archive members can only be read here."""
+        return self._read_bytes(path) if isinstance(path, ArchiveMember) else None
+
+    def _hash(self, path: ImageItem) -> int | None:
+        try:
+            return self.page_hasher.page_hash(path, self._archive_bytes(path))
+        except OSError:
+            return None
+
+    def _thumbnail(self, path: ImageItem) -> object | None:
+        try:
+            return self.page_hasher.page_thumbnail(path, self._archive_bytes(path))
+        except OSError:
+            return None
+
+    def _duplicates(self, items: list[ImageItem]) -> dict[int, list[int]]:
+        """Positions in ``items`` of the copies of each page that has identical ones (up to re-encoding).
+
+        Thumbnails for the pixel check are decoded once per page, and only for pages whose hash is
+        close to another's; they are kept until the clustering is done.
+        """
+        if self.page_hasher is None or not self.settings.dedupe_pages or len(items) < 2:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, self.settings.prefetch_threads)) as pool:
+            hashes = list(pool.map(self._hash, items))
+        thumbnails: dict[int, object | None] = {}
+
+        def thumbnail(i: int) -> object | None:
+            if i not in thumbnails:
+                thumbnails[i] = self._thumbnail(items[i])
+            return thumbnails[i]
+
+        def same_page(i: int, j: int) -> bool:
+            return self.page_hasher.same_page(thumbnail(i), thumbnail(j))
+
+        representatives = cluster_duplicates(hashes, self.settings.dedupe_max_distance, same_page)
+        return duplicate_groups(representatives)
+
+    def _worker_payload(self, path: ImageItem) -> object | None:
+        if not isinstance(path, (ArchiveMember, TiffPage)):
+            return None
+        try:
+            return self._load(path)
+        except OSError:
+            return None  # reported by the worker as an image it could not open
 
     def execute(
         self,
         input_dir: str | Path,
         on_progress: Optional[ProgressCallback] = None,
         on_result: Optional[ResultCallback] = None,
+        completed: Optional[Mapping[str, DetectionResult]] = None,
+        images: Optional[Sequence[ImageItem]] = None,
     ) -> list[DetectionResult]:
 
-        images = ListImagesUseCase().execute(input_dir).images
+        if images is None:
+            images = ListImagesUseCase(page_counter=self.page_counter, archives=self.archives).execute(input_dir).images
         if not images:
             return []
+        try:
+            return self._scan(images, on_progress, on_result, completed)
+        finally:
+            if self.archives is not None:
+                self.archives.close()
+
+    def _scan(
+        self,
+        images: Sequence[ImageItem],
+        on_progress: Optional[ProgressCallback],
+        on_result: Optional[ResultCallback],
+        completed: Optional[Mapping[str, DetectionResult]],
+    ) -> list[DetectionResult]:
 
         settings_dict = asdict(self.settings)
         total = len(images)
+        completed = completed or {}
+        self.concurrency = None
 
         # Pre-fill preserving original order
         results: list[DetectionResult] = [
-            DetectionResult(image_name=p.stem, part_numbers=[], motor_codes=[], error="pending")
+            completed.get(item_key(p)) or DetectionResult(image_name=p.stem, part_numbers=[], motor_codes=[], error="pending")
             for p in images
         ]
+        todo = [idx for idx, p in enumerate(images) if item_key(p) not in completed]
+        done = 0
+        for idx in sorted(set(range(total)) - set(todo)):
+            done += 1
+            if on_result:
+                on_result(results[idx], done, total, item_key(images[idx]))
+            if on_progress:
+                on_progress(done, total, item_key(images[idx]))
+        if not todo:
+            return results
+        groups = self._duplicates([images[idx] for idx in todo])
+        copies = {todo[pos]: [todo[c] for c in group] for pos, group in groups.items()}
+        skipped = {c for group in groups.values() for c in group}
+        todo = [idx for pos, idx in enumerate(todo) if pos not in skipped]
+
+        workers = max(1, self.settings.workers)
+        max_in_flight = 2 * workers
+        limiter = self.concurrency = (
+            HillClimbingLimit(1, workers, start=workers)  # above `workers` only the queue would grow
+            if self.settings.adaptive_concurrency
+            else None
+        )
+
+        def in_flight_limit() -> int:
+            return limiter.limit if limiter is not None else max_in_flight
 
-        with ProcessPoolExecutor(max_workers=max(1, self.settings.workers)) as ex:
-            fut_to_idx = {
-                ex.submit(self.scan_one, str(img_path), settings_dict, self.debug, self.debug_dir): idx
-                for idx, img_path in enumerate(images)
-            }
+        memory = (
+            MemoryAdmission(self.memory_budget)
+            if self.page_sizer is not None and self.memory_budget is not None
+            else None
+        )
+        costs: dict[int, int] = {}
+        low_memory: set[int] = set()
 
-            done = 0
-            for fut in as_completed(fut_to_idx):
-                idx = fut_to_idx[fut]
-                p = images[idx]
+        frames = self.frames if self.frames is not None else nullcontext()
+        read_ahead = (
+            ReadAhead(
+                [images[idx] for idx in todo],
+                threads=self.settings.prefetch_threads,
+                max_bytes=self.settings.prefetch_bytes,
+                read=self._load,
+            )
+            if self.settings.prefetch_threads > 0
+            else nullcontext()
+        )
+        with frames, ProcessPoolExecutor(max_workers=workers, initializer=self.worker_init) as ex, read_ahead as ahead:
+            if ahead is not None:
+                # Start the worker processes before the read-ahead threads exist (fork + threads).
+                ex.submit(int).result()
+                upcoming = iter(ahead)
+            else:
+                # Workers open files themselves; archive members can only be read here.
+                upcoming = ((pos, images[idx], self._worker_payload(images[idx])) for pos, idx in enumerate(todo))
 
+            fut_to_pos = {}
+            payloads: dict[int, object] = {}
+
+            held = None  # next item, waiting for memory to be released
+
+            def submit_next() -> bool:
+                nonlocal held
+                item, held = held or next(upcoming, None), None
+                if item is None:
+                    return False
+                pos, img_path, data = item
+                item_settings = settings_dict
+                if memory is not None:
+                    cost, item_settings, reduced = self._memory_plan(img_path, data, settings_dict)
+                    if not memory.try_admit(cost):
+                        held = item
+                        return False
+                    costs[pos] = cost
+                    if reduced:
+                        low_memory.add(pos)
+                payloads[pos] = data
+                source = img_path.path if isinstance(img_path, TiffPage) else img_path
                 try:
-                    results[idx] = fut.result()
-                except Exception as e:
-                    results[idx] = DetectionResult(
-                        image_name=p.stem,
-                        part_numbers=[],
-                        motor_codes=[],
-                        error=f"{type(e).__name__}: {e}",
+                    fut = ex.submit(
+                        self.scan_one, str(source), item_settings, self.debug, self.debug_dir, data, img_path.stem
                     )
+                except BrokenProcessPool as e:
+                    # A worker died: report the item as failed like the futures already in flight
+                    fut = Future()
+                    fut.set_exception(e)
+                fut_to_pos[fut] = pos
+                return True
+
+            while len(fut_to_pos) < in_flight_limit() and submit_next():
+                pass
+
+            while fut_to_pos:
+                finished, _ = wait(fut_to_pos, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    pos = fut_to_pos.pop(fut)
+                    idx = todo[pos]
+                    p = images[idx]
+                    if ahead is not None:
+                        ahead.release(pos)
+                    data = payloads.pop(pos)
+                    if self.frames is not None and data is not None and not isinstance(data, bytes):
+                        self.frames.release(data)
+                    if memory is not None:
+                        memory.release(costs.pop(pos))
+
+                    try:
+                        results[idx] = fut.result()
+                    except Exception as e:
+                        results[idx] = DetectionResult(
+                            image_name=p.stem,
+                            part_numbers=[],
+                            motor_codes=[],
+                            error=f"{type(e).__name__}: {e}",
+                        )
+                    if pos in low_memory:
+                        low_memory.discard(pos)
+                        results[idx].metrics["memory.low_memory"] = 1
+
+                    if limiter is not None:
+                        limiter.completed()
+                    for i in (idx, *copies.get(idx, ())):
+                        if i != idx:
+                            source = results[idx]
+                            results[i] = replace(
+                                source,
+                                image_name=images[i].stem,
+                                part_numbers=list(source.part_numbers),
+                                motor_codes=list(source.motor_codes),
+                                free_text=list(source.free_text),
+                                body_text=list(source.body_text),
+                                metrics={"dedupe.skipped": 1},
+                                detections=source.detections.copy(),
+                                duplicate_of=source.image_name,
+                            )
+                        done += 1
+                        if on_result:
+                            on_result(results[i], done, total, item_key(images[i]))
+                        if on_progress:
+                            on_progress(done, total, item_key(images[i]))
 
-                done += 1
-                if on_result:
-                    on_result(results[idx], done, total, p.name)
-                if on_progress:
-                    on_progress(done, total, p.name)
+                while len(fut_to_pos) < in_flight_limit() and submit_next():
+                    pass
 
         return results
@@ -1,15 +1,36 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Callable
 
-from number_detector.application.ports import ImageReader, OcrReader, RedRegionDetector
+from number_detector.application.constants import BODY_TEXT, FREE_TEXT, MOTORS, PARTS, REGION_CLASSES
+from number_detector.application.ports import ColorCensus, Image, ImageReader, OcrReader, RedRegionDetector
 from number_detector.application.settings import DetectionSettings
 from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.domain.models.detections import Detections
+from number_detector.domain.models.image_region import ImageRegion
+from number_detector.domain.models.tiff_page import TiffPage
 from number_detector.domain.parsing import extract_free_texts, extract_motor_codes, extract_part_numbers
 
 
+def parse_region_text(region_class: str, txt: str, settings: DetectionSettings) -> list:
+    """Values one OCR text of ``region_class`` contributes to the result (part numbers, motor codes or texts)."""
+    if region_class == PARTS:
+        return extract_part_numbers(txt, min_digits=settings.min_part_digits, max_digits=settings.max_part_digits)
+    if region_class == MOTORS:
+        return extract_free_texts(txt) if extract_motor_codes(txt) else []
+    return extract_free_texts(txt)
+
+
 class ScanSingleImageUseCase:
-    """Scan a single image and return detected red part numbers + motor codes."""
+    """Scan a single image and return detected red part numbers + motor codes.
+
+    When ``fast_ocr`` is given, every ROI is first read by that cheap reader and only escalated
+    to ``ocr`` when the text fails to parse or its confidence is below the configured minimum.
+    When ``census`` is given, region classes whose colors are absent from the page are skipped.
+    ``settings.enabled_classes``/``run_ocr`` (the job profile) choose which classes and stages run.
+    Every detected region is kept in ``DetectionResult.detections`` with its OCR text and confidence.
+    """
 
     def __init__(
         self,
@@ -17,18 +38,63 @@ class ScanSingleImageUseCase:
         detector: RedRegionDetector,
         ocr: OcrReader,
         settings: DetectionSettings | None = None,
+        fast_ocr: OcrReader | None = None,
+        census: ColorCensus | None = None,
     ):
         self.image_reader = image_reader
         self.detector = detector
         self.ocr = ocr
         self.settings = settings or DetectionSettings()
+        self.fast_ocr = fast_ocr
+        self.census = census
+
+    def _accepts(self, txt: str, parses: Callable[[str], bool]) -> bool:
+        confidence = getattr(txt, "confidence", -1.0)
+        if 0 <= confidence < self.settings.ocr_fast_min_confidence:
+            return False
+        return parses(txt)
+
+    def _read(
+        self,
+        region_class: str,
+        method: str,
+        image: Image,
+        parses: Callable[[str], bool],
+        metrics: dict[str, int],
+    ) -> str:
+        """Run one ROI through the OCR cascade and count which stage produced the text."""
+        if self.fast_ocr is not None:
+            txt = getattr(self.fast_ocr, method)(image)
+            metrics[f"ocr.{region_class}.fast"] = metrics.get(f"ocr.{region_class}.fast", 0) + 1
+            if self._accepts(txt, parses):
+                return txt
+            metrics[f"ocr.{region_class}.escalated"] = metrics.get(f"ocr.{region_class}.escalated", 0) + 1
+        else:
+            metrics[f"ocr.{region_class}.full"] = metrics.get(f"ocr.{region_class}.full", 0) + 1
+        return getattr(self.ocr, method)(image)
+
+    def read_region(self, region_class: str, image: Image, metrics: dict[str, int] | None = None) -> str:
+        """OCR one ROI of ``region_class`` as :meth:`execute` does (same reader, cascade and checks)."""
+        method, parses = {
+            PARTS: ("read_digits", lambda t: bool(parse_region_text(PARTS, t, self.settings))),
+            MOTORS: ("read_motor_text", lambda t: bool(extract_motor_codes(t))),
+            FREE_TEXT: ("read_free_text", lambda t: bool(extract_free_texts(t))),
+            BODY_TEXT: ("read_body_text", lambda t: bool(extract_free_texts(t))),
+        }[region_class]
+        return self._read(region_class, method, image, parses, {} if metrics is None else metrics)
 
-    def execute(self, image_path: str | Path) -> DetectionResult:
+    def execute(self, image_path: str | Path, data: object | None = None, name: str | None = None) -> DetectionResult:
+        """Scan ``image_path``; when its file bytes (or a decoded frame handle) were already
+        fetched as ``data``, the image reader uses those instead. With a ``TiffPage`` as ``data``
+        only that page is decoded. The result is named ``name`` (e.g. an archive member's stem, which
+        ``image_path`` does not carry), else after the page or the file."""
         p = Path(image_path)
-        img = self.image_reader.read(p)
+        if name is None:
+            name = data.stem if isinstance(data, TiffPage) else p.stem
+        img = self.image_reader.read(p if data is None else data)
         if img is None:
             return DetectionResult(
-                image_name=p.stem,
+                image_name=name,
                 part_numbers=[],
                 motor_codes=[],
                 free_text=[],
@@ -36,38 +102,63 @@ class ScanSingleImageUseCase:
                 error="No se pudo abrir",
             )
 
+        metrics: dict[str, int] = {}
+
+        present = set(self.settings.enabled_classes)
+        if self.census is not None and self.settings.census_enabled and present:
+            census = self.census.present_classes(img)
+            for region_class in REGION_CLASSES:
+                if region_class in present and region_class not in census:
+                    metrics[f"census.{region_class}.skipped"] = 1
+            present &= census
+
+        detections = Detections()
+
+        def regions(region_class: str, find) -> list[ImageRegion]:
+            """Detect one class; in detection-only runs keep the boxes and return nothing to OCR."""
+            if region_class not in present:
+                return []
+            found = find(img, name=name)
+            if not self.settings.run_ocr:
+                for r in found:
+                    detections.append(region_class, r.bbox)
+                return []
+            return found
+
+        def detected(region_class: str, region: ImageRegion, txt: str) -> None:
+            detections.append(region_class, region.bbox, txt.strip(), getattr(txt, "confidence", -1.0))
+
         parts: list[int] = []
-        for region in self.detector.find_part_regions(img, name=p.stem):
-            txt = self.ocr.read_digits(region.image)
-            parts.extend(
-                extract_part_numbers(
-                    txt,
-                    min_digits=self.settings.min_part_digits,
-                    max_digits=self.settings.max_part_digits,
-                )
-            )
+        for region in regions(PARTS, self.detector.find_part_regions):
+            txt = self.read_region(PARTS, region.image, metrics)
+            detected(PARTS, region, txt)
+            parts.extend(parse_region_text(PARTS, txt, self.settings))
 
         motors: list[str] = []
-        for region in self.detector.find_motor_regions(img, name=p.stem):
-            txt = self.ocr.read_motor_text(region.image)
-            if extract_motor_codes(txt):
-                motors.extend(extract_free_texts(txt))
+        for region in regions(MOTORS, self.detector.find_motor_regions):
+            txt = self.read_region(MOTORS, region.image, metrics)
+            detected(MOTORS, region, txt)
+            motors.extend(parse_region_text(MOTORS, txt, self.settings))
 
         free_text: list[str] = []
-        for region in self.detector.find_free_text_regions(img, name=p.stem):
-            txt = self.ocr.read_free_text(region.image)
-            free_text.extend(extract_free_texts(txt))
+        for region in regions(FREE_TEXT, self.detector.find_free_text_regions):
+            txt = self.read_region(FREE_TEXT, region.image, metrics)
+            detected(FREE_TEXT, region, txt)
+            free_text.extend(parse_region_text(FREE_TEXT, txt, self.settings))
 
         body_text: list[str] = []
-        for region in self.detector.find_body_text_regions(img, name=p.stem):
-            txt = self.ocr.read_body_text(region.image)
-            body_text.extend(extract_free_texts(txt))
+        for region in regions(BODY_TEXT, self.detector.find_body_text_regions):
+            txt = self.read_region(BODY_TEXT, region.image, metrics)
+            detected(BODY_TEXT, region, txt)
+            body_text.extend(parse_region_text(BODY_TEXT, txt, self.settings))
 
         return DetectionResult(
-            image_name=p.stem,
+            image_name=name,
             part_numbers=sorted(set(parts)),
             motor_codes=sorted(set(motors)),
             free_text=sorted(set(free_text)),
             body_text=sorted(set(body_text)),
             error=None,
+            metrics=metrics,
+            detections=detections,
         )
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """An image stored inside a ZIP/TAR archive, scanned without extracting it.
+
+    ``name``/``stem`` follow the member's file name, so results are named as in a folder scan.
+    """
+
+    archive: Path
+    member: str  # name inside the archive, "/"-separated
+    size: int = 0  # uncompressed size in bytes
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.member).name
+
+    @property
+    def stem(self) -> str:
+        return PurePosixPath(self.member).stem
+
+    @property
+    def suffix(self) -> str:
+        return PurePosixPath(self.member).suffix
+
+    def __str__(self) -> str:
+        return f"{self.archive}!{self.member}"
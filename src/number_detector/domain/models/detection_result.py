@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Optional
 
+from number_detector.domain.models.detections import Detections
+
 
 @dataclass(frozen=True)
 class DetectionResult:
@@ -12,3 +14,11 @@ class DetectionResult:
     free_text: list[str] = field(default_factory=list)
     body_text: list[str] = field(default_factory=list)
     error: Optional[str] = None
+    metrics: dict[str, int] = field(default_factory=dict)  # per-stage counters, e.g. "ocr.parts.escalated"
+    detections: Detections = field(default_factory=Detections)  # every detected region: class, box, text, confidence
+    duplicate_of: Optional[str] = None  # image_name of the near-identical page whose result this is a copy of
+
+    @property
+    def region_counts(self) -> dict[str, int]:
+        """Detected ROIs per region class, counted from ``detections``."""
+        return self.detections.counts()
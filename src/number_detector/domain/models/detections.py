@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterator, NamedTuple
+
+from number_detector.domain.models.bounding_box import BoundingBox
+
+
+class Detection(NamedTuple):
+    region_class: str
+    bbox: BoundingBox
+    text: str
+    confidence: float  # OCR mean word confidence, -1 when unknown or not read
+
+
+class Detections:
+    """Every region detected on a page: class, box, OCR text and confidence.
+
+    Stored column-wise in flat arrays (class codes, packed ``x, y, w, h`` ints, double
+    confidences) plus one list of texts, so a result carries hundreds of detections without one
+    object per box and pickles back from the workers as a few byte buffers. Iterating yields
+    :class:`Detection` tuples built on the fly.
+    """
+
+    __slots__ = ("class_names", "_codes", "_boxes", "_confidences", "texts")
+
+    def __init__(self) -> None:
+        self.class_names: list[str] = []
+        self._codes = array("B")
+        self._boxes = array("i")
+        self._confidences = array("d")
+        self.texts: list[str] = []
+
+    def append(self, region_class: str, bbox: BoundingBox, text: str = "", confidence: float = -1.0) -> None:
+        try:
+            code = self.class_names.index(region_class)
+        except ValueError:
+            code = len(self.class_names)
+            self.class_names.append(region_class)
+        self._codes.append(code)
+        self._boxes.extend((bbox.x, bbox.y, bbox.w, bbox.h))
+        self._confidences.append(confidence)
+        self.texts.append(text)
+
+    def copy(self) -> Detections:
+        other = Detections()
+        other.class_names = list(self.class_names)
+        other._codes = array("B", self._codes)
+        other._boxes = array("i", self._boxes)
+        other._confidences = array("d", self._confidences)
+        other.texts = list(self.texts)
+        return other
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, i: int) -> Detection:
+        x, y, w, h = self._boxes[4 * i:4 * i + 4]
+        return Detection(self.class_names[self._codes[i]], BoundingBox(x, y, w, h), self.texts[i], self._confidences[i])
+
+    def __iter__(self) -> Iterator[Detection]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def rows(self) -> Iterator[tuple[str, int, int, int, int, str, float]]:
+        """Flat ``(class, x, y, w, h, text, confidence)`` tuples, e.g. for database or sheet rows."""
+        boxes = self._boxes
+        for i, code in enumerate(self._codes):
+            yield (self.class_names[code], *boxes[4 * i:4 * i + 4], self.texts[i], self._confidences[i])
+
+    def count(self, region_class: str) -> int:
+        if region_class not in self.class_names:
+            return 0
+        return self._codes.count(self.class_names.index(region_class))
+
+    def counts(self) -> dict[str, int]:
+        """Number of detections per region class, for the classes that have any."""
+        return {name: self._codes.count(code) for code, name in enumerate(self.class_names)}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Detections):
+            return NotImplemented
+        return list(self.rows()) == list(other.rows())
+
+    def __repr__(self) -> str:
+        return f"Detections({len(self)})"
+
+    def __getstate__(self):
+        return self.class_names, self._codes, self._boxes, self._confidences, self.texts
+
+    def __setstate__(self, state) -> None:
+        self.class_names, self._codes, self._boxes, self._confidences, self.texts = state
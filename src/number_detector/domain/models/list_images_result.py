@@ -1,7 +1,23 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Union
+
+from number_detector.domain.models.archive_member import ArchiveMember
+from number_detector.domain.models.tiff_page import TiffPage
+
+# A unit of scan work: an image file, an image inside an archive, or one page of a multi-page TIFF.
+ImageItem = Union[Path, ArchiveMember, TiffPage]
+
+
+def item_key(item: ImageItem) -> str:
+    """Identifies a work item within its input (file name, archive member path, ``file#p<n>``)."""
+    if isinstance(item, ArchiveMember):
+        return item.member
+    return item.name
 
 
 @dataclass(frozen=True)
 class ListImagesResult:
-    images: list[Path]
\ No newline at end of file
+    images: list[ImageItem]
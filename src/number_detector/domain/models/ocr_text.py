@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+
+class OcrText(str):
+    """OCR output that behaves like ``str`` but also carries the engine's mean word confidence.
+
+    Readers that cannot report a confidence return plain strings; ``confidence`` is then unknown.
+    """
+
+    confidence: float
+
+    def __new__(cls, text: str, confidence: float = -1.0) -> OcrText:
+        obj = super().__new__(cls, text)
+        obj.confidence = confidence
+        return obj
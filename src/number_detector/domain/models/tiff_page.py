@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class TiffPage:
+    """One page (0-based ``index``) of a multi-page TIFF, scanned as its own unit of work.
+
+    Results are named ``<stem>#p<n>`` with a 1-based page number, e.g. ``catalog#p12``.
+    """
+
+    path: Path
+    index: int
+
+    @property
+    def stem(self) -> str:
+        return f"{self.path.stem}#p{self.index + 1}"
+
+    @property
+    def name(self) -> str:
+        return f"{self.path.name}#p{self.index + 1}"
+
+    def __str__(self) -> str:
+        return f"{self.path}#p{self.index + 1}"
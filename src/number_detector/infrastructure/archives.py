@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import tarfile
+import threading
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Iterable
+
+from number_detector.domain.models.archive_member import ArchiveMember
+
+ARCHIVE_EXTENSIONS = {".zip", ".tar"}
+
+
+def _visible(member: str) -> bool:
+    parts = PurePosixPath(member).parts
+    return not any(part.startswith(".") or part == "__MACOSX" for part in parts)
+
+
+class ZipTarArchiveReader:
+    """Lists and reads the images inside ZIP/TAR archives without extracting them.
+
+    Archives are kept open (per reader) once a member has been read, so members are read without
+    re-parsing the index each time; :meth:`close` closes them.
+    """
+
+    def __init__(self):
+        self._open: dict[Path, zipfile.ZipFile | tarfile.TarFile] = {}
+        self._locks: dict[Path, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def is_archive(self, path: Path) -> bool:
+        return path.is_file() and path.suffix.lower() in ARCHIVE_EXTENSIONS
+
+    def list_members(self, archive: Path, extensions: Iterable[str]) -> list[ArchiveMember]:
+        """List the image members of a ZIP/TAR archive (all folders inside it), reading only its index."""
+        extensions = {e.lower() for e in extensions}
+        if archive.suffix.lower() == ".zip":
+            with zipfile.ZipFile(archive) as zf:
+                entries = [(info.filename, info.file_size) for info in zf.infolist() if not info.is_dir()]
+        else:
+            with tarfile.open(archive) as tf:
+                entries = [(info.name, info.size) for info in tf.getmembers() if info.isfile()]
+
+        return [
+            ArchiveMember(archive=archive, member=name, size=size)
+            for name, size in entries
+            if _visible(name) and PurePosixPath(name).suffix.lower() in extensions
+        ]
+
+    def read_member(self, item: ArchiveMember) -> bytes:
+        """Read the bytes of an archive member; OSError when it cannot be read."""
+        try:
+            return self._read(item)
+        except (KeyError, zipfile.BadZipFile, tarfile.TarError) as e:
+            raise OSError(f"{item}: {e}") from e
+
+    def _read(self, item: ArchiveMember) -> bytes:
+        with self._lock:
+            archive = self._open.get(item.archive)
+            if archive is None:
+                if item.archive.suffix.lower() == ".zip":
+                    archive = zipfile.ZipFile(item.archive)
+                else:
+                    archive = tarfile.open(item.archive)
+                self._open[item.archive] = archive
+                self._locks[item.archive] = threading.Lock()
+            lock = self._locks[item.archive]
+
+        # ZipFile serializes access to the underlying file itself; TarFile must not be shared.
+        if isinstance(archive, zipfile.ZipFile):
+            return archive.read(item.member)
+        with lock:
+            f = archive.extractfile(item.member)
+            if f is None:
+                raise OSError(f"{item} is not a regular file")
+            return f.read()
+
+    def close(self) -> None:
+        with self._lock:
+            for archive in self._open.values():
+                archive.close()
+            self._open.clear()
+            self._locks.clear()
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
+from dataclasses import replace
+from functools import lru_cache, partial
+from multiprocessing import Value
 from pathlib import Path
 
 from number_detector.application.settings import DetectionSettings
-from number_detector.application.use_cases.export_excel_use_case import ExportExcelUseCase
+from number_detector.application.use_cases.export_excel_use_case import ExportExcelUseCase, export_columns
+from number_detector.application.use_cases.list_images_use_case import ListImagesUseCase
 from number_detector.application.use_cases.process_folder_use_case import ProcessFolderUseCase
-from number_detector.application.use_cases.scan_batch_images_use_case import ScanImagesBatchUseCase
+from number_detector.application.use_cases.scan_batch_images_use_case import ScanImagesBatchUseCase, ScanOne
 from number_detector.application.use_cases.scan_single_image_use_case import ScanSingleImageUseCase
 from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.infrastructure.archives import ZipTarArchiveReader
 from number_detector.infrastructure.excel_exporter import ExcelExporter
 from number_detector.infrastructure.imaging import OpenCVImageReader, OpenCVRedDetector
-from number_detector.infrastructure.ocr import TesseractService
-from number_detector.infrastructure.runtime import TESSERACT_CMD
+from number_detector.infrastructure.journal import JsonlJournal
+from number_detector.infrastructure.ocr import FastTesseractService, TesseractService
+from number_detector.infrastructure.preview import PreviewPipeline
+from number_detector.infrastructure.runtime import TESSERACT_CMD, init_scan_worker, physical_memory, plan_cpu_budget
+from number_detector.infrastructure.shared_frames import FrameRing
+from number_detector.infrastructure.sqlite_store import SqliteResultsStore
 
 
 def create_scan_single_image_use_case(
@@ -19,34 +28,97 @@ def create_scan_single_image_use_case(
     debug: bool = False,
     debug_dir: str | None = None,
 ) -> ScanSingleImageUseCase:
+    detector = OpenCVRedDetector(settings=settings, debug=debug, debug_dir=debug_dir)
     return ScanSingleImageUseCase(
-        image_reader=OpenCVImageReader(),
-        detector=OpenCVRedDetector(settings=settings, debug=debug, debug_dir=debug_dir),
-        ocr=TesseractService(tesseract_cmd=TESSERACT_CMD),
+        image_reader=OpenCVImageReader(coarse_factor=settings.coarse_factor),
+        detector=detector,
+        ocr=TesseractService(tesseract_cmd=TESSERACT_CMD, settings=settings),
         settings=settings,
+        fast_ocr=(
+            FastTesseractService(tesseract_cmd=TESSERACT_CMD, scale=settings.ocr_fast_scale, settings=settings)
+            if settings.ocr_cascade
+            else None
+        ),
+        census=detector,
     )
 
 
+def scan_region_reader(settings: DetectionSettings):
+    """OCR of one ROI through the same reader and cascade as a scan (a preview ``RegionReaderFactory``)."""
+    return create_scan_single_image_use_case(settings).read_region
+
+
+def create_preview_pipeline() -> PreviewPipeline:
+    """Preview of one page; OCR goes through the same reader and cascade as a scan."""
+    return PreviewPipeline(region_reader=scan_region_reader)
+
+
+@lru_cache(maxsize=4)
+def _worker_use_case(
+    settings_items: tuple[tuple[str, object], ...],
+    debug: bool,
+    debug_dir: str | None,
+) -> ScanSingleImageUseCase:
+    """Build the use case once per worker process so OCR/detector scratch buffers are reused."""
+    settings = DetectionSettings(**dict(settings_items))
+    return create_scan_single_image_use_case(settings=settings, debug=debug, debug_dir=debug_dir)
+
+
 def scan_one_image(
     image_path: str,
     settings_dict: dict,
     debug: bool,
     debug_dir: str | None,
+    data: object | None = None,
+    name: str | None = None,
 ) -> DetectionResult:
-    settings = DetectionSettings(**settings_dict)
-    return create_scan_single_image_use_case(settings=settings, debug=debug, debug_dir=debug_dir).execute(image_path)
+    return _worker_use_case(tuple(settings_dict.items()), debug, debug_dir).execute(image_path, data, name)
+
+
+def create_list_images_use_case() -> ListImagesUseCase:
+    """Listing as the batch scan does it (multi-page TIFFs expanded into pages)."""
+    return ListImagesUseCase(page_counter=OpenCVImageReader(), archives=ZipTarArchiveReader())
 
 
 def create_process_folder_use_case(
     settings: DetectionSettings,
     debug: bool = False,
     debug_dir: str | None = None,
+    scan_one: ScanOne = scan_one_image,
 ) -> ProcessFolderUseCase:
+    """Folder scan as the GUI/CLI run it; ``scan_one`` (picklable, same signature as :func:`scan_one_image`)
+    replaces the per-image worker, e.g. with a stub OCR for soak tests.
+    ``settings.workers`` = 0 is resolved to the CPUs available here (see :func:`plan_cpu_budget`), and
+    ``settings.memory_budget_mb`` = 0 to three quarters of the memory available here."""
+    budget = plan_cpu_budget(settings.workers, pin=settings.pin_workers)
+    settings = replace(settings, workers=budget.workers)
+    if settings.memory_budget_mb > 0:
+        memory_budget = settings.memory_budget_mb * 2**20
+    else:
+        memory = physical_memory()
+        memory_budget = memory * 3 // 4 if memory else None
     scan_uc = ScanImagesBatchUseCase(
         settings=settings,
-        scan_one=scan_one_image,
+        scan_one=scan_one,
         debug=debug,
         debug_dir=debug_dir,
+        frames=(
+            FrameRing(slots=settings.shm_slots, slot_bytes=settings.shm_slot_bytes)
+            if settings.shm_slots > 0 and settings.prefetch_threads > 0
+            else None
+        ),
+        page_counter=OpenCVImageReader(),
+        worker_init=partial(init_scan_worker, budget, Value("i", 0)),
+        page_sizer=OpenCVImageReader(),
+        memory_budget=memory_budget,
+        page_hasher=OpenCVImageReader(),
+        archives=ZipTarArchiveReader(),
+    )
+    export_uc = ExportExcelUseCase(exporter=ExcelExporter(columns=export_columns(settings)), settings=settings)
+    return ProcessFolderUseCase(
+        settings=settings,
+        scan_uc=scan_uc,
+        export_uc=export_uc,
+        results_store=SqliteResultsStore if settings.export_sqlite else None,
+        journal=JsonlJournal if settings.journal_enabled else None,
     )
-    export_uc = ExportExcelUseCase(exporter=ExcelExporter())
-    return ProcessFolderUseCase(settings=settings, scan_uc=scan_uc, export_uc=export_uc)
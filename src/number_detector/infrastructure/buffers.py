@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class ScratchArena:
+    """Per-worker pool of reusable scratch arrays.
+
+    Each key owns one flat byte buffer that only grows; ``get`` returns a contiguous view of
+    the requested shape/dtype over it, so OpenCV calls can write into it via ``dst=``.
+    A view is only valid until the next ``get`` with the same key.
+    """
+
+    def __init__(self):
+        self._buffers: dict[str, np.ndarray] = {}
+
+    def get(self, key: str, shape: tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        buf = self._buffers.get(key)
+        if buf is None or buf.nbytes < nbytes:
+            buf = np.empty(nbytes, dtype=np.uint8)
+            self._buffers[key] = buf
+        return buf[:nbytes].view(dtype).reshape(shape)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buf.nbytes for buf in self._buffers.values())
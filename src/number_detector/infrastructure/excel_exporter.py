@@ -4,21 +4,36 @@ from pathlib import Path
 
 from pandas import DataFrame, ExcelWriter, to_numeric
 
+DEFAULT_COLUMNS = ["Archivo", "Numero", "Motor", "Carroceria", "Free text"]
+DETECTION_COLUMNS = ["Archivo", "Clase", "X", "Y", "Ancho", "Alto", "Texto", "Confianza"]
+DETECTIONS_SHEET = "Detecciones"
+DUPLICATE_COLUMNS = ["Archivo", "Duplicado de"]
+DUPLICATES_SHEET = "Duplicados"
+MAX_SHEET_ROWS = 1_048_575  # Excel row limit, minus the header
+
 
 class ExcelExporter:
-    def __init__(self, output_path: str | None = None):
+    def __init__(self, output_path: str | None = None, columns: list[str] | None = None):
         self.output_path = output_path
+        self.columns = columns or DEFAULT_COLUMNS
 
-    def export(self, rows: list[list[object]], output_path: str | Path | None = None) -> Path:
+    def export(
+        self,
+        rows: list[list[object]],
+        output_path: str | Path | None = None,
+        detection_rows: list[list[object]] | None = None,
+        duplicate_rows: list[list[object]] | None = None,
+    ) -> Path:
         if output_path is None and self.output_path is None:
             raise ValueError("output_path is required")
         destination = Path(output_path or self.output_path)
 
-        if not rows:
+        if not rows and not detection_rows and not duplicate_rows:
             return destination
 
-        df = DataFrame(rows, columns=["Archivo", "Numero", "Motor", "Carroceria", "Free text"])
-        df["Numero"] = to_numeric(df["Numero"], errors="coerce")
+        df = DataFrame(rows, columns=self.columns)
+        if "Numero" in df.columns:
+            df["Numero"] = to_numeric(df["Numero"], errors="coerce")
 
         df_grouped = df.copy()
         df_grouped["archivo_changed"] = df_grouped["Archivo"] != df_grouped["Archivo"].shift(1)
@@ -29,7 +44,21 @@ class ExcelExporter:
             df_grouped.to_excel(writer, index=False, sheet_name="Numeros Rojos")
             workbook = writer.book
             worksheet = writer.sheets["Numeros Rojos"]
-            number_format = workbook.add_format({"num_format": "0"})
-            worksheet.set_column("B:B", 15, number_format)
+            if "Numero" in df.columns:
+                col = df.columns.get_loc("Numero")
+                number_format = workbook.add_format({"num_format": "0"})
+                worksheet.set_column(col, col, 15, number_format)
+
+            # Large runs overflow one sheet: continue in "Detecciones (2)", ...
+            for i, start in enumerate(range(0, len(detection_rows or []), MAX_SHEET_ROWS)):
+                sheet = DETECTIONS_SHEET if i == 0 else f"{DETECTIONS_SHEET} ({i + 1})"
+                chunk = DataFrame(detection_rows[start:start + MAX_SHEET_ROWS], columns=DETECTION_COLUMNS)
+                chunk.to_excel(writer, index=False, sheet_name=sheet)
+
+            # Pages not scanned because a near-identical one was: which page each result was copied from
+            if duplicate_rows:
+                DataFrame(duplicate_rows, columns=DUPLICATE_COLUMNS).to_excel(
+                    writer, index=False, sheet_name=DUPLICATES_SHEET
+                )
 
         return destination
@@ -1,18 +1,184 @@
 from __future__ import annotations
 
+import io
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 
 import cv2
 import numpy as np
+from PIL import Image as PILImage
 
-from number_detector.application.settings import DetectionSettings
+from number_detector.application.constants import BODY_TEXT, FREE_TEXT, MOTORS, PARTS
+from number_detector.application.settings import DetectionSettings, scale_pixel_settings
 from number_detector.domain.models.bounding_box import BoundingBox
 from number_detector.domain.models.image_region import ImageRegion
+from number_detector.domain.models.tiff_page import TiffPage
+from number_detector.infrastructure.buffers import ScratchArena
+from number_detector.infrastructure.shared_frames import FrameLease, attach_frame
+
+
+# Debug image names per class: <name>_<prefix>_mask.png / <name>_<prefix>_dilated.png
+DEBUG_PREFIXES = {
+    PARTS: "parts_red",
+    MOTORS: "motor_blue",
+    FREE_TEXT: "free_text_green",
+    BODY_TEXT: "body_text_pink",
+}
+
+REDUCED_COLOR_FLAGS = {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+REDUCED_GRAYSCALE_FLAGS = {
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2, 4: cv2.IMREAD_REDUCED_GRAYSCALE_4, 8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+JPEG_MAGIC = b"\xff\xd8"
+
+# Duplicate pages: hashed on a 1/8 copy, confirmed pixel by pixel on a 1/4 copy (grey levels)
+HASH_REDUCTION = 8
+DUPLICATE_REDUCTION = 4
+DUPLICATE_MAX_PIXEL_DIFF = 24
+
+_PIL_LIMIT_LOCK = threading.Lock()
+
+
+@dataclass
+class CoarsePage:
+    """Page decoded at 1/``factor`` size for detection; full resolution is decoded only when cropping ROIs."""
+
+    coarse: np.ndarray
+    factor: int
+    path: str | bytes
+    _full: np.ndarray | None = None
+
+    def full(self) -> np.ndarray:
+        if self._full is None:
+            self._full = _decode(self.path)
+        return self._full
+
+
+def _decode(source: str | Path | bytes, flags: int = cv2.IMREAD_COLOR):
+    """Decode an image from a path or from the encoded file bytes (already read by the prefetcher)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        buf = np.frombuffer(source, np.uint8)
+        return cv2.imdecode(buf, flags) if buf.size else None
+    return cv2.imread(str(source), flags)
 
 
 class OpenCVImageReader:
-    def read(self, image_path: str | Path):
-        return cv2.imread(str(image_path))
+    def __init__(self, coarse_factor: int = 1):
+        if coarse_factor != 1 and coarse_factor not in REDUCED_COLOR_FLAGS:
+            raise ValueError(f"coarse_factor must be 1, 2, 4 or 8, got {coarse_factor}")
+        self.coarse_factor = coarse_factor
+
+    def _coarse_from_full(self, full: np.ndarray) -> CoarsePage:
+        h, w = full.shape[:2]
+        size = (max(1, w // self.coarse_factor), max(1, h // self.coarse_factor))
+        coarse = cv2.resize(full, size, interpolation=cv2.INTER_AREA)
+        return CoarsePage(coarse=coarse, factor=self.coarse_factor, path="", _full=full)
+
+    def read(self, source: str | Path | bytes | FrameLease | TiffPage):
+        """Decode ``source``: a file path, the encoded bytes of an image file, a shared frame,
+        or a single page of a multi-page TIFF."""
+        if isinstance(source, (FrameLease, TiffPage)):
+            full = attach_frame(source) if isinstance(source, FrameLease) else _decode_page(source)
+            if full is None or self.coarse_factor == 1:
+                return full
+            return self._coarse_from_full(full)
+        if self.coarse_factor == 1:
+            return _decode(source)
+        coarse = _decode(source, REDUCED_COLOR_FLAGS[self.coarse_factor])
+        if coarse is None:
+            return None
+        path = source if isinstance(source, bytes) else str(source)
+        return CoarsePage(coarse=coarse, factor=self.coarse_factor, path=path)
+
+    def count_pages(self, image_path: Path) -> int:
+        return cv2.imcount(str(image_path))
+
+    def page_size(self, item: object, data: object | None = None) -> tuple[int, int] | None:
+        """(width, height) from the image header (Pillow opens files lazily), a shared frame's shape,
+        or None (e.g. an archive member whose bytes were not fetched yet)."""
+        if isinstance(data, FrameLease):
+            return data.shape[1], data.shape[0]
+        if isinstance(data, (bytes, bytearray)):
+            source = io.BytesIO(data)
+        elif isinstance(item, TiffPage):
+            source = item.path
+        elif isinstance(item, (str, Path)):
+            source = item
+        else:
+            return None
+        # Only the header is read: Pillow's decompression bomb limit (~179 Mpx) is lifted for this call,
+        # or it would hide the size of the very pages that need the memory plan most.
+        with _PIL_LIMIT_LOCK:
+            limit, PILImage.MAX_IMAGE_PIXELS = PILImage.MAX_IMAGE_PIXELS, None
+            try:
+                with PILImage.open(source) as im:
+                    if isinstance(item, TiffPage):
+                        im.seek(item.index)
+                    return im.size
+            except (OSError, ValueError, EOFError):
+                return None
+            finally:
+                PILImage.MAX_IMAGE_PIXELS = limit
+
+    def page_hash(self, item: object, data: object | None = None) -> int | None:
+        """DCT perceptual hash (pHash) of a 1/8-size grayscale copy: the 8x8 lowest frequencies of the
+        page shrunk to 32x32, one bit per coefficient above their median. Pages of multi-page files
+        are not hashed (that would decode them here as well as in the worker)."""
+        gray = _gray_thumbnail(item, data, HASH_REDUCTION)
+        if gray is None:
+            return None
+        small = cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.float32)
+        low = cv2.dct(small)[:8, :8].ravel()
+        return int.from_bytes(np.packbits(low > np.median(low)).tobytes(), "big")
+
+    def page_thumbnail(self, item: object, data: object | None = None) -> np.ndarray | None:
+        """1/4-size grayscale copy of a page (pages of multi-page files are not compared)."""
+        return _gray_thumbnail(item, data, DUPLICATE_REDUCTION)
+
+    def same_page(self, a: np.ndarray | None, b: np.ndarray | None) -> bool:
+        """Same size, and no pixel of the two thumbnails more than ``DUPLICATE_MAX_PIXEL_DIFF`` apart:
+        re-encodings stay well under it, while a single changed callout digit does not."""
+        if a is None or b is None or a.shape != b.shape:
+            return False
+        return int(cv2.absdiff(a, b).max()) <= DUPLICATE_MAX_PIXEL_DIFF
+
+
+def _is_jpeg(item: object, data: object | None) -> bool:
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data[:2]) == JPEG_MAGIC
+    try:
+        with open(item, "rb") as f:
+            return f.read(2) == JPEG_MAGIC
+    except OSError:
+        return False
+
+
+def _gray_thumbnail(item: object, data: object | None, factor: int) -> np.ndarray | None:
+    """Area-averaged grayscale copy of a page at 1/``factor`` size. JPEGs decode straight to the reduced
+    size (DCT scaling); OpenCV only subsamples other formats on a reduced decode, which aliases thin
+    line art, so they are decoded in full and shrunk here."""
+    if isinstance(item, TiffPage):
+        return None
+    if isinstance(data, FrameLease):
+        gray = cv2.cvtColor(attach_frame(data), cv2.COLOR_BGR2GRAY)
+    elif isinstance(data, (bytes, bytearray)) or isinstance(item, (str, Path)):
+        source = data if isinstance(data, (bytes, bytearray)) else item
+        if _is_jpeg(item, data):
+            return _decode(source, REDUCED_GRAYSCALE_FLAGS[factor])
+        gray = _decode(source, cv2.IMREAD_GRAYSCALE)
+    else:
+        return None
+    if gray is None:
+        return None
+    h, w = gray.shape[:2]
+    return cv2.resize(gray, (max(1, -(-w // factor)), max(1, -(-h // factor))), interpolation=cv2.INTER_AREA)
+
+
+def _decode_page(page: TiffPage):
+    """Decode only page ``page.index`` of a multi-page file."""
+    ok, frames = cv2.imreadmulti(str(page.path), start=page.index, count=1)
+    return frames[0] if ok and frames else None
 
 
 class OpenCVRedDetector:
@@ -27,69 +193,116 @@ class OpenCVRedDetector:
         self.debug_dir = Path(debug_dir) if debug_dir else None
         if self.debug and self.debug_dir:
             self.debug_dir.mkdir(parents=True, exist_ok=True)
+        self._coarse_detectors: dict[int, OpenCVRedDetector] = {}
+        self.scratch = ScratchArena()  # per-worker mask/morphology buffers, reused across pages
 
     def _save(self, filename: str, img) -> None:
         if not (self.debug and self.debug_dir):
             return
         cv2.imwrite(str(self.debug_dir / filename), img)
 
-    def _build_red_mask(self, bgr):
-        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    # Mask builders write into ``self.scratch``: the returned mask is only valid until the next
+    # builder call. Channel differences use saturating uint8 subtraction, which equals the signed
+    # difference for the (non-negative) delta thresholds compared against.
+    def _hsv(self, bgr):
+        hsv = self.scratch.get("hsv", bgr.shape)
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV, dst=hsv)
+
+    def _channels(self, bgr):
+        shape = bgr.shape[:2]
+        return tuple(cv2.extractChannel(bgr, i, dst=self.scratch.get(key, shape)) for i, key in enumerate("bgr"))
+
+    def _build_red_mask(self, bgr, hsv=None):
+        shape = bgr.shape[:2]
+        hsv = self._hsv(bgr) if hsv is None else hsv
 
         lower1 = np.array([0, self.s.s_min, self.s.v_min])
         upper1 = np.array([10, 255, 255])
         lower2 = np.array([170, self.s.s_min, self.s.v_min])
         upper2 = np.array([180, 255, 255])
 
-        mask_hsv = cv2.bitwise_or(cv2.inRange(hsv, lower1, upper1), cv2.inRange(hsv, lower2, upper2))
+        mask = cv2.inRange(hsv, lower1, upper1, dst=self.scratch.get("mask", shape))
+        tmp = cv2.inRange(hsv, lower2, upper2, dst=self.scratch.get("tmp", shape))
+        cv2.bitwise_or(mask, tmp, dst=mask)
 
         # RGB red dominance (helps when HSV misses washed-out reds)
-        b, g, r = cv2.split(bgr)
-        mask_rgb = ((r.astype(np.int16) - g.astype(np.int16)) > self.s.red_rgb_delta) & \
-                   ((r.astype(np.int16) - b.astype(np.int16)) > self.s.red_rgb_delta) & \
-                   (r > self.s.red_rgb_r_min)
-        mask_rgb = (mask_rgb.astype(np.uint8) * 255)
+        b, g, r = self._channels(bgr)
+        rgb = cv2.compare(r, self.s.red_rgb_r_min, cv2.CMP_GT, dst=self.scratch.get("rgb", shape))
+        for other in (g, b):
+            cv2.subtract(r, other, dst=tmp)
+            cv2.compare(tmp, self.s.red_rgb_delta, cv2.CMP_GT, dst=tmp)
+            cv2.bitwise_and(rgb, tmp, dst=rgb)
 
-        mask = cv2.bitwise_or(mask_hsv, mask_rgb)
-        return mask
+        return cv2.bitwise_or(mask, rgb, dst=mask)
 
-    def _build_blue_mask(self, bgr):
-        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    def _build_blue_mask(self, bgr, hsv=None):
+        hsv = self._hsv(bgr) if hsv is None else hsv
         lower = np.array([self.s.motor_blue_h_min, self.s.motor_blue_s_min, self.s.motor_blue_v_min])
         upper = np.array([self.s.motor_blue_h_max, 255, 255])
-        return cv2.inRange(hsv, lower, upper)
+        return cv2.inRange(hsv, lower, upper, dst=self.scratch.get("mask", bgr.shape[:2]))
 
-    def _build_green_mask(self, bgr):
-        hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    def _build_green_mask(self, bgr, hsv=None):
+        hsv = self._hsv(bgr) if hsv is None else hsv
         lower = np.array([
             self.s.free_text_green_h_min,
             self.s.free_text_green_s_min,
             self.s.free_text_green_v_min,
         ])
         upper = np.array([self.s.free_text_green_h_max, 255, 255])
-        return cv2.inRange(hsv, lower, upper)
-
-    def _build_pink_mask(self, bgr):
-        b, g, r = cv2.split(bgr)
-        mask = (
-            ((r.astype(np.int16) - g.astype(np.int16)) > self.s.body_text_red_green_delta)
-            & ((b.astype(np.int16) - g.astype(np.int16)) > self.s.body_text_blue_green_delta)
-            & (r > self.s.body_text_red_min)
-            & (b > self.s.body_text_blue_min)
-            & (np.abs(r.astype(np.int16) - b.astype(np.int16)) < self.s.body_text_red_blue_max_delta)
-        )
-        return mask.astype(np.uint8) * 255
+        return cv2.inRange(hsv, lower, upper, dst=self.scratch.get("mask", bgr.shape[:2]))
+
+    def _build_pink_mask(self, bgr, hsv=None):
+        shape = bgr.shape[:2]
+        b, g, r = self._channels(bgr)
+        mask = self.scratch.get("mask", shape)
+        tmp = self.scratch.get("tmp", shape)
+
+        cv2.subtract(r, g, dst=tmp)
+        cv2.compare(tmp, self.s.body_text_red_green_delta, cv2.CMP_GT, dst=mask)
+        cv2.subtract(b, g, dst=tmp)
+        cv2.compare(tmp, self.s.body_text_blue_green_delta, cv2.CMP_GT, dst=tmp)
+        cv2.bitwise_and(mask, tmp, dst=mask)
+        cv2.compare(r, self.s.body_text_red_min, cv2.CMP_GT, dst=tmp)
+        cv2.bitwise_and(mask, tmp, dst=mask)
+        cv2.compare(b, self.s.body_text_blue_min, cv2.CMP_GT, dst=tmp)
+        cv2.bitwise_and(mask, tmp, dst=mask)
+        cv2.absdiff(r, b, dst=tmp)
+        cv2.compare(tmp, self.s.body_text_red_blue_max_delta, cv2.CMP_LT, dst=tmp)
+        return cv2.bitwise_and(mask, tmp, dst=mask)
+
+    def present_classes(self, bgr) -> set[str]:
+        """Coarse color census: classes with enough mask pixels on a nearest-neighbour thumbnail."""
+        f = max(1, self.s.census_downscale)
+        if isinstance(bgr, CoarsePage):
+            bgr, f = bgr.coarse, max(1, f // bgr.factor)
+        small = cv2.resize(bgr, None, fx=1 / f, fy=1 / f, interpolation=cv2.INTER_NEAREST) if f > 1 else bgr
+        builders = {
+            PARTS: self._build_red_mask,
+            MOTORS: self._build_blue_mask,
+            FREE_TEXT: self._build_green_mask,
+            BODY_TEXT: self._build_pink_mask,
+        }
+        return {
+            region_class
+            for region_class, build in builders.items()
+            if cv2.countNonZero(build(small)) >= self.s.census_min_pixels
+        }
 
     def _remove_line_components(self, mask: np.ndarray) -> np.ndarray:
-        """Remove thin/long leader lines so they don't merge with digits after dilation."""
-        n, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
-        clean = mask.copy()
-        for i in range(1, n):
-            x, y, w, h, area = stats[i]
-            aspect = w / max(h, 1)
-            if (h <= 8 and aspect >= 12.0) or (aspect >= 25.0 and area < 2000):
-                clean[labels == i] = 0
-        return clean
+        """Remove thin/long leader lines (in place) so they don't merge with digits after dilation."""
+        labels = self.scratch.get("labels", mask.shape, np.int32)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(mask, labels=labels, connectivity=8)
+        w = stats[:n, cv2.CC_STAT_WIDTH]
+        h = stats[:n, cv2.CC_STAT_HEIGHT]
+        aspect = w / np.maximum(h, 1)
+        lines = ((h <= self.s.line_max_h) & (aspect >= self.s.line_min_aspect)) | \
+                ((aspect >= self.s.line_long_aspect) & (stats[:n, cv2.CC_STAT_AREA] < self.s.line_long_max_area))
+        lines[0] = False  # background
+        if lines.any():
+            keep_lut = np.where(lines, 0, 255).astype(np.uint8)
+            keep = np.take(keep_lut, labels, out=self.scratch.get("tmp", mask.shape), mode="clip")
+            cv2.bitwise_and(mask, keep, dst=mask)
+        return mask
 
     def _merge_part_bboxes(self, boxes: list[BoundingBox]) -> list[BoundingBox]:
         merged: list[BoundingBox] = []
@@ -117,174 +330,243 @@ class OpenCVRedDetector:
 
         return merged
 
-    def find_part_bboxes(self, bgr, name: str = "") -> list[BoundingBox]:
-        mask = self._build_red_mask(bgr)
-        mask = self._remove_line_components(mask)
+    def _coarse_detector(self, factor: int) -> OpenCVRedDetector:
+        if factor not in self._coarse_detectors:
+            self._coarse_detectors[factor] = OpenCVRedDetector(
+                scale_pixel_settings(self.s, factor), debug=self.debug, debug_dir=self.debug_dir
+            )
+        return self._coarse_detectors[factor]
+
+    def _coarse_regions(self, page: CoarsePage, coarse_boxes: list[BoundingBox], pad: int) -> list[ImageRegion]:
+        """Map boxes found on the reduced decode to full-image coordinates and crop the ROIs there."""
+        if not coarse_boxes:
+            return []
+        full = page.full()
+        if full is None:
+            return []
+        f = page.factor
+        height, width = full.shape[:2]
+        pad += f  # absorbs the quantization of coarse coordinates
+        regions: list[ImageRegion] = []
+        for cb in coarse_boxes:
+            x, y = cb.x * f, cb.y * f
+            bb = BoundingBox(x, y, min(cb.w * f, width - x), min(cb.h * f, height - y))
+            x1 = max(bb.x - pad, 0)
+            y1 = max(bb.y - pad, 0)
+            x2 = min(bb.x + bb.w + pad, width)
+            y2 = min(bb.y + bb.h + pad, height)
+            regions.append(ImageRegion(bbox=bb, image=full[y1:y2, x1:x2]))
+        return regions
 
-        k = cv2.getStructuringElement(cv2.MORPH_RECT, self.s.text_dilate_kernel)
-        dil = cv2.dilate(mask, k, iterations=self.s.text_dilate_iters)
+    # ---- per-class stages (shared by the full-frame and the tiled paths) ----
+    def _search_area(self, region_class: str, bgr):
+        """Part of the page searched for ``region_class`` (motors: the top ``motor_region_pct``)."""
+        if region_class == MOTORS:
+            return bgr[:int(bgr.shape[0] * self.s.motor_region_pct), :]
+        return bgr
+
+    def _color_mask(self, region_class: str, bgr, hsv=None) -> np.ndarray:
+        """Color mask of ``region_class``; ``hsv`` is ``bgr`` already converted, when the caller has it."""
+        if region_class == PARTS:
+            return self._build_red_mask(bgr, hsv)
+        if region_class == MOTORS:
+            return self._build_blue_mask(bgr, hsv)
+        if region_class == FREE_TEXT:
+            return self._build_green_mask(bgr, hsv)
+        return self._build_pink_mask(bgr)
+
+    def _class_mask(self, region_class: str, bgr) -> np.ndarray:
+        mask = self._color_mask(region_class, bgr)
+        return self._remove_line_components(mask) if region_class == PARTS else mask
+
+    def _dilation(self, region_class: str) -> tuple[tuple[int, int], int]:
+        return {
+            PARTS: (self.s.text_dilate_kernel, self.s.text_dilate_iters),
+            MOTORS: (self.s.motor_dilate_kernel, self.s.motor_dilate_iters),
+            FREE_TEXT: (self.s.free_text_dilate_kernel, self.s.free_text_dilate_iters),
+            BODY_TEXT: (self.s.body_text_dilate_kernel, self.s.body_text_dilate_iters),
+        }[region_class]
+
+    def _dilate(self, region_class: str, mask: np.ndarray) -> np.ndarray:
+        kernel, iters = self._dilation(region_class)
+        k = cv2.getStructuringElement(cv2.MORPH_RECT, kernel)
+        return cv2.dilate(mask, k, dst=self.scratch.get("dilated", mask.shape), iterations=iters)
+
+    def _components(self, dil: np.ndarray) -> tuple[int, np.ndarray]:
+        labels = self.scratch.get("labels", dil.shape, np.int32)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(dil, labels=labels, connectivity=8)
+        return n, stats
+
+    def _keep_component(self, region_class: str, x: int, y: int, w: int, h: int, area: int, H: int, W: int) -> bool:
+        """Size/position filter of one dilated component; ``H``/``W`` are the full page size."""
+        if region_class == PARTS:
+            return (
+                h >= self.s.part_min_h
+                and w <= self.s.part_max_w and h <= self.s.part_max_h
+                and (w / max(h, 1)) <= 5.0
+            )
+        if region_class == MOTORS:
+            return (
+                y >= int(H * self.s.motor_min_y_pct)
+                and area >= self.s.motor_min_area
+                and w >= self.s.motor_min_w and h >= self.s.motor_min_h
+                and w <= self.s.motor_max_w and h <= self.s.motor_max_h
+                and (w / max(h, 1)) <= 8.0
+            )
+        if region_class == FREE_TEXT:
+            return (
+                y >= int(H * self.s.free_text_min_y_pct)
+                and x <= int(W * self.s.free_text_max_x_pct)
+                and area >= self.s.free_text_min_area
+                and w >= self.s.free_text_min_w and h >= self.s.free_text_min_h
+                and w <= self.s.free_text_max_w and h <= self.s.free_text_max_h
+            )
+        return (
+            y >= int(H * self.s.body_text_min_y_pct)
+            and area >= self.s.body_text_min_area
+            and w >= self.s.body_text_min_w and h >= self.s.body_text_min_h
+            and w <= self.s.body_text_max_w and h <= self.s.body_text_max_h
+        )
 
-        if name:
-            self._save(f"{name}_parts_red_mask.png", mask)
-            self._save(f"{name}_parts_red_dilated.png", dil)
+    def _max_component_h(self, region_class: str) -> int:
+        return {
+            PARTS: self.s.part_max_h,
+            MOTORS: self.s.motor_max_h,
+            FREE_TEXT: self.s.free_text_max_h,
+            BODY_TEXT: self.s.body_text_max_h,
+        }[region_class]
 
-        n, _, stats, _ = cv2.connectedComponentsWithStats(dil, connectivity=8)
+    def _tile_overlap(self, region_class: str) -> int:
+        """Rows of context above/below a band so every component that can pass the filter is seen whole."""
+        (_, kh), iters = self._dilation(region_class)
+        return self._max_component_h(region_class) + 2 * iters * (kh // 2) + 2
 
-        out: list[BoundingBox] = []
-        for i in range(1, n):
-            x, y, w, h, area = stats[i]
+    def _use_tiles(self, search) -> bool:
+        return self.s.tile_pixels > 0 and search.shape[0] * search.shape[1] > 2 * self.s.tile_pixels
 
-            if h < self.s.part_min_h:
-                continue
-            if w > self.s.part_max_w or h > self.s.part_max_h:
-                continue
-            if (w / max(h, 1)) > 5.0:
-                continue
+    def _component_boxes(self, region_class: str, search, H: int, W: int, name: str = "") -> list[BoundingBox]:
+        """Mask -> dilation -> connected components -> filter on the whole search area."""
+        mask = self._class_mask(region_class, search)
+        dil = self._dilate(region_class, mask)
+
+        if name:
+            prefix = DEBUG_PREFIXES[region_class]
+            self._save(f"{name}_{prefix}_mask.png", mask)
+            self._save(f"{name}_{prefix}_dilated.png", dil)
+
+        n, stats = self._components(dil)
+        return self._kept_boxes(region_class, stats[1:n], H, W)
+
+    def _kept_boxes(self, region_class: str, stats, H: int, W: int) -> list[BoundingBox]:
+        """Boxes of the component ``stats`` rows (background excluded) that pass the filter."""
+        return [
+            BoundingBox(int(x), int(y), int(w), int(h))
+            for x, y, w, h, area in stats
+            if self._keep_component(region_class, int(x), int(y), int(w), int(h), int(area), H, W)
+        ]
+
+    def _tiled_component_boxes(self, region_class: str, search, H: int, W: int) -> list[BoundingBox]:
+        """Same as ``_component_boxes`` but over overlapping horizontal bands of bounded size.
+
+        Each component is kept only by the band where its top row lies, and components cut by
+        an inner band edge are dropped: the overlap guarantees a whole copy exists next door.
+        """
+        rows, cols = search.shape[:2]
+        overlap = self._tile_overlap(region_class)
+        band = max(overlap, self.s.tile_pixels // max(cols, 1) - 2 * overlap)
 
-            out.append(BoundingBox(int(x), int(y), int(w), int(h)))
+        out: list[BoundingBox] = []
+        for start in range(0, rows, band):
+            top = max(0, start - overlap)
+            bottom = min(rows, start + band + overlap)
+            dil = self._dilate(region_class, self._class_mask(region_class, search[top:bottom]))
+            n, stats = self._components(dil)
+            for x, y, w, h, area in stats[1:n]:
+                if (y == 0 and top > 0) or (y + h == bottom - top and bottom < rows):
+                    continue
+                gy = int(y) + top
+                if not start <= gy < start + band:
+                    continue
+                if self._keep_component(region_class, int(x), gy, int(w), int(h), int(area), H, W):
+                    out.append(BoundingBox(int(x), gy, int(w), int(h)))
+        return out
 
-        out = self._merge_part_bboxes(out)
-        return sorted(out, key=lambda bb: (bb.y, bb.x))
+    def _class_boxes(self, region_class: str, search, H: int, W: int, name: str = "") -> list[BoundingBox]:
+        if self._use_tiles(search):
+            boxes = self._tiled_component_boxes(region_class, search, H, W)
+        else:
+            boxes = self._component_boxes(region_class, search, H, W, name=name)
+        return self._finish_boxes(region_class, boxes)
+
+    def _finish_boxes(self, region_class: str, boxes: list[BoundingBox]) -> list[BoundingBox]:
+        if region_class == PARTS:
+            boxes = self._merge_part_bboxes(boxes)
+        return sorted(boxes, key=lambda bb: (bb.y, bb.x))
+
+    @staticmethod
+    def _crop(src, bb: BoundingBox, pad: int):
+        height, width = src.shape[:2]
+        x1 = max(bb.x - pad, 0)
+        y1 = max(bb.y - pad, 0)
+        x2 = min(bb.x + bb.w + pad, width)
+        y2 = min(bb.y + bb.h + pad, height)
+        return src[y1:y2, x1:x2]
+
+    # ---- public API ----
+    def find_part_bboxes(self, bgr, name: str = "") -> list[BoundingBox]:
+        H, W = bgr.shape[:2]
+        return self._class_boxes(PARTS, bgr, H, W, name=name)
 
     def find_part_regions(self, bgr, name: str = "") -> list[ImageRegion]:
-        regions: list[ImageRegion] = []
-        height, width = bgr.shape[:2]
-        for bb in self.find_part_bboxes(bgr, name=name):
-            pad = self.s.part_roi_padding
-            x1 = max(bb.x - pad, 0)
-            y1 = max(bb.y - pad, 0)
-            x2 = min(bb.x + bb.w + pad, width)
-            y2 = min(bb.y + bb.h + pad, height)
-            roi = bgr[y1:y2, x1:x2]
-            regions.append(ImageRegion(bbox=bb, image=roi))
-        return regions
+        if isinstance(bgr, CoarsePage):
+            boxes = self._coarse_detector(bgr.factor).find_part_bboxes(bgr.coarse, name=name)
+            return self._coarse_regions(bgr, boxes, self.s.part_roi_padding)
+        return [
+            ImageRegion(bbox=bb, image=self._crop(bgr, bb, self.s.part_roi_padding))
+            for bb in self.find_part_bboxes(bgr, name=name)
+        ]
 
     def find_motor_bboxes(self, bgr, name: str = "") -> list[tuple[BoundingBox, np.ndarray]]:
         """Return blue motor candidate regions as (bbox_in_full_image, roi_bgr)."""
         H, W = bgr.shape[:2]
-        top_h = int(H * self.s.motor_region_pct)
-        top = bgr[:top_h, :]
-
-        mask = self._build_blue_mask(top)
-        k = cv2.getStructuringElement(cv2.MORPH_RECT, self.s.motor_dilate_kernel)
-        dil = cv2.dilate(mask, k, iterations=self.s.motor_dilate_iters)
-
+        top = self._search_area(MOTORS, bgr)
         if name:
             self._save(f"{name}_motor_top.png", top)
-            self._save(f"{name}_motor_blue_mask.png", mask)
-            self._save(f"{name}_motor_blue_dilated.png", dil)
-
-        n, _, stats, _ = cv2.connectedComponentsWithStats(dil, connectivity=8)
-
-        out: list[tuple[BoundingBox, np.ndarray]] = []
-        for i in range(1, n):
-            x, y, w, h, area = stats[i]
-            if y < int(H * self.s.motor_min_y_pct):
-                continue
-            if area < self.s.motor_min_area:
-                continue
-            if w < self.s.motor_min_w or h < self.s.motor_min_h:
-                continue
-            if w > self.s.motor_max_w or h > self.s.motor_max_h:
-                continue
-            if (w / max(h, 1)) > 8.0:
-                continue
-
-            # create bbox in full-image coordinates
-            bb = BoundingBox(int(x), int(y), int(w), int(h))
-
-            pad = self.s.motor_roi_padding
-            x1 = max(int(x) - pad, 0)
-            y1 = max(int(y) - pad, 0)
-            x2 = min(int(x + w) + pad, top.shape[1])
-            y2 = min(int(y + h) + pad, top.shape[0])
-            roi = top[y1:y2, x1:x2]
-            out.append((bb, roi))
-
-        out.sort(key=lambda t: (t[0].y, t[0].x))
-        return out
+        return [
+            (bb, self._crop(top, bb, self.s.motor_roi_padding))
+            for bb in self._class_boxes(MOTORS, top, H, W, name=name)
+        ]
 
     def find_motor_regions(self, bgr, name: str = "") -> list[ImageRegion]:
+        if isinstance(bgr, CoarsePage):
+            found = self._coarse_detector(bgr.factor).find_motor_bboxes(bgr.coarse, name=name)
+            return self._coarse_regions(bgr, [bb for bb, _ in found], self.s.motor_roi_padding)
         return [ImageRegion(bbox=bb, image=roi) for bb, roi in self.find_motor_bboxes(bgr, name=name)]
 
     def find_free_text_bboxes(self, bgr, name: str = "") -> list[tuple[BoundingBox, np.ndarray]]:
         """Return green free-text candidate regions as (bbox_in_full_image, roi_bgr)."""
         H, W = bgr.shape[:2]
-        mask = self._build_green_mask(bgr)
-        k = cv2.getStructuringElement(cv2.MORPH_RECT, self.s.free_text_dilate_kernel)
-        dil = cv2.dilate(mask, k, iterations=self.s.free_text_dilate_iters)
-
-        if name:
-            self._save(f"{name}_free_text_green_mask.png", mask)
-            self._save(f"{name}_free_text_green_dilated.png", dil)
-
-        n, _, stats, _ = cv2.connectedComponentsWithStats(dil, connectivity=8)
-
-        out: list[tuple[BoundingBox, np.ndarray]] = []
-        for i in range(1, n):
-            x, y, w, h, area = stats[i]
-            if y < int(H * self.s.free_text_min_y_pct):
-                continue
-            if x > int(W * self.s.free_text_max_x_pct):
-                continue
-            if area < self.s.free_text_min_area:
-                continue
-            if w < self.s.free_text_min_w or h < self.s.free_text_min_h:
-                continue
-            if w > self.s.free_text_max_w or h > self.s.free_text_max_h:
-                continue
-
-            bb = BoundingBox(int(x), int(y), int(w), int(h))
-            pad = self.s.free_text_roi_padding
-            x1 = max(int(x) - pad, 0)
-            y1 = max(int(y) - pad, 0)
-            x2 = min(int(x + w) + pad, W)
-            y2 = min(int(y + h) + pad, H)
-            roi = bgr[y1:y2, x1:x2]
-            out.append((bb, roi))
-
-        out.sort(key=lambda t: (t[0].y, t[0].x))
-        return out
+        return [
+            (bb, self._crop(bgr, bb, self.s.free_text_roi_padding))
+            for bb in self._class_boxes(FREE_TEXT, bgr, H, W, name=name)
+        ]
 
     def find_free_text_regions(self, bgr, name: str = "") -> list[ImageRegion]:
+        if isinstance(bgr, CoarsePage):
+            found = self._coarse_detector(bgr.factor).find_free_text_bboxes(bgr.coarse, name=name)
+            return self._coarse_regions(bgr, [bb for bb, _ in found], self.s.free_text_roi_padding)
         return [ImageRegion(bbox=bb, image=roi) for bb, roi in self.find_free_text_bboxes(bgr, name=name)]
 
     def find_body_text_bboxes(self, bgr, name: str = "") -> list[tuple[BoundingBox, np.ndarray]]:
         """Return pink body-text candidate regions as (bbox_in_full_image, roi_bgr)."""
         H, W = bgr.shape[:2]
-        mask = self._build_pink_mask(bgr)
-        k = cv2.getStructuringElement(cv2.MORPH_RECT, self.s.body_text_dilate_kernel)
-        dil = cv2.dilate(mask, k, iterations=self.s.body_text_dilate_iters)
-
-        if name:
-            self._save(f"{name}_body_text_pink_mask.png", mask)
-            self._save(f"{name}_body_text_pink_dilated.png", dil)
-
-        n, _, stats, _ = cv2.connectedComponentsWithStats(dil, connectivity=8)
-
-        out: list[tuple[BoundingBox, np.ndarray]] = []
-        for i in range(1, n):
-            x, y, w, h, area = stats[i]
-            if y < int(H * self.s.body_text_min_y_pct):
-                continue
-            if area < self.s.body_text_min_area:
-                continue
-            if w < self.s.body_text_min_w or h < self.s.body_text_min_h:
-                continue
-            if w > self.s.body_text_max_w or h > self.s.body_text_max_h:
-                continue
-
-            bb = BoundingBox(int(x), int(y), int(w), int(h))
-            pad = self.s.body_text_roi_padding
-            x1 = max(int(x) - pad, 0)
-            y1 = max(int(y) - pad, 0)
-            x2 = min(int(x + w) + pad, W)
-            y2 = min(int(y + h) + pad, H)
-            roi = bgr[y1:y2, x1:x2]
-            out.append((bb, roi))
-
-        out.sort(key=lambda t: (t[0].y, t[0].x))
-        return out
+        return [
+            (bb, self._crop(bgr, bb, self.s.body_text_roi_padding))
+            for bb in self._class_boxes(BODY_TEXT, bgr, H, W, name=name)
+        ]
 
     def find_body_text_regions(self, bgr, name: str = "") -> list[ImageRegion]:
+        if isinstance(bgr, CoarsePage):
+            found = self._coarse_detector(bgr.factor).find_body_text_bboxes(bgr.coarse, name=name)
+            return self._coarse_regions(bgr, [bb for bb, _ in found], self.s.body_text_roi_padding)
         return [ImageRegion(bbox=bb, image=roi) for bb, roi in self.find_body_text_bboxes(bgr, name=name)]
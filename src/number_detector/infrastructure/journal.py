@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+from number_detector.domain.models.bounding_box import BoundingBox
+from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.domain.models.detections import Detections
+
+
+def result_to_dict(result: DetectionResult) -> dict:
+    return {
+        "image_name": result.image_name,
+        "part_numbers": result.part_numbers,
+        "motor_codes": result.motor_codes,
+        "free_text": result.free_text,
+        "body_text": result.body_text,
+        "error": result.error,
+        "metrics": result.metrics,
+        "detections": [list(row) for row in result.detections.rows()],
+        "duplicate_of": result.duplicate_of,
+    }
+
+
+def result_from_dict(data: dict) -> DetectionResult:
+    detections = Detections()
+    for cls, x, y, w, h, text, confidence in data.get("detections", []):
+        detections.append(cls, BoundingBox(x, y, w, h), text, confidence)
+    return DetectionResult(
+        image_name=data["image_name"],
+        part_numbers=data["part_numbers"],
+        motor_codes=data["motor_codes"],
+        free_text=data.get("free_text", []),
+        body_text=data.get("body_text", []),
+        error=data.get("error"),
+        metrics=data.get("metrics", {}),
+        detections=detections,
+        duplicate_of=data.get("duplicate_of"),
+    )
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _header(input_dir: str | Path | None, settings_hash: str) -> dict:
+    return {"input": str(Path(input_dir).resolve()) if input_dir is not None else None, "settings": settings_hash}
+
+
+def _read_header(path: Path) -> dict | None:
+    try:
+        with path.open(encoding="utf-8") as f:
+            entry = json.loads(f.readline())
+    except (OSError, json.JSONDecodeError):
+        return None
+    return entry.get("run") if isinstance(entry, dict) else None
+
+
+class JsonlJournal:
+    """Append-only checkpoint of a batch run: one JSON line per finished work item.
+
+    The first line records the run: the resolved input folder and ``settings_hash`` (see
+    ``settings_fingerprint``). A journal written for another folder or other settings is not
+    resumed: it is started over. Every line is flushed to the OS as it is written (a killed
+    process loses nothing); it is fsynced every ``fsync_every`` lines or ``fsync_seconds``
+    seconds, bounding what a power cut can lose. A torn last line is ignored when reading the
+    journal back.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        resume: bool = False,
+        input_dir: str | Path | None = None,
+        settings_hash: str = "",
+        fsync_every: int = 50,
+        fsync_seconds: float = 5.0,
+    ):
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_seconds = fsync_seconds
+        header = _header(input_dir, settings_hash)
+        resume = resume and _read_header(self.path) == header
+        self._completed = self._load() if resume else {}
+        self._f = self.path.open("a" if resume else "w", encoding="utf-8")
+        if resume and not _ends_with_newline(self.path):
+            self._f.write("\n")  # terminate a torn last line so the next record parses
+        if not resume:
+            self._f.write(json.dumps({"run": header}, ensure_ascii=False) + "\n")
+            self._f.flush()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @staticmethod
+    def can_resume(path: str | Path, input_dir: str | Path | None = None, settings_hash: str = "") -> bool:
+        """Whether ``path`` holds a journal of a run over ``input_dir`` with ``settings_hash``."""
+        return _read_header(Path(path)) == _header(input_dir, settings_hash)
+
+    def _load(self) -> dict[str, DetectionResult]:
+        completed: dict[str, DetectionResult] = {}
+        with self.path.open(encoding="utf-8") as f:
+            next(f)  # run header
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn write from an interrupted run
+                result = result_from_dict(entry["result"])
+                if result.error:
+                    completed.pop(entry["item"], None)  # failed: scan it again on resume
+                else:
+                    completed[entry["item"]] = result
+        return completed
+
+    def completed(self) -> dict[str, DetectionResult]:
+        """Results of the items finished without error by the run being resumed."""
+        return dict(self._completed)
+
+    def record(self, item: str, result: DetectionResult) -> None:
+        self._f.write(json.dumps({"item": item, "result": result_to_dict(result)}, ensure_ascii=False) + "\n")
+        self._f.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_seconds:
+            self.sync()
+
+    def sync(self) -> None:
+        os.fsync(self._f.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self.sync()
+            self._f.close()
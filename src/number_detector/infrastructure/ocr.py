@@ -1,41 +1,126 @@
 from __future__ import annotations
 
 import cv2
+import numpy as np
 import pytesseract
 
+from number_detector.application.settings import DetectionSettings
+from number_detector.domain.models.ocr_text import OcrText
+from number_detector.infrastructure.buffers import ScratchArena
+
 class TesseractService:
-    def __init__(self, tesseract_cmd: str):
+    def __init__(self, tesseract_cmd: str, settings: DetectionSettings | None = None):
         pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        self.s = settings or DetectionSettings()
+        self.scratch = ScratchArena()
 
         self.cfg_digits = "--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789"
         self.cfg_motor = "--oem 1 --psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789./-"
         self.cfg_free_text = "--oem 1 --psm 6"
 
-    def _prep(self, roi_bgr, scale: float = 2.5):
-        roi = cv2.resize(roi_bgr, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
-        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-        _, th = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    def measure_glyphs(self, gray) -> tuple[float, float] | None:
+        """Return (typical glyph height, median stroke width) in px of the dark text in a gray ROI."""
+        fg = self.scratch.get("glyph_fg", gray.shape)
+        cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU, dst=fg)
+        labels = self.scratch.get("glyph_labels", gray.shape, np.int32)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(fg, labels=labels, connectivity=8)
+
+        # Ignore specks and anything spanning the whole ROI (frames, leader lines, backgrounds).
+        roi_h = gray.shape[0]
+        glyphs = stats[1:n]
+        glyphs = glyphs[(glyphs[:, cv2.CC_STAT_AREA] >= 4) & (glyphs[:, cv2.CC_STAT_HEIGHT] >= 3)
+                        & (glyphs[:, cv2.CC_STAT_HEIGHT] < roi_h - 1)]
+        if not len(glyphs):
+            return None
+
+        dist = self.scratch.get("glyph_dist", gray.shape, np.float32)
+        cv2.distanceTransform(fg, cv2.DIST_L2, 3, dst=dist)
+        ink = dist[dist > 0]
+        stroke = float(np.median(ink)) * 2.0 if ink.size else 1.0
+        return float(np.percentile(glyphs[:, cv2.CC_STAT_HEIGHT], 75)), stroke
+
+    def _adaptive_scale(self, gray, glyph_px: int, fallback: float, max_scale: float) -> float:
+        measured = self.measure_glyphs(gray)
+        if measured is None:
+            return fallback
+        height, stroke = measured
+        scale = max(glyph_px / height, self.s.ocr_min_stroke_px / stroke)
+        return min(max(scale, self.s.ocr_min_scale), max_scale)
+
+    def _prep(self, roi_bgr, scale: float = 2.5, glyph_px: int | None = None, max_scale: float | None = None):
+        gray = self.scratch.get("gray", roi_bgr.shape[:2])
+        cv2.cvtColor(roi_bgr, cv2.COLOR_BGR2GRAY, dst=gray)
+        if glyph_px and self.s.ocr_adaptive_scale:
+            cap = self.s.ocr_max_scale if max_scale is None else max_scale
+            scale = self._adaptive_scale(gray, glyph_px, fallback=scale, max_scale=cap)
+
+        size = (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale)))
+        resized = self.scratch.get("resized", (size[1], size[0]))
+        interpolation = cv2.INTER_CUBIC if scale > 1.0 else cv2.INTER_AREA
+        cv2.resize(gray, size, dst=resized, interpolation=interpolation)
+
+        th = self.scratch.get("threshold", resized.shape)
+        cv2.threshold(resized, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=th)
         return th
 
+    def _read(self, roi_bgr, config: str, scale: float = 2.5, glyph_px: int | None = None) -> str:
+        th = self._prep(roi_bgr, scale=scale, glyph_px=glyph_px)
+        return pytesseract.image_to_string(th, config=config).strip()
+
     def read_digits(self, roi_bgr) -> str:
-        th = self._prep(roi_bgr)
-        return pytesseract.image_to_string(th, config=self.cfg_digits).strip()
+        return self._read(roi_bgr, self.cfg_digits, glyph_px=self.s.ocr_part_glyph_px)
 
     def read_raw_digits(self, roi_bgr) -> str:
         return pytesseract.image_to_string(roi_bgr,config='--psm 6 -c tessedit_char_whitelist=0123456789')
 
     def read_text(self, roi_bgr) -> str:
-        th = self._prep(roi_bgr)
-        return pytesseract.image_to_string(th, config=self.cfg_motor).strip()
+        return self._read(roi_bgr, self.cfg_motor, glyph_px=self.s.ocr_motor_glyph_px)
 
     def read_motor_text(self, roi_bgr) -> str:
-        th = self._prep(roi_bgr)
-        return pytesseract.image_to_string(th, config=self.cfg_free_text).strip()
+        return self._read(roi_bgr, self.cfg_free_text, glyph_px=self.s.ocr_motor_glyph_px)
 
     def read_free_text(self, roi_bgr) -> str:
-        th = self._prep(roi_bgr)
-        return pytesseract.image_to_string(th, config=self.cfg_free_text).strip()
+        return self._read(roi_bgr, self.cfg_free_text, glyph_px=self.s.ocr_free_text_glyph_px)
 
     def read_body_text(self, roi_bgr) -> str:
-        th = self._prep(roi_bgr, scale=3.0)
-        return pytesseract.image_to_string(th, config=self.cfg_free_text).strip()
+        return self._read(roi_bgr, self.cfg_free_text, scale=3.0, glyph_px=self.s.ocr_body_text_glyph_px)
+
+
+class FastTesseractService(TesseractService):
+    """Cheap first pass of the OCR cascade.
+
+    Preprocesses each ROI like the full pass but never upscales it past ``scale`` (the per-call
+    scale and the adaptive glyph scale are both capped), and returns :class:`OcrText` with the mean
+    word confidence from ``image_to_data`` so the caller can decide whether to escalate.
+    """
+
+    def __init__(self, tesseract_cmd: str, scale: float = 1.0, settings: DetectionSettings | None = None):
+        super().__init__(tesseract_cmd, settings=settings)
+        self.scale = scale
+
+    def _prep(self, roi_bgr, scale: float = 2.5, glyph_px: int | None = None, max_scale: float | None = None):
+        cap = self.scale if max_scale is None else min(max_scale, self.scale)
+        return super()._prep(roi_bgr, scale=min(scale, cap), glyph_px=glyph_px, max_scale=cap)
+
+    def _read(self, roi_bgr, config: str, scale: float = 2.5, glyph_px: int | None = None) -> OcrText:
+        th = self._prep(roi_bgr, scale=scale, glyph_px=glyph_px)
+        data = pytesseract.image_to_data(th, config=config, output_type=pytesseract.Output.DICT)
+        return text_from_tesseract_data(data)
+
+
+def text_from_tesseract_data(data: dict) -> OcrText:
+    """Rebuild line-separated text from ``image_to_data`` output, tagged with the mean word confidence."""
+    lines: dict[tuple[int, int, int], list[str]] = {}
+    confidences: list[float] = []
+    for i, word in enumerate(data.get("text", [])):
+        word = (word or "").strip()
+        conf = float(data["conf"][i])
+        if not word or conf < 0:
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append(word)
+        confidences.append(conf)
+
+    text = "\n".join(" ".join(words) for _, words in sorted(lines.items()))
+    confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return OcrText(text, confidence)
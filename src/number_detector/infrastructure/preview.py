@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from number_detector.application.constants import BODY_TEXT, FREE_TEXT, MOTORS, PARTS, REGION_CLASSES
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.stage_graph import Stage, StageGraph
+from number_detector.domain.models.bounding_box import BoundingBox
+from number_detector.infrastructure.imaging import OpenCVImageReader, OpenCVRedDetector
+
+# Settings read by each per-class stage of OpenCVRedDetector (the memo keys of the preview graph).
+MASK_FIELDS = {
+    PARTS: ("s_min", "v_min", "red_rgb_delta", "red_rgb_r_min"),
+    MOTORS: ("motor_region_pct", "motor_blue_h_min", "motor_blue_h_max", "motor_blue_s_min", "motor_blue_v_min"),
+    FREE_TEXT: ("free_text_green_h_min", "free_text_green_h_max", "free_text_green_s_min", "free_text_green_v_min"),
+    BODY_TEXT: (
+        "body_text_red_green_delta", "body_text_blue_green_delta", "body_text_red_min", "body_text_blue_min",
+        "body_text_red_blue_max_delta",
+    ),
+}
+LINE_FIELDS = ("line_max_h", "line_min_aspect", "line_long_aspect", "line_long_max_area")
+DILATE_FIELDS = {
+    PARTS: ("text_dilate_kernel", "text_dilate_iters"),
+    MOTORS: ("motor_dilate_kernel", "motor_dilate_iters"),
+    FREE_TEXT: ("free_text_dilate_kernel", "free_text_dilate_iters"),
+    BODY_TEXT: ("body_text_dilate_kernel", "body_text_dilate_iters"),
+}
+FILTER_FIELDS = {
+    PARTS: ("part_min_h", "part_max_w", "part_max_h", "part_merge_gap"),
+    MOTORS: ("motor_min_y_pct", "motor_min_area", "motor_min_w", "motor_min_h", "motor_max_w", "motor_max_h"),
+    FREE_TEXT: (
+        "free_text_min_y_pct", "free_text_max_x_pct", "free_text_min_area",
+        "free_text_min_w", "free_text_min_h", "free_text_max_w", "free_text_max_h",
+    ),
+    BODY_TEXT: (
+        "body_text_min_y_pct", "body_text_min_area",
+        "body_text_min_w", "body_text_min_h", "body_text_max_w", "body_text_max_h",
+    ),
+}
+OCR_COMMON_FIELDS = (
+    "ocr_cascade", "ocr_fast_scale", "ocr_fast_min_confidence",
+    "ocr_adaptive_scale", "ocr_min_stroke_px", "ocr_min_scale", "ocr_max_scale",
+)
+OCR_FIELDS = {
+    PARTS: ("part_roi_padding", "ocr_part_glyph_px", "min_part_digits", "max_part_digits", *OCR_COMMON_FIELDS),
+    MOTORS: ("motor_region_pct", "motor_roi_padding", "ocr_motor_glyph_px", *OCR_COMMON_FIELDS),
+    FREE_TEXT: ("free_text_roi_padding", "ocr_free_text_glyph_px", *OCR_COMMON_FIELDS),
+    BODY_TEXT: ("body_text_roi_padding", "ocr_body_text_glyph_px", *OCR_COMMON_FIELDS),
+}
+ROI_PADDING_FIELDS = {PARTS: "part_roi_padding", MOTORS: "motor_roi_padding",
+                      FREE_TEXT: "free_text_roi_padding", BODY_TEXT: "body_text_roi_padding"}
+
+# Box colors (BGR) of the preview overlay
+CLASS_COLORS = {PARTS: (0, 0, 230), MOTORS: (230, 90, 0), FREE_TEXT: (0, 170, 0), BODY_TEXT: (200, 0, 200)}
+
+# Reads one ROI of a region class (e.g. ``ScanSingleImageUseCase.read_region``) with the given settings.
+RegionReaderFactory = Callable[[DetectionSettings], Callable[[str, np.ndarray], str]]
+
+
+@dataclass
+class PreviewResult:
+    """Detection of every requested class on the preview page; ``texts`` only when OCR ran."""
+
+    boxes: dict[str, list[BoundingBox]] = field(default_factory=dict)
+    texts: dict[str, list[str]] = field(default_factory=dict)
+    recomputed: list[str] = field(default_factory=list)
+
+
+class PreviewPipeline:
+    """One page run through :class:`OpenCVRedDetector` as a memoized :class:`StageGraph`.
+
+    Per class: HSV page (shared) -> color mask of the search area -> leader-line removal (parts) -> dilation ->
+    connected components -> filter/merge -> OCR. Each stage is keyed on the settings it reads
+    (see ``MASK_FIELDS`` ...), so after a settings change only the affected stages run again;
+    OCR results are also kept per box, so a filter change only reads the boxes that are new.
+    The preview always works on the full-resolution page (no coarse decode or tiling).
+    :attr:`ocr_reads` counts the ROIs actually sent to OCR since the page was loaded.
+    """
+
+    def __init__(self, region_reader: RegionReaderFactory | None = None, cache_size: int = 1):
+        self.region_reader = region_reader
+        self.detector = OpenCVRedDetector(DetectionSettings())
+        self.page: np.ndarray | None = None
+        self.source: Path | None = None
+        self._ocr_cache: dict[tuple, str] = {}
+        self.ocr_reads = 0
+        self.graph = StageGraph(self._stages(), cache_size=cache_size)
+
+    def load(self, source: str | Path) -> bool:
+        """Decode the page to preview; False when it cannot be opened."""
+        page = OpenCVImageReader().read(Path(source))
+        self.set_page(page, Path(source))
+        return page is not None
+
+    def set_page(self, page: np.ndarray | None, source: Path | None = None) -> None:
+        """Preview an already decoded page (e.g. a reduced decode)."""
+        self.graph.clear()
+        self._ocr_cache.clear()
+        self.ocr_reads = 0
+        self.page, self.source = page, source
+
+    # ---- stages ----
+    def _with(self, settings: DetectionSettings) -> OpenCVRedDetector:
+        self.detector.s = settings
+        return self.detector
+
+    def _stages(self) -> list[Stage]:
+        stages = [
+            Stage("page", lambda s: self.page),
+            Stage("hsv", lambda s, page: cv2.cvtColor(page, cv2.COLOR_BGR2HSV), ("page",)),
+        ]
+        for cls in REGION_CLASSES:
+            stages += [
+                Stage(f"mask:{cls}", self._mask_stage(cls), ("page", "hsv"), MASK_FIELDS[cls]),
+                Stage(
+                    f"lines:{cls}",
+                    (lambda s, mask: self._with(s)._remove_line_components(mask.copy())) if cls == PARTS
+                    else (lambda s, mask: mask),
+                    (f"mask:{cls}",),
+                    LINE_FIELDS if cls == PARTS else (),
+                ),
+                Stage(f"dilate:{cls}", self._dilate_stage(cls), (f"lines:{cls}",), DILATE_FIELDS[cls]),
+                Stage(f"components:{cls}", self._components_stage, (f"dilate:{cls}",)),
+                Stage(f"boxes:{cls}", self._boxes_stage(cls), ("page", f"components:{cls}"), FILTER_FIELDS[cls]),
+                Stage(f"ocr:{cls}", self._ocr_stage(cls), ("page", f"boxes:{cls}"), OCR_FIELDS[cls]),
+            ]
+        return stages
+
+    def _mask_stage(self, cls: str):
+        def run(s: DetectionSettings, page: np.ndarray, hsv: np.ndarray) -> np.ndarray:
+            detector = self._with(s)
+            search = detector._search_area(cls, page)
+            return detector._color_mask(cls, search, hsv[:search.shape[0]]).copy()
+        return run
+
+    def _dilate_stage(self, cls: str):
+        return lambda s, mask: self._with(s)._dilate(cls, mask).copy()
+
+    def _components_stage(self, s: DetectionSettings, dilated: np.ndarray) -> np.ndarray:
+        n, stats = self.detector._components(dilated)
+        return stats[1:n].copy()
+
+    def _boxes_stage(self, cls: str):
+        def run(s: DetectionSettings, page: np.ndarray, stats: np.ndarray) -> list[BoundingBox]:
+            detector = self._with(s)
+            H, W = page.shape[:2]
+            return detector._finish_boxes(cls, detector._kept_boxes(cls, stats, H, W))
+        return run
+
+    def _ocr_stage(self, cls: str):
+        def run(s: DetectionSettings, page: np.ndarray, boxes: list[BoundingBox]) -> list[str]:
+            if self.region_reader is None:
+                return ["" for _ in boxes]
+            read = None
+            ocr_key = tuple(getattr(s, f) for f in OCR_FIELDS[cls])
+            texts = []
+            for bb in boxes:
+                key = (cls, bb, ocr_key)
+                if key not in self._ocr_cache:
+                    read = read or self.region_reader(s)
+                    search = self._with(s)._search_area(cls, page)
+                    roi = OpenCVRedDetector._crop(search, bb, getattr(s, ROI_PADDING_FIELDS[cls]))
+                    self._ocr_cache[key] = str(read(cls, roi)).strip()
+                    self.ocr_reads += 1
+                texts.append(self._ocr_cache[key])
+            return texts
+        return run
+
+    # ---- public API ----
+    def mask(self, settings: DetectionSettings, region_class: str, dilated: bool = False) -> np.ndarray:
+        """Class mask over its search area, before or after dilation."""
+        return self.graph.evaluate(f"{'dilate' if dilated else 'lines'}:{region_class}", settings)
+
+    def run(self, settings: DetectionSettings, ocr: bool = False) -> PreviewResult:
+        """Boxes (and OCR texts) of ``settings.enabled_classes`` on the loaded page."""
+        if self.page is None:
+            raise RuntimeError("No page loaded")
+        self.graph.reset_stats()
+        result = PreviewResult()
+        for cls in settings.enabled_classes:
+            result.boxes[cls] = self.graph.evaluate(f"boxes:{cls}", settings)
+            if ocr:
+                result.texts[cls] = self.graph.evaluate(f"ocr:{cls}", settings)
+        result.recomputed = list(self.graph.recomputed)
+        return result
+
+
+def render_preview(page: np.ndarray, result: PreviewResult, mask: np.ndarray | None = None) -> np.ndarray:
+    """BGR image of the page (or of ``mask``, over the page area) with the detected boxes drawn on it."""
+    if mask is None:
+        canvas = page.copy()
+    else:
+        canvas = np.zeros_like(page)
+        canvas[:mask.shape[0], :mask.shape[1]] = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
+    thickness = max(2, page.shape[1] // 800)
+    for cls, boxes in result.boxes.items():
+        for bb in boxes:
+            cv2.rectangle(canvas, (bb.x, bb.y), (bb.x + bb.w, bb.y + bb.h), CLASS_COLORS[cls], thickness)
+    return canvas
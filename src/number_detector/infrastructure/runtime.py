@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import math
 import os
+from dataclasses import dataclass
 from pathlib import Path
 
 
@@ -29,3 +31,118 @@ def check_tesseract_installed() -> bool:
         return True
     except Exception:
         return False
+
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def cgroup_cpu_quota(root: Path = CGROUP_ROOT) -> float | None:
+    """CPUs allowed by the cgroup CPU quota (v2 ``cpu.max`` or v1 CFS quota); None when unlimited or unknown."""
+    try:
+        quota, period = (root / "cpu.max").read_text().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    for v1 in (root / "cpu", root / "cpu,cpuacct"):
+        try:
+            quota = int((v1 / "cpu.cfs_quota_us").read_text())
+            period = int((v1 / "cpu.cfs_period_us").read_text())
+        except (OSError, ValueError):
+            continue
+        return quota / period if quota > 0 and period > 0 else None
+    return None
+
+
+def physical_memory(root: Path = CGROUP_ROOT) -> int | None:
+    """Bytes of RAM this process can use: the machine's, capped by a cgroup memory limit; None if unknown."""
+    total = None
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        if os.name == "nt":
+            import ctypes
+
+            class MemoryStatus(ctypes.Structure):
+                _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                            ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                            ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                            ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                            ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+            status = MemoryStatus(dwLength=ctypes.sizeof(MemoryStatus))
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                total = status.ullTotalPhys
+    for limit_file in (root / "memory.max", root / "memory" / "memory.limit_in_bytes"):
+        try:
+            limit = int(limit_file.read_text())
+        except (OSError, ValueError):  # missing, or "max"
+            continue
+        if total is None or limit < total:
+            total = limit
+    return total
+
+
+def available_cpus() -> list[int]:
+    """CPUs this process may run on: its affinity mask, cut down to the cgroup CPU quota (containers)."""
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        cpus = cpus[:max(1, math.ceil(quota))]
+    return cpus
+
+
+@dataclass(frozen=True)
+class CpuBudget:
+    """How a scan splits the machine: worker processes, and the threads each may start.
+
+    ``opencv_threads`` caps OpenCV's own thread pool in each worker and ``ocr_threads`` the OpenMP
+    team of each Tesseract process it runs (``OMP_THREAD_LIMIT``). With ``pin``, worker *i* is
+    bound to its share of ``cpus`` (and so are the Tesseract processes it starts).
+    """
+
+    workers: int
+    opencv_threads: int
+    ocr_threads: int
+    cpus: tuple[int, ...]
+    pin: bool = False
+
+    def worker_cpus(self, index: int) -> tuple[int, ...]:
+        """CPUs of the ``index``-th worker when pinned: a contiguous share, one CPU each when oversubscribed."""
+        n, w = len(self.cpus), self.workers
+        if w >= n:
+            return (self.cpus[index % n],)
+        i = index % w
+        return self.cpus[i * n // w:(i + 1) * n // w]
+
+
+def plan_cpu_budget(workers: int = 0, pin: bool = False, cpus: list[int] | None = None) -> CpuBudget:
+    """Split ``cpus`` (default: :func:`available_cpus`) so workers x threads never exceeds them.
+
+    ``workers`` = 0 runs one worker per CPU; each worker spends most of its time in OpenCV or waiting
+    for Tesseract, so more workers than CPUs only adds contention.
+    """
+    cpus = tuple(cpus if cpus is not None else available_cpus())
+    count = workers if workers > 0 else len(cpus)
+    threads = max(1, len(cpus) // count)
+    return CpuBudget(workers=count, opencv_threads=threads, ocr_threads=threads, cpus=cpus, pin=pin)
+
+
+def init_scan_worker(budget: CpuBudget, counter) -> None:
+    """Process-pool initializer: apply ``budget`` to this worker (``counter``: shared int numbering the workers)."""
+    import cv2
+
+    os.environ["OMP_THREAD_LIMIT"] = str(budget.ocr_threads)  # inherited by the Tesseract processes
+    cv2.setNumThreads(budget.opencv_threads)
+    if budget.pin and hasattr(os, "sched_setaffinity"):
+        with counter.get_lock():
+            index = counter.value
+            counter.value += 1
+        try:
+            os.sched_setaffinity(0, budget.worker_cpus(index))
+        except OSError:
+            pass
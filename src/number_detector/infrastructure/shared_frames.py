@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import sys
+import threading
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import cv2
+import numpy as np
+
+_HEADER_SLOT_BYTES = 8  # one int64 lease generation per slot, at the start of the segment
+
+
+@dataclass(frozen=True)
+class FrameLease:
+    """Picklable handle to a decoded frame held in a :class:`FrameRing` slot."""
+
+    segment: str
+    slot: int
+    offset: int
+    shape: tuple[int, ...]
+    dtype: str
+    generation: int
+
+
+class StaleFrameError(RuntimeError):
+    """The slot behind a :class:`FrameLease` was released (and possibly reused) meanwhile."""
+
+
+class FrameRing:
+    """Fixed-size shared-memory slots for handing decoded pages to worker processes.
+
+    The owner decodes a page into a free slot with :meth:`lease` and passes the returned
+    :class:`FrameLease` to a worker, which maps it with :func:`attach_frame` without copying.
+    Each lease bumps the slot's generation, stored in the segment itself, so a worker holding
+    an outdated handle gets :class:`StaleFrameError` instead of another page's pixels.
+    The owner releases slots when the worker's future completes (successfully or not) and
+    unlinks the whole segment on :meth:`close`, so a crashed worker cannot leak a slot.
+    """
+
+    def __init__(self, slots: int, slot_bytes: int):
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self._shm: SharedMemory | None = None
+        self._free: list[int] = []
+        self._lock = threading.Lock()
+
+    def open(self) -> FrameRing:
+        if self._shm is None:
+            header = self.slots * _HEADER_SLOT_BYTES
+            self._shm = SharedMemory(create=True, size=header + self.slots * self.slot_bytes)
+            np.ndarray((self.slots,), np.int64, self._shm.buf)[:] = 0
+            self._free = list(range(self.slots))
+        return self
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+            self._free = []
+
+    def __enter__(self) -> FrameRing:
+        return self.open()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def free_slots(self) -> int:
+        return len(self._free)
+
+    def _generations(self) -> np.ndarray:
+        return np.ndarray((self.slots,), np.int64, self._shm.buf)
+
+    def lease(self, data: bytes) -> FrameLease | None:
+        """Decode image file bytes into a free slot.
+
+        Returns ``None`` (the caller falls back to passing ``data``) when no slot is free, the
+        decoded frame doesn't fit in a slot, or the bytes don't decode.
+        """
+        with self._lock:
+            if self._shm is None or not self._free:
+                return None
+            slot = self._free.pop()
+
+        frame = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR) if data else None
+        if frame is None or frame.nbytes > self.slot_bytes:
+            with self._lock:
+                self._free.append(slot)
+            return None
+
+        offset = self.slots * _HEADER_SLOT_BYTES + slot * self.slot_bytes
+        np.ndarray(frame.shape, frame.dtype, self._shm.buf, offset)[...] = frame
+        with self._lock:
+            generations = self._generations()
+            generations[slot] += 1
+            generation = int(generations[slot])
+        return FrameLease(self._shm.name, slot, offset, frame.shape, frame.dtype.str, generation)
+
+    def release(self, lease: FrameLease) -> None:
+        with self._lock:
+            if self._shm is None or lease.segment != self._shm.name:
+                return
+            generations = self._generations()
+            if generations[lease.slot] != lease.generation:
+                return  # already released
+            generations[lease.slot] += 1
+            self._free.append(lease.slot)
+
+
+_attached: dict[str, SharedMemory] = {}
+
+
+def _attach_segment(name: str) -> SharedMemory:
+    shm = _attached.get(name)
+    if shm is None:
+        if sys.version_info >= (3, 13):
+            shm = SharedMemory(name=name, track=False)
+        else:
+            # Before 3.13 attaching registers the segment with this process' resource tracker,
+            # which would unlink it (or warn) when the worker exits; only the owner may unlink.
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args, **kwargs: None
+            try:
+                shm = SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        _attached[name] = shm
+    return shm
+
+
+def attach_frame(lease: FrameLease) -> np.ndarray:
+    """Zero-copy view of a leased frame, valid until the owner releases the lease."""
+    shm = _attach_segment(lease.segment)
+    generation = np.ndarray((lease.slot + 1,), np.int64, shm.buf)[lease.slot]
+    if generation != lease.generation:
+        raise StaleFrameError(f"frame slot {lease.slot} was released")
+    return np.ndarray(lease.shape, np.dtype(lease.dtype), shm.buf, lease.offset)
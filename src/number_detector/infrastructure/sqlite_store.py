@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from number_detector.application.constants import BODY_TEXT, FREE_TEXT
+from number_detector.domain.models.bounding_box import BoundingBox
+from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.domain.models.detections import Detections
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    item TEXT NOT NULL,
+    name TEXT NOT NULL,
+    error TEXT,
+    UNIQUE (source, item)
+);
+CREATE TABLE IF NOT EXISTS parts (
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    part_number INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS motors (
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    code TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS texts (
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS regions (
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    class TEXT NOT NULL,
+    x INTEGER NOT NULL,
+    y INTEGER NOT NULL,
+    w INTEGER NOT NULL,
+    h INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    confidence REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_images_name ON images(name);
+CREATE INDEX IF NOT EXISTS idx_parts_number ON parts(part_number, image_id);
+CREATE INDEX IF NOT EXISTS idx_parts_image ON parts(image_id);
+CREATE INDEX IF NOT EXISTS idx_motors_code ON motors(code, image_id);
+CREATE INDEX IF NOT EXISTS idx_motors_image ON motors(image_id);
+CREATE INDEX IF NOT EXISTS idx_texts_image ON texts(image_id);
+CREATE INDEX IF NOT EXISTS idx_regions_image ON regions(image_id);
+"""
+
+
+PART_QUERY = (
+    "SELECT DISTINCT i.source, i.name FROM parts p JOIN images i ON i.id = p.image_id "
+    "WHERE p.part_number = ? ORDER BY i.source, i.name"
+)
+MOTOR_QUERY = (
+    "SELECT DISTINCT i.source, i.name FROM motors m JOIN images i ON i.id = m.image_id "
+    "WHERE m.code = ? ORDER BY i.source, i.name"
+)
+
+
+class SqliteResultsStore:
+    """Results database: one row per scanned image plus its parts, motors, texts and detections.
+
+    Results are buffered and inserted ``batch_size`` at a time in one transaction (WAL journal),
+    so it can be fed from the scan's result stream. Images are keyed by source and work item (its
+    path inside an archive, ``file#p<n>``...; two pages can share a ``name``); re-scanning an image
+    replaces its previous rows. The connection is opened lazily, on the thread that uses it.
+    """
+
+    def __init__(self, db_path: str | Path, batch_size: int = 500):
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self._conn: sqlite3.Connection | None = None
+        self._pending: list[tuple[str, str, DetectionResult]] = []
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def add(self, result: DetectionResult, source: str = "", item: str = "") -> None:
+        self._pending.append((source, item or result.image_name, result))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        with self.conn as conn:
+            for source, item, r in self._pending:
+                conn.execute("DELETE FROM images WHERE source = ? AND item = ?", (source, item))
+                image_id = conn.execute(
+                    "INSERT INTO images (source, item, name, error) VALUES (?, ?, ?, ?)",
+                    (source, item, r.image_name, r.error),
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO parts VALUES (?, ?)", [(image_id, n) for n in r.part_numbers]
+                )
+                conn.executemany(
+                    "INSERT INTO motors VALUES (?, ?)", [(image_id, c) for c in r.motor_codes]
+                )
+                conn.executemany(
+                    "INSERT INTO texts VALUES (?, ?, ?)",
+                    [(image_id, FREE_TEXT, t) for t in r.free_text] + [(image_id, BODY_TEXT, t) for t in r.body_text],
+                )
+                conn.executemany(
+                    "INSERT INTO regions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(image_id, *row) for row in r.detections.rows()],
+                )
+        self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self) -> SqliteResultsStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Queries -----------------------------------------------------------------
+
+    def images_with_part(self, part_number: int) -> list[tuple[str, str]]:
+        """(source, image name) of every image where ``part_number`` was read."""
+        self.flush()
+        return self.conn.execute(PART_QUERY, (part_number,)).fetchall()
+
+    def images_with_motor(self, code: str) -> list[tuple[str, str]]:
+        """(source, image name) of every image with motor code ``code``."""
+        self.flush()
+        return self.conn.execute(MOTOR_QUERY, (code,)).fetchall()
+
+    def image(self, name: str) -> list[DetectionResult]:
+        """Stored results for images called ``name`` (one per source)."""
+        self.flush()
+        found = []
+        for image_id, error in self.conn.execute("SELECT id, error FROM images WHERE name = ? ORDER BY source", (name,)):
+            q = self.conn.execute
+            texts = q("SELECT kind, text FROM texts WHERE image_id = ?", (image_id,)).fetchall()
+            detections = Detections()
+            for cls, x, y, w, h, text, confidence in q(
+                "SELECT class, x, y, w, h, text, confidence FROM regions WHERE image_id = ? ORDER BY rowid", (image_id,)
+            ):
+                detections.append(cls, BoundingBox(x, y, w, h), text, confidence)
+            found.append(DetectionResult(
+                image_name=name,
+                part_numbers=[n for (n,) in q("SELECT part_number FROM parts WHERE image_id = ?", (image_id,))],
+                motor_codes=[c for (c,) in q("SELECT code FROM motors WHERE image_id = ?", (image_id,))],
+                free_text=[t for kind, t in texts if kind == FREE_TEXT],
+                body_text=[t for kind, t in texts if kind == BODY_TEXT],
+                error=error,
+                detections=detections,
+            ))
+        return found
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Callable
+
+from number_detector.application.constants import BODY_TEXT, FREE_TEXT, MOTORS, PARTS
+from number_detector.application.evaluation import LabelledPage, PageScores, score_result
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.sweep import Candidate, SweepResult, order_for_reuse
+from number_detector.application.use_cases.scan_single_image_use_case import parse_region_text
+from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.infrastructure.preview import (
+    DILATE_FIELDS, FILTER_FIELDS, LINE_FIELDS, MASK_FIELDS, OCR_FIELDS, PreviewPipeline, RegionReaderFactory,
+)
+
+# Upstream stages first: candidates sorted on this order reuse the page's masks and component stats.
+STAGE_FIELD_ORDER = tuple(dict.fromkeys((
+    *(f for cls in MASK_FIELDS for f in MASK_FIELDS[cls]),
+    *LINE_FIELDS,
+    *(f for cls in DILATE_FIELDS for f in DILATE_FIELDS[cls]),
+    *(f for cls in FILTER_FIELDS for f in FILTER_FIELDS[cls]),
+    *(f for cls in OCR_FIELDS for f in OCR_FIELDS[cls]),
+)))
+
+# (candidate index, page scores, seconds, detected regions, new OCR reads)
+PageOutcome = tuple[int, PageScores, float, int, int]
+
+
+def _detection_result(name: str, settings: DetectionSettings, texts: dict[str, list[str]]) -> DetectionResult:
+    values = {cls: [] for cls in (PARTS, MOTORS, FREE_TEXT, BODY_TEXT)}
+    for cls, found in texts.items():
+        for txt in found:
+            values[cls].extend(parse_region_text(cls, txt, settings))
+    return DetectionResult(
+        image_name=name,
+        part_numbers=sorted(set(values[PARTS])),
+        motor_codes=sorted(set(values[MOTORS])),
+        free_text=sorted(set(values[FREE_TEXT])),
+        body_text=sorted(set(values[BODY_TEXT])),
+        error=None,
+    )
+
+
+def evaluate_page(
+    page: LabelledPage,
+    candidates: list[tuple[int, Candidate]],
+    base: DetectionSettings,
+    region_reader: RegionReaderFactory | None,
+    cache_size: int = 2,
+) -> list[PageOutcome]:
+    """Score every candidate on one page, sharing one memoized pipeline (and its OCR cache) between them."""
+    pipeline = PreviewPipeline(region_reader=region_reader, cache_size=cache_size)
+    if not pipeline.load(page.image):
+        raise FileNotFoundError(f"No se pudo leer la imagen: {page.image}")
+    out = []
+    for index, changes in candidates:
+        settings = replace(base, **changes)
+        reads = pipeline.ocr_reads
+        t0 = time.perf_counter()
+        preview = pipeline.run(settings, ocr=region_reader is not None)
+        result = _detection_result(page.image.stem, settings, preview.texts)
+        elapsed = time.perf_counter() - t0
+        regions = sum(len(boxes) for boxes in preview.boxes.values())
+        out.append((index, score_result(result, page), elapsed, regions, pipeline.ocr_reads - reads))
+    return out
+
+
+def _chunks(items: list, count: int) -> list[list]:
+    """``count`` contiguous slices (contiguous keeps neighbouring candidates, and their cache hits, together)."""
+    size = -(-len(items) // count)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def run_sweep(
+    pages: list[LabelledPage],
+    candidates: list[Candidate],
+    base: DetectionSettings | None = None,
+    region_reader: RegionReaderFactory | None = None,
+    workers: int = 1,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> list[SweepResult]:
+    """Score each candidate (settings changes on ``base``) over the labelled ``pages``.
+
+    Work is split by page (each worker decodes its page once and walks the candidates over a
+    memoized pipeline), and by slices of candidates when there are more workers than pages.
+    Without a ``region_reader`` only detection runs (every expected value counts as missed).
+    """
+    base = base or DetectionSettings()
+    indexed = [(i, candidates[i]) for i in order_for_reuse(candidates, STAGE_FIELD_ORDER)]
+    slices = _chunks(indexed, max(1, min(len(indexed), workers // max(1, len(pages))))) if indexed else []
+    jobs = [(page, part) for page in pages for part in slices]
+
+    results = [SweepResult(changes=c) for c in candidates]
+
+    def collect(outcomes: list[PageOutcome], done: int) -> None:
+        for index, scores, seconds, regions, reads in outcomes:
+            r = results[index]
+            r.scores.add(scores)
+            r.pages += 1
+            r.seconds += seconds
+            r.regions += regions
+            r.ocr_reads += reads
+        if on_progress:
+            on_progress(done, len(jobs))
+
+    if workers <= 1 or len(jobs) <= 1:
+        for done, (page, part) in enumerate(jobs, 1):
+            collect(evaluate_page(page, part, base, region_reader), done)
+        return results
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as ex:
+        futures = [ex.submit(evaluate_page, page, part, base, region_reader) for page, part in jobs]
+        for done, future in enumerate(futures, 1):
+            collect(future.result(), done)
+    return results
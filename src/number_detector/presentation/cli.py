@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import replace
+from multiprocessing import freeze_support
+from pathlib import Path
+
+from number_detector.application.concurrency import format_concurrency_report
+from number_detector.application.constants import DEFAULT_DB_FILENAME
+from number_detector.application.job_profiles import DEFAULT_JOB_PROFILE, JOB_PROFILES, apply_job_profile
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.evaluation import load_labelled_pages
+from number_detector.application.settings_profile import load_settings_profile, save_settings_profile
+from number_detector.application.stage_metrics import format_stage_metrics, merge_stage_metrics
+from number_detector.application.sweep import (
+    format_sweep_results, grid_candidates, parse_sweep_axis, random_candidates, rank_sweep_results,
+)
+from number_detector.infrastructure.bootstrap import create_process_folder_use_case, scan_region_reader
+from number_detector.infrastructure.runtime import check_tesseract_installed, default_output_dir, plan_cpu_budget
+from number_detector.infrastructure.sqlite_store import SqliteResultsStore
+from number_detector.infrastructure.sweep import run_sweep
+
+
+def _cmd_scan(args: argparse.Namespace) -> int:
+    try:
+        base = load_settings_profile(args.settings) if args.settings else DetectionSettings()
+    except (OSError, ValueError) as e:
+        print(f"No se pudo leer el perfil de ajustes: {e}", file=sys.stderr)
+        return 2
+    settings = apply_job_profile(base, args.profile)
+    if args.workers:
+        settings.workers = args.workers
+    settings.pin_workers = settings.pin_workers or args.pin
+    settings.dedupe_pages = settings.dedupe_pages or args.dedupe
+    settings.export_sqlite = args.sqlite
+    settings.export_detections = args.detections
+    if settings.run_ocr and not check_tesseract_installed():
+        print("Tesseract no está disponible (ajusta TESSERACT_CMD).", file=sys.stderr)
+        return 2
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    uc = create_process_folder_use_case(
+        settings=settings,
+        debug=args.debug,
+        debug_dir=str(output_dir / "_debug") if args.debug else None,
+    )
+
+    def on_progress(done: int, total: int, filename: str) -> None:
+        print(f"[{done}/{total}] {filename}", file=sys.stderr)
+
+    results, excel_path = uc.execute(
+        input_dir=args.input,
+        output_dir=output_dir,
+        on_progress=on_progress,
+        resume=args.resume,
+    )
+
+    for line in format_stage_metrics(merge_stage_metrics(results)):
+        print(line)
+    if uc.scan_uc.concurrency is not None:
+        for line in format_concurrency_report(uc.scan_uc.concurrency):
+            print(line)
+    print(f"{len(results)} imágenes · Excel: {excel_path}")
+    return 0
+
+
+def _cmd_query(args: argparse.Namespace) -> int:
+    db_path = Path(args.db)
+    if db_path.is_dir():
+        db_path = db_path / DEFAULT_DB_FILENAME
+    if not db_path.exists():
+        print(f"No existe la base de datos: {db_path}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    with SqliteResultsStore(db_path) as store:
+        if args.part is not None:
+            hits = store.images_with_part(args.part)
+        else:
+            hits = store.images_with_motor(args.motor)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for source, name in hits:
+        print(f"{name}\t{source}")
+    print(f"{len(hits)} imágenes ({elapsed_ms:.1f} ms)", file=sys.stderr)
+    return 0
+
+
+def _cmd_sweep(args: argparse.Namespace) -> int:
+    try:
+        base = load_settings_profile(args.settings) if args.settings else DetectionSettings()
+        axes = dict(parse_sweep_axis(spec, base) for spec in args.vary)
+        pages = load_labelled_pages(args.corpus)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"No se pudo preparar el barrido: {e}", file=sys.stderr)
+        return 2
+    if not check_tesseract_installed():
+        print("Tesseract no está disponible (ajusta TESSERACT_CMD).", file=sys.stderr)
+        return 2
+
+    candidates = random_candidates(axes, args.random, args.seed) if args.random else grid_candidates(axes)
+    print(f"{len(candidates)} combinaciones × {len(pages)} páginas", file=sys.stderr)
+
+    def on_progress(done: int, total: int) -> None:
+        print(f"[{done}/{total}]", file=sys.stderr)
+
+    start = time.perf_counter()
+    results = rank_sweep_results(run_sweep(
+        pages, candidates, base=base, region_reader=scan_region_reader,
+        workers=plan_cpu_budget(args.workers).workers, on_progress=on_progress,
+    ))
+    for line in format_sweep_results(results[:args.top]):
+        print(line)
+    print(f"{time.perf_counter() - start:.1f} s", file=sys.stderr)
+    if args.save_best and results:
+        path = save_settings_profile(replace(base, **results[0].changes), args.save_best)
+        print(f"Mejor combinación guardada en {path}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="number-detector-cli", description="Detector ETKA por línea de comandos")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="Escanea una carpeta (o un .zip/.tar) y exporta el Excel")
+    scan.add_argument("input", help="Carpeta o archivo .zip/.tar de entrada")
+    scan.add_argument("-o", "--output", default=str(default_output_dir()), help="Carpeta de salida")
+    scan.add_argument("--profile", choices=sorted(JOB_PROFILES), default=DEFAULT_JOB_PROFILE, help="Perfil de trabajo")
+    scan.add_argument(
+        "--settings",
+        help="Perfil de ajustes de detección (.json guardado desde la GUI o hsv_mask_tuner.py)",
+    )
+    scan.add_argument(
+        "--workers", type=int, default=0, help="Procesos en paralelo (0 = según el perfil o un proceso por núcleo)",
+    )
+    scan.add_argument("--pin", action="store_true", help="Fija cada proceso (y su Tesseract) a sus propios núcleos")
+    scan.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Escanea una sola vez las páginas repetidas (aunque cambie el nombre o la codificación) y copia su resultado",
+    )
+    scan.add_argument("--debug", action="store_true", help="Guarda las máscaras intermedias en <salida>/_debug")
+    scan.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continúa un escaneo interrumpido: omite las imágenes ya registradas en el diario de la carpeta de salida",
+    )
+    scan.add_argument("--detections", action="store_true", help="Añade al Excel una hoja con cada región detectada")
+    scan.add_argument("--sqlite", action="store_true", help=f"Guarda también los resultados en <salida>/{DEFAULT_DB_FILENAME}")
+    scan.set_defaults(func=_cmd_scan)
+
+    query = commands.add_parser("query", help="Busca en la base de datos de resultados")
+    query.add_argument("db", help=f"Archivo .sqlite o carpeta de salida que contiene {DEFAULT_DB_FILENAME}")
+    lookup = query.add_mutually_exclusive_group(required=True)
+    lookup.add_argument("--part", type=int, help="Imágenes que contienen este número de pieza")
+    lookup.add_argument("--motor", help="Imágenes con este código de motor")
+    query.set_defaults(func=_cmd_query)
+
+    sweep = commands.add_parser(
+        "sweep", help="Prueba combinaciones de ajustes sobre un corpus etiquetado (recall/precisión y coste por página)",
+    )
+    sweep.add_argument("corpus", help="JSON de páginas etiquetadas (ver benchmarks/ground_truth.json)")
+    sweep.add_argument(
+        "--vary", action="append", required=True, metavar="CAMPO=VALORES",
+        help="Valores a probar de un ajuste: s_min=120,150,180 o part_min_h=12:20:2 (núcleos como 9x5); repetible",
+    )
+    sweep.add_argument("--random", type=int, default=0, help="Prueba N combinaciones al azar en vez de la rejilla completa")
+    sweep.add_argument("--seed", type=int, help="Semilla de --random")
+    sweep.add_argument("--settings", help="Perfil de ajustes de partida (.json)")
+    sweep.add_argument("--workers", type=int, default=0, help="Procesos en paralelo (0 = uno por núcleo)")
+    sweep.add_argument("--top", type=int, default=20, help="Filas de la tabla")
+    sweep.add_argument("--save-best", help="Guarda la mejor combinación como perfil de ajustes (.json)")
+    sweep.set_defaults(func=_cmd_sweep)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    freeze_support()
+    sys.exit(main())
@@ -8,12 +8,25 @@ from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QGridLayout, QGroupBox,
     QLabel, QLineEdit, QPushButton, QFileDialog,
     QHBoxLayout, QProgressBar, QPlainTextEdit, QMessageBox,
-    QTableWidget, QTableWidgetItem, QHeaderView, QFrame
+    QTableView, QAbstractItemView, QHeaderView, QFrame, QComboBox
 )
 
-from number_detector.application.use_cases.list_images_use_case import ListImagesUseCase
+from number_detector.application.constants import (
+    BODY_TEXT,
+    DEFAULT_JOURNAL_FILENAME,
+    DEFAULT_OUTPUT_FILENAME,
+    FREE_TEXT,
+    MOTORS,
+    PARTS,
+)
+from number_detector.application.job_profiles import DEFAULT_JOB_PROFILE, JOB_PROFILES, apply_job_profile
+from number_detector.application.settings import DetectionSettings, settings_fingerprint
+from number_detector.infrastructure.journal import JsonlJournal
+
+from .preview_dialog import SettingsPreviewDialog
+from .results_model import ResultsTableModel
 from .widgets.folder_dnd_widget import FolderDropWidget
-from .worker import FolderScanWorker
+from .worker import FolderDiscoveryWorker, FolderScanWorker
 
 
 class DropDirLineEdit(QLineEdit):
@@ -46,6 +59,11 @@ class MainWindow(QMainWindow):
         self.resize(1100, 740)
 
         self.worker: FolderScanWorker | None = None
+        self.discovery: FolderDiscoveryWorker | None = None
+        self._discoveries: set[FolderDiscoveryWorker] = set()  # running, incl. cancelled ones
+        self._listed: tuple[Path, list] | None = None  # (folder, images) of the last discovery
+        self._start_when_listed = False
+        self.settings = DetectionSettings()  # edited in the settings dialog
         self.last_excel_path: Path | None = None
 
         root = QWidget()
@@ -77,6 +95,15 @@ class MainWindow(QMainWindow):
 
         self.in_drop.path_changed.connect(self._update_found_count)
 
+        self.cmb_profile = QComboBox()
+        for key, profile in JOB_PROFILES.items():
+            self.cmb_profile.addItem(profile.label, key)
+        self.cmb_profile.setCurrentIndex(self.cmb_profile.findData(DEFAULT_JOB_PROFILE))
+        self.cmb_profile.setMinimumHeight(42)
+        self.cmb_profile.setStyleSheet(
+            "QComboBox { background:#ffffff; color:#001b44; border:1px solid #cfd8ea; padding:0 12px; }"
+        )
+
         self.btn_run = QPushButton("PROCESAR IMÁGENES")
         self.btn_run.setMinimumHeight(42)
         self.btn_run.setStyleSheet(
@@ -101,6 +128,14 @@ class MainWindow(QMainWindow):
         )
         self.btn_open_excel.clicked.connect(self.open_excel)
 
+        self.btn_settings = QPushButton("Ajustes...")
+        self.btn_settings.setMinimumHeight(42)
+        self.btn_settings.setStyleSheet(
+            "QPushButton { background:#ffffff; color:#001b44; border:1px solid #cfd8ea; padding:0 18px; }"
+            "QPushButton:disabled { color:#9aa6bd; background:#f7f8fd; }"
+        )
+        self.btn_settings.clicked.connect(self.open_settings)
+
         self.btn_run.clicked.connect(self.start_processing)
         self.btn_cancel.clicked.connect(self.cancel_processing)
 
@@ -151,22 +186,32 @@ class MainWindow(QMainWindow):
             "QGroupBox::title { subcontrol-origin: margin; left: 12px; padding: 0 6px; }"
         )
 
-        self.table = QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels(["Imagen", "Números", "Motores", "Carrocería", "Free text", "Error"])
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar resultados (imagen, número, motor, texto...)")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setStyleSheet("margin:0 10px 6px 10px;")
+        res_layout.addWidget(self.filter_edit)
+
+        self.results_model = ResultsTableModel(["Imagen", "Números", "Motores", "Carrocería", "Free text", "Error"], self)
+        self.filter_edit.textChanged.connect(self.results_model.set_filter)
+        self.table = QTableView()
+        self.table.setModel(self.results_model)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)  # arrival order until clicked
+        self.table.setSortingEnabled(True)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.setAlternatingRowColors(True)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.table.verticalHeader().setVisible(False)
         self.table.setShowGrid(False)
         self.table.setStyleSheet(
-            "QTableWidget { border:none; background:#ffffff; alternate-background-color:#f1f5fb; color:#001b44; }"
+            "QTableView { border:none; background:#ffffff; alternate-background-color:#f1f5fb; color:#001b44; }"
             "QHeaderView::section { background:#eef2fc; color:#5b6578; border:none; border-bottom:1px solid #cfd8ea; padding:9px; font-weight:700; }"
-            "QTableWidget::item { border-bottom:1px solid #e5ebf5; padding:8px; }"
-            "QTableWidget::item:selected { background:#dbeafe; color:#001b44; }"
-            "QTableWidget::item:focus { outline:none; }"
+            "QTableView::item { border-bottom:1px solid #e5ebf5; padding:8px; }"
+            "QTableView::item:selected { background:#dbeafe; color:#001b44; }"
+            "QTableView::item:focus { outline:none; }"
         )
         res_layout.addWidget(self.table)
 
@@ -177,6 +222,8 @@ class MainWindow(QMainWindow):
         action_row = QHBoxLayout()
         action_row.setContentsMargins(0, 0, 0, 0)
         main.addLayout(action_row)
+        action_row.addWidget(self.cmb_profile)
+        action_row.addWidget(self.btn_settings)
         action_row.addStretch(1)
         action_row.addWidget(self.btn_run)
         action_row.addWidget(self.btn_cancel)
@@ -196,14 +243,52 @@ class MainWindow(QMainWindow):
 
     @Slot(object)
     def _update_found_count(self, *_):
+        """List the input folder in the background; the listing is reused by the scan."""
+        if self.discovery is not None:
+            self.discovery.request_cancel()
+            self.discovery = None
+        self._listed = None
+        self._start_when_listed = False
+
         p = self.in_drop.path()
         if not p:
             self.lbl_found.setText("0 imágenes encontradas")
             return
 
-        exts = {".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tif", ".tiff"}
-        count = sum(1 for f in p.iterdir() if f.is_file() and f.suffix.lower() in exts)
-        self.lbl_found.setText(f"{count} imágenes encontradas")
+        self.lbl_found.setText("Buscando imágenes...")
+        discovery = FolderDiscoveryWorker(p)
+        discovery.sig_count.connect(self._on_discovery_count)
+        discovery.sig_done.connect(self._on_discovery_done)
+        discovery.sig_error.connect(self._on_discovery_error)
+        discovery.finished.connect(lambda: self._discoveries.discard(discovery))
+        self._discoveries.add(discovery)
+        self.discovery = discovery
+        discovery.start()
+
+    @Slot(int)
+    def _on_discovery_count(self, count: int):
+        if self.sender() is self.discovery:
+            self.lbl_found.setText(f"Buscando imágenes... {count} encontradas")
+
+    @Slot(object, list)
+    def _on_discovery_done(self, folder: Path, images: list):
+        if self.sender() is not self.discovery:
+            return
+        self.discovery = None
+        self._listed = (folder, images)
+        self.lbl_found.setText(f"{len(images)} imágenes encontradas")
+        if self._start_when_listed:
+            self._start_when_listed = False
+            self.start_processing()
+
+    @Slot(str)
+    def _on_discovery_error(self, msg: str):
+        if self.sender() is not self.discovery:
+            return
+        self.discovery = None
+        self._start_when_listed = False
+        self.lbl_found.setText("No se pudo leer la carpeta de entrada")
+        self.append_log(f"❌ Error al listar la carpeta: {msg}")
 
     def append_log(self, text: str):
         self.log.appendPlainText(text)
@@ -215,33 +300,38 @@ class MainWindow(QMainWindow):
             return
         QDesktopServices.openUrl(QUrl.fromLocalFile(str(self.last_excel_path)))
 
+    # ---------- Settings ----------
+    @Slot()
+    def open_settings(self):
+        images = [p for p in (self._listed[1] if self._listed else []) if isinstance(p, Path)]
+        settings = apply_job_profile(self.settings, self.cmb_profile.currentData())
+        dialog = SettingsPreviewDialog(settings, images, self)
+        if dialog.exec():
+            self.settings = dialog.settings()
+            self.append_log("Ajustes de detección actualizados.")
+
     # ---------- Table ----------
-    @Slot(str, str, str, str, str, str)
-    def on_result(
-        self,
-        image_name: str,
-        parts_csv: str,
-        motors_csv: str,
-        body_text_csv: str,
-        free_text_csv: str,
-        error: str,
-    ):
-        # Append row as results arrive (completion order may differ from file order)
-        r = self.table.rowCount()
-        self.table.insertRow(r)
-        self.table.setItem(r, 0, QTableWidgetItem(image_name))
-        self.table.setItem(r, 1, QTableWidgetItem(parts_csv))
-        self.table.setItem(r, 2, QTableWidgetItem(motors_csv))
-        self.table.setItem(r, 3, QTableWidgetItem(body_text_csv))
-        self.table.setItem(r, 4, QTableWidgetItem(free_text_csv))
-        self.table.setItem(r, 5, QTableWidgetItem(error))
+    @Slot(list)
+    def on_results(self, rows: list):
+        # Append a batch of rows as results arrive (completion order may differ from file order)
+        self.results_model.append_rows(rows)
+
+    def _apply_profile_columns(self, profile_key: str):
+        """Hide table columns of disabled classes; detection-only profiles show region counts."""
+        profile = JOB_PROFILES[profile_key]
+        headers = ["Números", "Motores", "Carrocería", "Free text"]
+        if not profile.run_ocr:
+            headers = [f"{h} (regiones)" for h in headers]
+        self.results_model.set_headers(["Imagen", *headers, "Error"])
+        for col, region_class in enumerate((PARTS, MOTORS, BODY_TEXT, FREE_TEXT), start=1):
+            self.table.setColumnHidden(col, region_class not in profile.enabled_classes)
 
     # ---------- Processing ----------
     @Slot()
     def start_processing(self):
         self.last_excel_path = None
         self.btn_open_excel.setEnabled(False)
-        self.table.setRowCount(0)
+        self.results_model.clear()
 
         in_dir = self.in_drop.path()
         out_dir = self.out_drop.path()
@@ -253,13 +343,37 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Salida inválida", "Selecciona una carpeta de salida válida.")
             return
 
-        images = ListImagesUseCase().execute(in_dir).images
+        if self._listed is None or self._listed[0] != in_dir:
+            # Still listing the folder: start as soon as the listing arrives
+            if self.discovery is None:
+                self._update_found_count()
+            self._start_when_listed = True
+            self.lbl_progress_title.setText("Buscando imágenes...")
+            return
+        images = self._listed[1]
+        self._listed = None  # one listing per run: files may be added or removed before the next one
         if not images:
             QMessageBox.information(self, "Sin imágenes", "No se han encontrado imágenes en la carpeta de entrada.")
             return
 
+        profile_key = self.cmb_profile.currentData()
+        self._apply_profile_columns(profile_key)
+
+        resume = False
+        if self._has_interrupted_run(in_dir, out_dir, apply_job_profile(self.settings, profile_key)):
+            answer = QMessageBox.question(
+                self,
+                "Escaneo interrumpido",
+                "La carpeta de salida contiene un escaneo que no llegó a terminar.\n"
+                "¿Reanudarlo? (Las imágenes ya procesadas no se vuelven a escanear.)",
+                QMessageBox.Yes | QMessageBox.No,
+            )
+            resume = answer == QMessageBox.Yes
+
         self.btn_run.setEnabled(False)
         self.btn_cancel.setEnabled(True)
+        self.cmb_profile.setEnabled(False)
+        self.btn_settings.setEnabled(False)
 
         self.progress.setRange(0, len(images))
         self.progress.setValue(0)
@@ -268,15 +382,32 @@ class MainWindow(QMainWindow):
         self.lbl_progress.setText(f"Preparando {len(images)} imágenes...")
         self.append_log(f"Procesando {len(images)} imágenes. El Excel se exportará al terminar.")
 
-        self.worker = FolderScanWorker(input_dir=in_dir, output_dir=out_dir, debug=False)
+        self.worker = FolderScanWorker(
+            input_dir=in_dir,
+            output_dir=out_dir,
+            debug=False,
+            profile=profile_key,
+            resume=resume,
+            images=images,
+            settings=self.settings,
+        )
         self.worker.sig_started.connect(self.on_started)
         self.worker.sig_progress.connect(self.on_progress)
-        self.worker.sig_result.connect(self.on_result)
+        self.worker.sig_results.connect(self.on_results)
         self.worker.sig_log.connect(self.append_log)
         self.worker.sig_finished.connect(self.on_finished)
         self.worker.sig_error.connect(self.on_error)
         self.worker.start()
 
+    @staticmethod
+    def _has_interrupted_run(in_dir: Path, out_dir: Path, settings: DetectionSettings) -> bool:
+        """A journal of this folder and settings newer than the Excel means the last run stopped before exporting."""
+        journal = out_dir / DEFAULT_JOURNAL_FILENAME
+        excel = out_dir / DEFAULT_OUTPUT_FILENAME
+        if not JsonlJournal.can_resume(journal, in_dir, settings_fingerprint(settings)):
+            return False
+        return not excel.exists() or excel.stat().st_mtime < journal.stat().st_mtime
+
     @Slot()
     def cancel_processing(self):
         if self.worker:
@@ -317,7 +448,10 @@ class MainWindow(QMainWindow):
 
         self.btn_run.setEnabled(True)
         self.btn_cancel.setEnabled(False)
+        self.cmb_profile.setEnabled(True)
+        self.btn_settings.setEnabled(True)
         self.worker = None
+        self._update_found_count()  # list the folder again for the next run
 
     @Slot(str)
     def on_error(self, msg: str):
@@ -327,4 +461,7 @@ class MainWindow(QMainWindow):
         self.lbl_progress.setText("No se pudo completar el proceso")
         self.btn_run.setEnabled(True)
         self.btn_cancel.setEnabled(False)
+        self.cmb_profile.setEnabled(True)
+        self.btn_settings.setEnabled(True)
         self.worker = None
+        self._update_found_count()  # list the folder again for the next run
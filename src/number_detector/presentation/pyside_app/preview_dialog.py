@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from PySide6.QtCore import Qt, QThread, QTimer, Signal, Slot
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import (
+    QCheckBox, QComboBox, QDialog, QDialogButtonBox, QDoubleSpinBox, QFileDialog, QFormLayout,
+    QHBoxLayout, QLabel, QMessageBox, QPlainTextEdit, QPushButton, QScrollArea, QSpinBox, QTabWidget,
+    QVBoxLayout, QWidget,
+)
+
+from number_detector.application.constants import BODY_TEXT, FREE_TEXT, MOTORS, PARTS
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.settings_profile import load_settings_profile, save_settings_profile
+from number_detector.infrastructure.bootstrap import create_preview_pipeline
+from number_detector.infrastructure.preview import (
+    DILATE_FIELDS, FILTER_FIELDS, LINE_FIELDS, MASK_FIELDS, OCR_COMMON_FIELDS, OCR_FIELDS,
+    PreviewPipeline, PreviewResult, render_preview,
+)
+
+CLASS_LABELS = {PARTS: "Números", MOTORS: "Motores", FREE_TEXT: "Free text", BODY_TEXT: "Carrocería"}
+VIEWS = {"boxes": "Cajas", "mask": "Máscara", "dilated": "Máscara dilatada"}
+
+
+def _class_fields(region_class: str) -> list[str]:
+    """Settings shown on the tab of ``region_class`` (the OCR settings shared by all classes have their own)."""
+    names = [*MASK_FIELDS[region_class], *(LINE_FIELDS if region_class == PARTS else ()),
+             *DILATE_FIELDS[region_class], *FILTER_FIELDS[region_class], *OCR_FIELDS[region_class]]
+    return [name for name in dict.fromkeys(names) if name not in OCR_COMMON_FIELDS]
+
+
+class PreviewWorker(QThread):
+    """Runs the preview pipeline once (off the UI thread) for the given settings."""
+
+    sig_done = Signal(object, object, float)  # PreviewResult, rendered BGR image, milliseconds
+    sig_error = Signal(str)
+
+    def __init__(self, pipeline: PreviewPipeline, settings: DetectionSettings, view: str, mask_class: str, ocr: bool):
+        super().__init__()
+        self.pipeline = pipeline
+        self.settings = settings
+        self.view = view
+        self.mask_class = mask_class
+        self.ocr = ocr
+
+    def run(self) -> None:
+        try:
+            t0 = time.perf_counter()
+            result = self.pipeline.run(self.settings, ocr=self.ocr)
+            mask = None
+            if self.view != "boxes":
+                mask = self.pipeline.mask(self.settings, self.mask_class, dilated=self.view == "dilated")
+            image = render_preview(self.pipeline.page, result, mask)
+            self.sig_done.emit(result, image, (time.perf_counter() - t0) * 1000)
+        except Exception as e:
+            self.sig_error.emit(f"{type(e).__name__}: {e}")
+
+
+class SettingsPreviewDialog(QDialog):
+    """Edit the detection settings while previewing masks, boxes and OCR text on one page.
+
+    Only the stages affected by a change are recomputed (see ``PreviewPipeline``); the page is
+    re-rendered shortly after the last edit.
+    """
+
+    def __init__(self, settings: DetectionSettings, images: list[Path], parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Ajustes de detección")
+        self.resize(1200, 780)
+        self._settings = settings
+        self._defaults = settings
+        self._pipeline = create_preview_pipeline()
+        self._worker: PreviewWorker | None = None
+        self._pending = False
+        self._editors: dict[str, object] = {}
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(120)
+        self._debounce.timeout.connect(self._refresh)
+
+        main = QVBoxLayout(self)
+
+        # ---- Página ----
+        top = QHBoxLayout()
+        main.addLayout(top)
+        self.cmb_image = QComboBox()
+        for p in images:
+            self.cmb_image.addItem(p.name, p)
+        self.cmb_image.currentIndexChanged.connect(lambda _: self._load(self.cmb_image.currentData()))
+        btn_open = QPushButton("Abrir imagen...")
+        btn_open.clicked.connect(self._pick_image)
+        self.cmb_view = QComboBox()
+        for key, label in VIEWS.items():
+            self.cmb_view.addItem(label, key)
+        self.cmb_mask_class = QComboBox()
+        for key, label in CLASS_LABELS.items():
+            self.cmb_mask_class.addItem(label, key)
+        self.chk_ocr = QCheckBox("Leer texto (OCR)")
+        for signal in (self.cmb_view.currentIndexChanged, self.cmb_mask_class.currentIndexChanged,
+                       self.chk_ocr.toggled):
+            signal.connect(self._schedule)
+        top.addWidget(self.cmb_image, 1)
+        top.addWidget(btn_open)
+        top.addWidget(self.cmb_view)
+        top.addWidget(self.cmb_mask_class)
+        top.addWidget(self.chk_ocr)
+
+        body = QHBoxLayout()
+        main.addLayout(body, 1)
+
+        self.lbl_image = QLabel("Selecciona una imagen")
+        self.lbl_image.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(self.lbl_image)
+        body.addWidget(scroll, 3)
+
+        side = QVBoxLayout()
+        body.addLayout(side, 2)
+
+        # ---- Ajustes por clase ----
+        tabs = QTabWidget()
+        side.addWidget(tabs, 1)
+        tab_fields = {label: _class_fields(c) for c, label in CLASS_LABELS.items()}
+        tab_fields["OCR"] = list(OCR_COMMON_FIELDS)
+        for label, names in tab_fields.items():
+            page = QWidget()
+            form = QFormLayout(page)
+            for name in names:
+                self._editors[name] = self._editor(name)
+                form.addRow(name, self._editors[name])
+            area = QScrollArea()
+            area.setWidgetResizable(True)
+            area.setWidget(page)
+            tabs.addTab(area, label)
+
+        self.txt_ocr = QPlainTextEdit()
+        self.txt_ocr.setReadOnly(True)
+        self.txt_ocr.setPlaceholderText("Texto leído (activa «Leer texto»)")
+        side.addWidget(self.txt_ocr)
+
+        self.lbl_status = QLabel("")
+        self.lbl_status.setStyleSheet("color:#4d5f7a; font-size:12px;")
+        self.lbl_status.setWordWrap(True)
+        side.addWidget(self.lbl_status)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel | QDialogButtonBox.Reset)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        buttons.button(QDialogButtonBox.Reset).clicked.connect(self._reset)
+        btn_load = buttons.addButton("Cargar perfil...", QDialogButtonBox.ActionRole)
+        btn_load.clicked.connect(self._load_profile)
+        btn_save = buttons.addButton("Guardar perfil...", QDialogButtonBox.ActionRole)
+        btn_save.clicked.connect(self._save_profile)
+        main.addWidget(buttons)
+
+        if images:
+            self._load(images[0])
+
+    # ---- Settings editors ----
+    def _editor(self, name: str) -> QWidget:
+        value = getattr(self._settings, name)
+        if isinstance(value, bool):
+            editor = QCheckBox()
+            editor.setChecked(value)
+            editor.toggled.connect(lambda v, n=name: self._set(n, v))
+        elif isinstance(value, int):
+            editor = QSpinBox()
+            editor.setRange(0, 1_000_000)
+            editor.setValue(value)
+            editor.valueChanged.connect(lambda v, n=name: self._set(n, v))
+        elif isinstance(value, float):
+            editor = QDoubleSpinBox()
+            editor.setRange(0.0, 1000.0)
+            editor.setDecimals(2)
+            editor.setSingleStep(0.01 if value <= 1.0 else 0.5)
+            editor.setValue(value)
+            editor.valueChanged.connect(lambda v, n=name: self._set(n, v))
+        else:  # (width, height) kernels
+            editor = QWidget()
+            row = QHBoxLayout(editor)
+            row.setContentsMargins(0, 0, 0, 0)
+            spins = []
+            for v in value:
+                spin = QSpinBox()
+                spin.setRange(1, 99)
+                spin.setValue(v)
+                row.addWidget(spin)
+                spins.append(spin)
+            for spin in spins:
+                spin.valueChanged.connect(lambda _, n=name, s=spins: self._set(n, tuple(x.value() for x in s)))
+            editor.spins = spins
+        return editor
+
+    def _set(self, name: str, value) -> None:
+        self._settings = replace(self._settings, **{name: value})
+        self._schedule()
+
+    @Slot()
+    def _reset(self) -> None:
+        self._show_settings(self._defaults)
+
+    def _show_settings(self, settings: DetectionSettings) -> None:
+        for name, editor in self._editors.items():
+            value = getattr(settings, name)
+            editor.blockSignals(True)
+            if isinstance(editor, QCheckBox):
+                editor.setChecked(value)
+            elif isinstance(editor, (QSpinBox, QDoubleSpinBox)):
+                editor.setValue(value)
+            else:
+                for spin, v in zip(editor.spins, value):
+                    spin.blockSignals(True)
+                    spin.setValue(v)
+                    spin.blockSignals(False)
+            editor.blockSignals(False)
+        self._settings = settings
+        self._schedule()
+
+    @Slot()
+    def _load_profile(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(self, "Cargar perfil de ajustes", "", "Perfil de ajustes (*.json)")
+        if not path:
+            return
+        try:
+            loaded = load_settings_profile(path, base=self._settings)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Perfil no válido", f"No se pudo leer el perfil:\n{e}")
+            return
+        # the job profile chosen in the main window still decides the classes and OCR
+        self._show_settings(replace(
+            loaded, enabled_classes=self._settings.enabled_classes, run_ocr=self._settings.run_ocr
+        ))
+
+    @Slot()
+    def _save_profile(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Guardar perfil de ajustes", "ajustes.json", "Perfil de ajustes (*.json)"
+        )
+        if path:
+            save_settings_profile(self._settings, path)
+            self.lbl_status.setText(f"Perfil guardado en {path}")
+
+    def settings(self) -> DetectionSettings:
+        return self._settings
+
+    # ---- Preview ----
+    @Slot()
+    def _pick_image(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Selecciona una imagen", "", "Imágenes (*.png *.jpg *.jpeg *.bmp *.tif *.tiff *.webp)"
+        )
+        if path:
+            self.cmb_image.addItem(Path(path).name, Path(path))
+            self.cmb_image.setCurrentIndex(self.cmb_image.count() - 1)
+
+    def _load(self, path: Path | None) -> None:
+        if path is None:
+            return
+        if self._worker is not None:
+            self._worker.wait()  # the pipeline is not shared between threads
+        if not self._pipeline.load(path):
+            self.lbl_status.setText(f"No se pudo abrir {path.name}")
+            return
+        self._schedule()
+
+    @Slot()
+    def _schedule(self, *_) -> None:
+        self._debounce.start()
+
+    @Slot()
+    def _refresh(self) -> None:
+        if self._pipeline.page is None:
+            return
+        if self._worker is not None:
+            self._pending = True  # run again with the latest settings once this one finishes
+            return
+        self._worker = PreviewWorker(
+            self._pipeline,
+            self._settings,
+            self.cmb_view.currentData(),
+            self.cmb_mask_class.currentData(),
+            self.chk_ocr.isChecked(),
+        )
+        self._worker.sig_done.connect(self._on_preview)
+        self._worker.sig_error.connect(lambda msg: self.lbl_status.setText(f"❌ {msg}"))
+        self._worker.finished.connect(self._on_worker_finished)
+        self.lbl_status.setText("Calculando...")
+        self._worker.start()
+
+    @Slot()
+    def _on_worker_finished(self) -> None:
+        self._worker = None
+        if self._pending:
+            self._pending = False
+            self._refresh()
+
+    @Slot(object, object, float)
+    def _on_preview(self, result: PreviewResult, image, ms: float) -> None:
+        h, w = image.shape[:2]
+        qimage = QImage(image.data, w, h, image.strides[0], QImage.Format.Format_BGR888).copy()
+        pixmap = QPixmap.fromImage(qimage)
+        width = max(200, self.lbl_image.parentWidget().width() - 4)
+        self.lbl_image.setPixmap(pixmap.scaledToWidth(min(width, w), Qt.TransformationMode.SmoothTransformation))
+
+        counts = " · ".join(f"{CLASS_LABELS[c]}: {len(b)}" for c, b in result.boxes.items())
+        stages = ", ".join(result.recomputed) or "nada (caché)"
+        self.lbl_status.setText(f"{counts}\nRecalculado: {stages} · {ms:.0f} ms")
+        self.txt_ocr.setPlainText("\n".join(
+            f"[{CLASS_LABELS[c]}] {text}" for c, texts in result.texts.items() for text in texts if text
+        ))
+
+    def done(self, result: int) -> None:
+        if self._worker is not None:
+            self._worker.wait()
+        super().done(result)
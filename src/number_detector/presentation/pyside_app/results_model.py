@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class ResultsTableModel(QAbstractTableModel):
+    """Scan results for the results table, stored column-wise as plain strings.
+
+    Rows arrive in batches (:meth:`append_rows`), each batch costing one insert notification.
+    Sorting and the text filter are kept as a list of row numbers into the columns, so the view
+    never holds per-cell item objects.
+    """
+
+    def __init__(self, headers: list[str], parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._columns: list[list[str]] = [[] for _ in headers]
+        self._rows: list[int] = []  # visible rows (filtered, sorted) as indexes into the columns
+        self._sort: tuple[int, Qt.SortOrder] | None = None
+        self._filter = ""
+
+    # ---- Qt model API ----
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole) and index.isValid():
+            return self._columns[index.column()][self._rows[index.row()]]
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return None
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """Sort by ``column``; a negative column restores arrival order."""
+        self._sort = (column, order) if column >= 0 else None
+        self._relayout(self._arranged(sorted(self._rows)))
+
+    # ---- Results API ----
+    def set_headers(self, headers: list[str]) -> None:
+        self._headers = list(headers)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(headers) - 1)
+
+    def set_filter(self, text: str) -> None:
+        """Show only rows where some cell contains ``text`` (case-insensitive)."""
+        self.beginResetModel()
+        self._filter = text.strip().lower()
+        self._rows = self._arranged(range(self.total_rows()))
+        self.endResetModel()
+
+    def total_rows(self) -> int:
+        return len(self._columns[0])
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._columns = [[] for _ in self._headers]
+        self._rows = []
+        self.endResetModel()
+
+    def append_rows(self, rows: list[tuple[str, ...]]) -> None:
+        start = self.total_rows()
+        for column, values in zip(self._columns, zip(*rows)):
+            column.extend(values)
+        new_rows = [i for i in range(start, self.total_rows()) if self._matches(i)]
+        if not new_rows:
+            return
+        if self._sort is None:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            self._rows.extend(new_rows)
+            self.endInsertRows()
+        else:
+            self._relayout(self._arranged(self._rows + new_rows))
+
+    # ---- helpers ----
+    def _relayout(self, rows: list[int]) -> None:
+        """Switch to a new row order, keeping the view's selection on the same results."""
+        self.layoutAboutToBeChanged.emit()
+        old = self.persistentIndexList()
+        sources = [self._rows[idx.row()] for idx in old]
+        self._rows = rows
+        position = {source: i for i, source in enumerate(rows)}
+        new = [
+            self.index(position[source], idx.column()) if source in position else QModelIndex()
+            for source, idx in zip(sources, old)
+        ]
+        self.changePersistentIndexList(old, new)
+        self.layoutChanged.emit()
+
+    def _matches(self, row: int) -> bool:
+        return not self._filter or any(self._filter in column[row].lower() for column in self._columns)
+
+    def _arranged(self, rows) -> list[int]:
+        rows = [i for i in rows if self._matches(i)]
+        if self._sort is not None:
+            column, order = self._sort
+            values = self._columns[column]
+            rows.sort(key=values.__getitem__, reverse=order == Qt.SortOrder.DescendingOrder)
+        return rows
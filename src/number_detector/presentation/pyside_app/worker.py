@@ -1,28 +1,93 @@
 from __future__ import annotations
 
+import time
 from pathlib import Path
 
 from PySide6.QtCore import QThread, Signal
 
+from number_detector.application.concurrency import format_concurrency_report
+from number_detector.application.constants import BODY_TEXT, FREE_TEXT, MOTORS, PARTS
+from number_detector.application.job_profiles import DEFAULT_JOB_PROFILE, apply_job_profile
 from number_detector.application.settings import DetectionSettings
-from number_detector.application.use_cases.list_images_use_case import ListImagesUseCase
+from number_detector.application.stage_metrics import format_stage_metrics, merge_stage_metrics
 from number_detector.domain.models.detection_result import DetectionResult
-from number_detector.infrastructure.bootstrap import create_process_folder_use_case
+from number_detector.domain.models.list_images_result import ImageItem
+from number_detector.infrastructure.bootstrap import create_list_images_use_case, create_process_folder_use_case
+
+
+class FolderDiscoveryWorker(QThread):
+    """Lists an input folder (or archive) off the UI thread.
+
+    ``sig_count`` reports the images found so far at most every ``report_interval`` seconds;
+    ``sig_done`` delivers the final listing, ready to hand to :class:`FolderScanWorker`. A
+    cancelled discovery emits nothing more.
+    """
+
+    sig_count = Signal(int)
+    sig_done = Signal(object, list)  # folder, images
+    sig_error = Signal(str)
+
+    def __init__(self, input_dir: Path, report_interval: float = 0.1):
+        super().__init__()
+        self.input_dir = input_dir
+        self.report_interval = report_interval
+        self._cancel = False
+
+    def request_cancel(self) -> None:
+        self._cancel = True
+
+    def run(self) -> None:
+        try:
+            uc = create_list_images_use_case()
+            found: list[ImageItem] = []
+            last_report = time.monotonic()
+            for item in uc.iter_found(self.input_dir):
+                if self._cancel:
+                    return
+                found.append(item)
+                if time.monotonic() - last_report >= self.report_interval:
+                    self.sig_count.emit(len(found))
+                    last_report = time.monotonic()
+            images = uc.arrange(found).images
+            if not self._cancel:
+                self.sig_done.emit(self.input_dir, images)
+        except Exception as e:
+            if not self._cancel:
+                self.sig_error.emit(f"{type(e).__name__}: {e}")
 
 
 class FolderScanWorker(QThread):
     sig_started = Signal(int)  # total
     sig_progress = Signal(int, int, str)  # done, total, filename
-    sig_result = Signal(str, str, str, str, str, str)
+    sig_results = Signal(list)  # batch of (image, parts, motors, body, free text, error) rows
     sig_log = Signal(str)
     sig_finished = Signal(str)  # excel path
     sig_error = Signal(str)
 
-    def __init__(self, input_dir: Path, output_dir: Path, debug: bool = False):
+    def __init__(
+        self,
+        input_dir: Path,
+        output_dir: Path,
+        debug: bool = False,
+        profile: str = DEFAULT_JOB_PROFILE,
+        resume: bool = False,
+        images: list[ImageItem] | None = None,
+        settings: DetectionSettings | None = None,
+        batch_size: int = 200,
+        batch_interval: float = 0.25,
+    ):
         super().__init__()
         self.input_dir = input_dir
         self.output_dir = output_dir
         self.debug = debug
+        self.profile = profile
+        self.settings = settings  # tuned in the settings dialog; None = defaults
+        self.resume = resume
+        self.images = images  # listing from FolderDiscoveryWorker; None lists input_dir here
+        # Results and progress reach the GUI thread in batches: at most one signal per
+        # ``batch_size`` results or ``batch_interval`` seconds, instead of one per image.
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
         self._cancel = False
 
     def request_cancel(self) -> None:
@@ -30,7 +95,7 @@ class FolderScanWorker(QThread):
 
     def run(self) -> None:
         try:
-            settings = DetectionSettings()
+            settings = apply_job_profile(self.settings or DetectionSettings(), self.profile)
 
             uc = create_process_folder_use_case(
                 settings=settings,
@@ -38,35 +103,64 @@ class FolderScanWorker(QThread):
                 debug_dir=str(self.output_dir / "_debug") if self.debug else None,
             )
 
-            # Pre-count images quickly (non-recursive)
+            images = self.images
+            if images is None:
+                images = create_list_images_use_case().execute(self.input_dir).images
+            self.sig_started.emit(len(images))
 
-            images = ListImagesUseCase().execute(self.input_dir).images
-            total = len(images)
-            self.sig_started.emit(total)
+            rows: list[tuple[str, ...]] = []
+            last_progress: tuple[int, int, str] | None = None
+            last_flush = time.monotonic()
+
+            def flush() -> None:
+                nonlocal last_flush
+                if rows:
+                    self.sig_results.emit(rows.copy())
+                    rows.clear()
+                if last_progress is not None:
+                    self.sig_progress.emit(*last_progress)
+                last_flush = time.monotonic()
 
             def on_progress(done: int, total_: int, filename: str) -> None:
+                nonlocal last_progress
+                last_progress = (done, total_, filename)
                 if self._cancel:
+                    flush()
                     raise RuntimeError("CANCELLED")
-                self.sig_progress.emit(done, total_, filename)
+                if len(rows) >= self.batch_size or time.monotonic() - last_flush >= self.batch_interval:
+                    flush()
 
             def on_log(msg: str):
                 self.sig_log.emit(msg)
 
             def on_result(res: DetectionResult, done: int, total_: int, filename: str) -> None:
-                # Update UI table incrementally
-                parts_csv = ",".join(str(x) for x in res.part_numbers)
-                motors_csv = ",".join(res.motor_codes)
-                body_text_csv = " | ".join(res.body_text)
-                free_text_csv = " | ".join(res.free_text)
-                err = res.error or ""
-                self.sig_result.emit(res.image_name, parts_csv, motors_csv, body_text_csv, free_text_csv, err)
-
-            _results, excel_path = uc.execute(
+                # Queue the table row; flushed to the UI in batches
+                if not settings.run_ocr:
+                    counts = [str(res.detections.count(c)) for c in (PARTS, MOTORS, BODY_TEXT, FREE_TEXT)]
+                    rows.append((res.image_name, *counts, res.error or ""))
+                else:
+                    parts_csv = ",".join(str(x) for x in res.part_numbers)
+                    motors_csv = ",".join(res.motor_codes)
+                    body_text_csv = " | ".join(res.body_text)
+                    free_text_csv = " | ".join(res.free_text)
+                    err = res.error or ""
+                    rows.append((res.image_name, parts_csv, motors_csv, body_text_csv, free_text_csv, err))
+
+            results, excel_path = uc.execute(
                 input_dir=self.input_dir,
                 output_dir=self.output_dir,
                 on_progress=on_progress,
                 on_result=on_result,
+                resume=self.resume,
+                images=images,
             )
+            flush()
+
+            for line in format_stage_metrics(merge_stage_metrics(results)):
+                self.sig_log.emit(line)
+            if uc.scan_uc.concurrency is not None:
+                for line in format_concurrency_report(uc.scan_uc.concurrency):
+                    self.sig_log.emit(line)
 
             self.sig_finished.emit(str(excel_path))
 
@@ -0,0 +1,26 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from number_detector.application.job_profiles import apply_job_profile
+from number_detector.application.settings import DetectionSettings
+from number_detector.infrastructure.bootstrap import create_process_folder_use_case
+
+FIXTURES = sorted(Path("tests/fixtures").glob("test*.jpg"))
+
+
+@pytest.mark.parametrize("prefetch_threads", [4, 0])
+@pytest.mark.parametrize("folder", ["catalog/", ""])
+def test_zip_scan_matches_folder_scan(temp_folders, prefetch_threads: int, folder: str) -> None:
+    archive = temp_folders["base"] / "catalog.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for path in FIXTURES:
+            zf.write(path, arcname=f"{folder}{path.name}")
+    settings = apply_job_profile(DetectionSettings(workers=2, prefetch_threads=prefetch_threads), "detect-only")
+
+    folder, _ = create_process_folder_use_case(settings).execute("tests/fixtures", temp_folders["dest"])
+    zipped, _ = create_process_folder_use_case(settings).execute(archive, temp_folders["dest"])
+
+    assert [r.image_name for r in zipped] == [p.stem for p in FIXTURES]
+    assert [(r.error, r.region_counts) for r in zipped] == [(r.error, r.region_counts) for r in folder]
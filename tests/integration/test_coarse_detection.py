@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import cv2
+
+from number_detector.application.settings import DetectionSettings, scale_pixel_settings
+from number_detector.infrastructure.imaging import CoarsePage, OpenCVImageReader, OpenCVRedDetector
+
+FIXTURES = sorted(Path("tests/fixtures").glob("test*.jpg"))
+
+
+def _overlaps(a, b) -> bool:
+    return a.x < b.x + b.w and b.x < a.x + a.w and a.y < b.y + b.h and b.y < a.y + a.h
+
+
+def test_scale_pixel_settings_scales_lengths_areas_and_dilation_reach() -> None:
+    scaled = scale_pixel_settings(DetectionSettings(), 2)
+
+    assert scaled.part_min_h == 9
+    assert scaled.motor_min_area == 62
+    assert scaled.motor_dilate_kernel == (5, 3)
+    assert scaled.s_min == DetectionSettings().s_min
+
+
+def test_coarse_detection_keeps_part_boxes_in_full_image_coordinates() -> None:
+    detector = OpenCVRedDetector(DetectionSettings())
+    reader = OpenCVImageReader(coarse_factor=2)
+
+    matched = total = 0
+    for path in FIXTURES:
+        full = cv2.imread(str(path))
+        page = reader.read(path)
+        coarse = detector.find_part_regions(page)
+        expected = detector.find_part_regions(full)
+
+        assert isinstance(page, CoarsePage)
+        for region in coarse:
+            assert region.bbox.x + region.bbox.w <= full.shape[1]
+            assert region.bbox.y + region.bbox.h <= full.shape[0]
+            assert region.image.shape[0] >= region.bbox.h
+        matched += sum(1 for e in expected if any(_overlaps(e.bbox, c.bbox) for c in coarse))
+        total += len(expected)
+
+    assert matched / total >= 0.95
+
+
+def test_image_reader_decodes_prefetched_bytes_like_the_file() -> None:
+    path = FIXTURES[0]
+    data = path.read_bytes()
+
+    assert (OpenCVImageReader().read(data) == cv2.imread(str(path))).all()
+    page = OpenCVImageReader(coarse_factor=2).read(data)
+    assert (page.full() == cv2.imread(str(path))).all()
+    assert OpenCVImageReader().read(b"") is None
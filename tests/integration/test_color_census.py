@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import cv2
+import pytest
+
+from number_detector.application.settings import DetectionSettings
+from number_detector.infrastructure.imaging import OpenCVRedDetector
+
+
+@pytest.mark.parametrize("fixture", ["test1.jpg", "test2.jpg", "test3.jpg", "test4.jpg"])
+def test_color_census_keeps_every_class_with_regions(fixture: str) -> None:
+    detector = OpenCVRedDetector(DetectionSettings())
+    image = cv2.imread(str(Path("tests/fixtures") / fixture))
+
+    present = detector.present_classes(image)
+    found = {
+        "parts": detector.find_part_regions(image),
+        "motors": detector.find_motor_regions(image),
+        "free_text": detector.find_free_text_regions(image),
+        "body_text": detector.find_body_text_regions(image),
+    }
+
+    assert {region_class for region_class, regions in found.items() if regions} <= present
+
+
+def test_color_census_skips_pink_on_pages_without_body_text() -> None:
+    detector = OpenCVRedDetector(DetectionSettings())
+
+    assert "body_text" not in detector.present_classes(cv2.imread("tests/fixtures/test3.jpg"))
@@ -0,0 +1,63 @@
+import shutil
+from pathlib import Path
+
+import cv2
+
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.use_cases.scan_batch_images_use_case import ScanImagesBatchUseCase
+from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.infrastructure.imaging import OpenCVImageReader
+
+FIXTURES = Path("tests/fixtures")
+
+
+def _scan(image_path: str, settings: dict, debug: bool, debug_dir, data, name) -> DetectionResult:
+    return DetectionResult(image_name=name, part_numbers=[7571], motor_codes=[], metrics={"scanned": 1})
+
+
+def test_reencoded_copies_are_scanned_once_but_pages_with_other_numbers_are_not_merged(tmp_path) -> None:
+    page = cv2.imread(str(FIXTURES / "test1.jpg"))
+    shutil.copy(FIXTURES / "test1.jpg", tmp_path / "a.jpg")
+    shutil.copy(FIXTURES / "test1.jpg", tmp_path / "b_renamed.jpg")
+    cv2.imwrite(str(tmp_path / "c_quality.jpg"), page, [cv2.IMWRITE_JPEG_QUALITY, 40])
+    cv2.imwrite(str(tmp_path / "d_lossless.png"), page)
+    # Same drawing with other callouts (the pHash alone would merge it), and one extra digit
+    shutil.copy(FIXTURES / "test2.jpg", tmp_path / "e_callouts.jpg")
+    cv2.putText(page, "7", (900, 500), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 220), 1)
+    cv2.imwrite(str(tmp_path / "f_digit.jpg"), page, [cv2.IMWRITE_JPEG_QUALITY, 75])
+    shutil.copy(FIXTURES / "test3.jpg", tmp_path / "g_other.jpg")
+
+    class CountingHasher(OpenCVImageReader):
+        thumbnails = 0
+
+        def page_thumbnail(self, item, data=None):
+            CountingHasher.thumbnails += 1
+            return super().page_thumbnail(item, data)
+
+    seen = []
+    uc = ScanImagesBatchUseCase(
+        settings=DetectionSettings(workers=1, dedupe_pages=True), scan_one=_scan, page_hasher=CountingHasher(),
+    )
+    results = {r.image_name: r for r in uc.execute(tmp_path, on_result=lambda r, done, total, key: seen.append(done))}
+
+    assert seen == list(range(1, 8))
+    assert [name for name, r in results.items() if r.metrics.get("scanned")] == [
+        "a", "e_callouts", "f_digit", "g_other",
+    ]
+    for name in ("b_renamed", "c_quality", "d_lossless"):
+        assert results[name].duplicate_of == "a"
+        assert results[name].part_numbers == [7571] and results[name].metrics == {"dedupe.skipped": 1}
+    assert all(results[name].duplicate_of is None for name in ("a", "e_callouts", "f_digit", "g_other"))
+    # each page is decoded at most once for the pixel check, however many pages it is compared with
+    assert CountingHasher.thumbnails <= 7
+    # copies don't share mutable state with the scanned page
+    results["b_renamed"].part_numbers.append(1)
+    assert results["a"].part_numbers == [7571] and results["c_quality"].part_numbers == [7571]
+    assert results["b_renamed"].detections is not results["a"].detections
+
+
+def test_dedupe_is_off_by_default(tmp_path) -> None:
+    for name in ("a", "b"):
+        shutil.copy(FIXTURES / "test1.jpg", tmp_path / f"{name}.jpg")
+    uc = ScanImagesBatchUseCase(settings=DetectionSettings(workers=1), scan_one=_scan, page_hasher=OpenCVImageReader())
+    assert all(r.metrics.get("scanned") for r in uc.execute(tmp_path))
@@ -0,0 +1,68 @@
+import shutil
+import struct
+import time
+import zlib
+from pathlib import Path
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.use_cases.scan_batch_images_use_case import ScanImagesBatchUseCase
+from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.infrastructure.imaging import OpenCVImageReader
+
+FIXTURE = Path("tests/fixtures/test1.jpg")
+
+
+def _timed_scan(image_path: str, settings: dict, debug: bool, debug_dir, data, name) -> DetectionResult:
+    start = time.time_ns()
+    time.sleep(0.3)
+    return DetectionResult(
+        image_name=name, part_numbers=[], motor_codes=[],
+        metrics={"start": start, "end": time.time_ns(), "tile_pixels": settings["tile_pixels"]},
+    )
+
+
+def test_pages_are_admitted_within_the_memory_budget_and_huge_ones_run_alone_in_smaller_tiles(tmp_path) -> None:
+    for name in ("a", "b", "c"):
+        shutil.copy(FIXTURE, tmp_path / f"{name}.jpg")
+    huge = np.zeros((4000, 6000, 3), np.uint8)
+    cv2.putText(huge, "47", (3000, 2000), cv2.FONT_HERSHEY_SIMPLEX, 4, (0, 0, 230), 8)
+    cv2.imwrite(str(tmp_path / "d.png"), huge)
+
+    settings = DetectionSettings(workers=3, adaptive_concurrency=False)
+    uc = ScanImagesBatchUseCase(
+        settings=settings, scan_one=_timed_scan, page_sizer=OpenCVImageReader(), memory_budget=200 * 2**20,
+    )
+    results = {r.image_name: r.metrics for r in uc.execute(tmp_path)}
+
+    small = [results[name] for name in ("a", "b", "c")]
+    assert all(m["tile_pixels"] == settings.tile_pixels for m in small)
+    assert max(m["start"] for m in small) < min(m["end"] for m in small)  # the small pages shared the budget
+    big = results["d"]
+    assert big["tile_pixels"] < settings.tile_pixels and big["memory.low_memory"] == 1
+    assert all(big["start"] >= m["end"] or big["end"] <= m["start"] for m in small)  # ran alone
+
+
+def _png_header(width: int, height: int) -> bytes:
+    """A PNG that declares ``width`` x ``height`` pixels (no pixel data: only the header is read)."""
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", b"") + chunk(b"IEND", b"")
+
+
+def test_page_size_reads_pages_above_the_pillow_decompression_bomb_limit(tmp_path) -> None:
+    fold_out = tmp_path / "fold_out.png"
+    fold_out.write_bytes(_png_header(30000, 8000))  # 240 Mpx
+    assert 30000 * 8000 > 2 * Image.MAX_IMAGE_PIXELS  # Pillow would refuse to open it
+
+    reader = OpenCVImageReader()
+    assert reader.page_size(fold_out) == (30000, 8000)
+    assert reader.page_size("x.png", fold_out.read_bytes()) == (30000, 8000)
+    assert Image.MAX_IMAGE_PIXELS is not None  # the limit is back in place
+    (tmp_path / "broken.png").write_bytes(b"not an image")
+    assert reader.page_size(tmp_path / "broken.png") is None
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import cv2
+
+from number_detector.application.job_profiles import apply_job_profile
+from number_detector.application.settings import DetectionSettings
+from number_detector.domain.models.tiff_page import TiffPage
+from number_detector.infrastructure.bootstrap import create_process_folder_use_case
+from number_detector.infrastructure.imaging import OpenCVImageReader
+
+FIXTURES = sorted(Path("tests/fixtures").glob("test*.jpg"))
+
+
+def _write_stack(path: Path) -> list:
+    pages = [cv2.imread(str(p)) for p in FIXTURES[:3]]
+    assert cv2.imwritemulti(str(path), pages)
+    return pages
+
+
+def test_reader_decodes_a_single_tiff_page(temp_folders) -> None:
+    stack = temp_folders["base"] / "catalog.tif"
+    pages = _write_stack(stack)
+    reader = OpenCVImageReader()
+
+    assert reader.count_pages(stack) == 3
+    assert (reader.read(TiffPage(stack, 1)) == pages[1]).all()
+    assert reader.read(TiffPage(stack, 7)) is None
+
+
+def test_multipage_tiff_pages_are_scanned_as_separate_results(temp_folders) -> None:
+    _write_stack(temp_folders["base"] / "catalog.tif")
+    settings = apply_job_profile(DetectionSettings(workers=2), "detect-only")
+
+    pages, _ = create_process_folder_use_case(settings).execute(temp_folders["base"], temp_folders["dest"])
+    images, _ = create_process_folder_use_case(settings).execute("tests/fixtures", temp_folders["dest"])
+
+    assert [r.image_name for r in pages] == ["catalog#p1", "catalog#p2", "catalog#p3"]
+    assert [r.region_counts for r in pages] == [r.region_counts for r in images[:3]]
@@ -0,0 +1,66 @@
+from dataclasses import replace
+from pathlib import Path
+
+import cv2
+
+from number_detector.application.constants import PARTS, REGION_CLASSES
+from number_detector.application.settings import DetectionSettings
+from number_detector.infrastructure.imaging import OpenCVRedDetector
+from number_detector.infrastructure.preview import PreviewPipeline
+
+FIXTURE = Path("tests/fixtures/test1.jpg")
+
+
+def _detector_boxes(settings: DetectionSettings) -> dict:
+    detector = OpenCVRedDetector(settings)
+    page = cv2.imread(str(FIXTURE))
+    return {
+        "parts": [r.bbox for r in detector.find_part_regions(page)],
+        "motors": [r.bbox for r in detector.find_motor_regions(page)],
+        "free_text": [r.bbox for r in detector.find_free_text_regions(page)],
+        "body_text": [r.bbox for r in detector.find_body_text_regions(page)],
+    }
+
+
+def test_preview_boxes_match_the_detector() -> None:
+    pipeline = PreviewPipeline()
+    assert pipeline.load(FIXTURE)
+
+    settings = DetectionSettings(tile_pixels=0)
+    assert pipeline.run(settings).boxes == _detector_boxes(settings)
+
+    tuned = replace(settings, s_min=120, part_min_h=12, motor_dilate_iters=1, body_text_min_area=400)
+    assert pipeline.run(tuned).boxes == _detector_boxes(tuned)
+
+
+def test_settings_change_recomputes_only_downstream_stages() -> None:
+    reads: list = []
+    pipeline = PreviewPipeline(region_reader=lambda s: lambda cls, roi: reads.append(roi.shape) or "12")
+    pipeline.load(FIXTURE)
+    settings = DetectionSettings(enabled_classes=(PARTS,))
+
+    first = pipeline.run(settings, ocr=True)
+    assert first.recomputed == ["page", "hsv", "mask:parts", "lines:parts", "dilate:parts", "components:parts",
+                                "boxes:parts", "ocr:parts"]
+    assert len(reads) == len(first.boxes[PARTS]) > 0
+    assert pipeline.run(settings, ocr=True).recomputed == []
+
+    looser = pipeline.run(replace(settings, part_min_h=10), ocr=True)
+    assert looser.recomputed == ["boxes:parts", "ocr:parts"]
+    assert len(looser.boxes[PARTS]) > len(first.boxes[PARTS])
+    assert len(reads) == len(set(looser.boxes[PARTS]) | set(first.boxes[PARTS]))  # only new boxes read
+
+    assert pipeline.run(replace(settings, s_min=120), ocr=False).recomputed == [
+        "mask:parts", "lines:parts", "dilate:parts", "components:parts", "boxes:parts",
+    ]
+
+
+def test_masks_are_not_overwritten_by_later_stages() -> None:
+    pipeline = PreviewPipeline()
+    pipeline.load(FIXTURE)
+    settings = DetectionSettings()
+
+    masks = [pipeline.mask(settings, cls).copy() for cls in REGION_CLASSES]
+    pipeline.run(settings)
+    for cls, mask in zip(REGION_CLASSES, masks):
+        assert (pipeline.mask(settings, cls) == mask).all()
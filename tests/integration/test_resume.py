@@ -0,0 +1,105 @@
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from number_detector.application.constants import DEFAULT_JOURNAL_FILENAME, DEFAULT_OUTPUT_FILENAME
+from number_detector.application.job_profiles import apply_job_profile
+from number_detector.application.settings import DetectionSettings
+from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.infrastructure.bootstrap import create_process_folder_use_case
+from number_detector.infrastructure.journal import JsonlJournal
+
+FIXTURES = sorted(Path("tests/fixtures").glob("test*.jpg"))
+PAGES = 40
+
+
+def _journal_lines(path: Path) -> int:
+    """Journaled items, not counting the run header."""
+    return max(0, path.read_bytes().count(b"\n") - 1) if path.exists() else 0
+
+
+@pytest.mark.skipif(os.name != "posix", reason="kills the run's process group")
+def test_killed_run_resumes_from_journal(temp_folders) -> None:
+    folder, output = temp_folders["base"], temp_folders["dest"]
+    for i in range(PAGES):
+        shutil.copy(FIXTURES[i % len(FIXTURES)], folder / f"p{i:02d}.jpg")
+    journal = output / DEFAULT_JOURNAL_FILENAME
+
+    run = subprocess.Popen(
+        [sys.executable, "-m", "number_detector.presentation.cli", "scan", str(folder), "-o", str(output),
+         "--profile", "detect-only", "--workers", "1"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 60
+    while _journal_lines(journal) < 5 and run.poll() is None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    os.killpg(run.pid, signal.SIGKILL)
+    run.wait()
+
+    journaled = _journal_lines(journal)
+    assert 5 <= journaled < PAGES
+    assert not (output / DEFAULT_OUTPUT_FILENAME).exists()
+
+    reported: list[str] = []
+    settings = apply_job_profile(DetectionSettings(workers=2), "detect-only")
+    results, excel_path = create_process_folder_use_case(settings).execute(
+        folder, output, on_result=lambda r, done, total, item: reported.append(item), resume=True
+    )
+
+    # Journaled results are reported first (e.g. to fill the GUI table), then the rescanned ones.
+    assert len(reported) == PAGES
+    assert sorted(reported[:journaled]) == reported[:journaled]
+    assert [r.image_name for r in results] == [f"p{i:02d}" for i in range(PAGES)]
+    assert all(r.error is None for r in results)
+    # Pages are copies of the fixtures: journaled and rescanned copies must agree.
+    for i, r in enumerate(results):
+        assert r.region_counts == results[i % len(FIXTURES)].region_counts
+    assert len(pd.read_excel(excel_path)) == PAGES
+    assert _journal_lines(journal) == PAGES
+
+
+def test_journal_ignores_torn_lines_and_failed_items(tmp_path) -> None:
+    path = tmp_path / "run.jsonl"
+    journal = JsonlJournal(path)
+    journal.record("a.jpg", DetectionResult("a", [1], []))
+    journal.record("b.jpg", DetectionResult("b", [], [], error="No se pudo abrir"))
+    journal.close()
+    with path.open("a") as f:
+        f.write('{"item": "c.jpg", "res')  # killed mid-write
+
+    resumed = JsonlJournal(path, resume=True)
+    assert list(resumed.completed()) == ["a.jpg"]
+    resumed.record("c.jpg", DetectionResult("c", [3], []))
+    resumed.close()
+
+    reread = JsonlJournal(path, resume=True)
+    reread.close()
+    assert sorted(reread.completed()) == ["a.jpg", "c.jpg"]
+
+
+def test_journal_of_another_folder_or_settings_is_not_resumed(tmp_path) -> None:
+    path = tmp_path / "run.jsonl"
+    journal = JsonlJournal(path, input_dir=tmp_path / "in", settings_hash="a")
+    journal.record("a.jpg", DetectionResult("a", [1], []))
+    journal.close()
+
+    assert JsonlJournal.can_resume(path, tmp_path / "in" / ".." / "in", "a")
+    assert not JsonlJournal.can_resume(path, tmp_path / "other", "a")
+    assert not JsonlJournal.can_resume(path, tmp_path / "in", "b")
+
+    restarted = JsonlJournal(path, resume=True, input_dir=tmp_path / "in", settings_hash="b")
+    restarted.close()
+    assert restarted.completed() == {}
+    assert JsonlJournal.can_resume(path, tmp_path / "in", "b")
+    resumed = JsonlJournal(path, resume=True, input_dir=tmp_path / "in", settings_hash="b")
+    resumed.close()
+    assert resumed.completed() == {}
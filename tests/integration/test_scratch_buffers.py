@@ -0,0 +1,35 @@
+import tracemalloc
+from pathlib import Path
+
+import cv2
+
+from number_detector.application.settings import DetectionSettings
+from number_detector.infrastructure.imaging import OpenCVRedDetector
+
+
+def _traced_peak(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_repeat_detection_reuses_scratch_buffers() -> None:
+    image = cv2.imread(str(Path("tests/fixtures/test1.jpg")))
+    detector = OpenCVRedDetector(DetectionSettings())
+
+    def detect_all() -> None:
+        detector.find_part_bboxes(image)
+        detector.find_motor_bboxes(image)
+        detector.find_free_text_bboxes(image)
+        detector.find_body_text_bboxes(image)
+
+    warm_up = _traced_peak(detect_all)
+    arena_bytes = detector.scratch.nbytes
+    repeat = _traced_peak(detect_all)
+
+    # Once warm, no per-call full-size mask/HSV/label arrays are allocated.
+    assert detector.scratch.nbytes == arena_bytes
+    assert repeat < image.shape[0] * image.shape[1] / 4 < warm_up
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from number_detector.application.constants import PARTS
+from number_detector.application.evaluation import LabelledPage
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.sweep import grid_candidates, rank_sweep_results
+from number_detector.infrastructure.sweep import run_sweep
+
+FIXTURE = Path(__file__).resolve().parents[1] / "fixtures" / "test3.jpg"
+
+
+def _reads_47(settings: DetectionSettings):
+    return lambda region_class, roi: "47" if region_class == PARTS else ""
+
+
+def test_sweep_scores_each_candidate_and_reuses_ocr_across_them() -> None:
+    page = LabelledPage(image=FIXTURE, part_numbers=frozenset({47}), parts_exhaustive=True)
+    base = DetectionSettings(enabled_classes=(PARTS,))
+    candidates = grid_candidates({"part_min_h": [18, 500], "part_max_w": [120, 121]})
+
+    results = run_sweep([page], candidates, base=base, region_reader=_reads_47)
+
+    by_min_h = {(r.changes["part_min_h"], r.changes["part_max_w"]): r for r in results}
+    assert by_min_h[18, 120].scores.parts.recall == 1.0 and by_min_h[18, 120].regions > 0
+    assert by_min_h[500, 120].scores.parts.recall == 0.0 and by_min_h[500, 120].regions == 0
+    # the same boxes under another filter value are not read again
+    assert by_min_h[18, 121].regions == by_min_h[18, 120].regions
+    assert by_min_h[18, 120].ocr_reads + by_min_h[18, 121].ocr_reads == by_min_h[18, 120].regions
+    assert rank_sweep_results(results)[0].changes["part_min_h"] == 18
+
+
+def test_parallel_sweep_matches_the_serial_one() -> None:
+    pages = [LabelledPage(image=FIXTURE, part_numbers=frozenset({47})), LabelledPage(image=FIXTURE)]
+    base = DetectionSettings(enabled_classes=(PARTS,))
+    candidates = grid_candidates({"s_min": [120, 150], "part_min_h": [12, 18]})
+
+    serial = run_sweep(pages, candidates, base=base, region_reader=_reads_47)
+    parallel = run_sweep(pages, candidates, base=base, region_reader=_reads_47, workers=4)
+
+    assert [(r.changes, r.scores, r.regions, r.pages) for r in parallel] == \
+        [(r.changes, r.scores, r.regions, r.pages) for r in serial]
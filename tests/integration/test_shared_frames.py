@@ -0,0 +1,102 @@
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from number_detector.application.job_profiles import apply_job_profile
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.use_cases.scan_batch_images_use_case import ScanImagesBatchUseCase
+from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.infrastructure.bootstrap import create_process_folder_use_case
+from number_detector.infrastructure.shared_frames import FrameLease, FrameRing, StaleFrameError, attach_frame
+
+FIXTURE = Path("tests/fixtures/test1.jpg")
+
+
+def _checksum(lease: FrameLease) -> int:
+    return int(attach_frame(lease).sum(dtype=np.int64))
+
+
+def _crash_on_second(image_path: str, settings: dict, debug: bool, debug_dir, data, name) -> DetectionResult:
+    if image_path.endswith("b.jpg"):
+        os._exit(1)
+    return DetectionResult(image_name=name, part_numbers=[], motor_codes=[])
+
+
+class _CountingRing(FrameRing):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.leased: list[FrameLease] = []
+        self.released: list[FrameLease] = []
+
+    def lease(self, data: bytes):
+        lease = super().lease(data)
+        if lease is not None:
+            self.leased.append(lease)
+        return lease
+
+    def release(self, lease: FrameLease) -> None:
+        self.released.append(lease)
+        super().release(lease)
+
+
+def test_leased_frame_is_visible_to_worker_processes_without_copying() -> None:
+    data = FIXTURE.read_bytes()
+    expected = cv2.imread(str(FIXTURE))
+
+    with FrameRing(slots=2, slot_bytes=expected.nbytes) as ring:
+        lease = ring.lease(data)
+        assert ring.free_slots == 1
+        assert (attach_frame(lease) == expected).all()
+        with ProcessPoolExecutor(max_workers=1) as ex:
+            assert ex.submit(_checksum, lease).result() == int(expected.sum(dtype=np.int64))
+
+        ring.release(lease)
+        assert ring.free_slots == 2
+        with pytest.raises(StaleFrameError):
+            attach_frame(lease)
+        segment = lease.segment
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=segment)
+
+
+def test_ring_declines_frames_that_do_not_fit_or_have_no_free_slot() -> None:
+    data = FIXTURE.read_bytes()
+
+    with FrameRing(slots=1, slot_bytes=1024) as small:
+        assert small.lease(data) is None
+        assert small.free_slots == 1
+    with FrameRing(slots=1, slot_bytes=8 * 1024 * 1024) as ring:
+        assert ring.lease(data) is not None
+        assert ring.lease(data) is None
+        assert ring.lease(b"not an image") is None
+
+
+def test_slots_are_released_when_a_worker_crashes(temp_folders) -> None:
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        shutil.copy(FIXTURE, temp_folders["base"] / name)
+    ring = _CountingRing(slots=4, slot_bytes=8 * 1024 * 1024)
+    scan = ScanImagesBatchUseCase(DetectionSettings(workers=1), scan_one=_crash_on_second, frames=ring)
+
+    results = scan.execute(temp_folders["base"])
+
+    assert any(r.error for r in results)
+    assert ring.leased and sorted(l.slot for l in ring.released) == sorted(l.slot for l in ring.leased)
+    assert ring.free_slots == 0 and ring._shm is None  # closed and unlinked
+
+
+def test_shared_frame_handoff_matches_worker_decoding(temp_folders) -> None:
+    settings = apply_job_profile(DetectionSettings(workers=2), "detect-only")
+    plain, _ = create_process_folder_use_case(settings).execute("tests/fixtures", temp_folders["dest"])
+
+    settings.shm_slots = 8
+    settings.shm_slot_bytes = 8 * 1024 * 1024
+    shared, _ = create_process_folder_use_case(settings).execute("tests/fixtures", temp_folders["dest"])
+
+    assert [r.region_counts for r in shared] == [r.region_counts for r in plain]
@@ -0,0 +1,70 @@
+from number_detector.domain.models.bounding_box import BoundingBox
+from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.domain.models.detections import Detections
+from number_detector.infrastructure.sqlite_store import MOTOR_QUERY, PART_QUERY, SqliteResultsStore
+from number_detector.presentation.cli import main
+
+
+def _result(name: str, parts: list[int], motors: list[str] = (), **kwargs) -> DetectionResult:
+    return DetectionResult(image_name=name, part_numbers=parts, motor_codes=list(motors), **kwargs)
+
+
+def test_store_answers_part_and_motor_lookups(temp_folders) -> None:
+    db = temp_folders["dest"] / "results.sqlite"
+    detections = Detections()
+    detections.append("parts", BoundingBox(1, 2, 3, 4), "12", 91.5)
+    with SqliteResultsStore(db, batch_size=2) as store:
+        store.add(_result("p1", [7571, 12], ["CAXA"], free_text=["nota"]), source="cat_a")
+        store.add(_result("p2", [12], detections=detections), source="cat_a")
+        store.add(_result("p1", [7571]), source="cat_b")
+
+        assert store.images_with_part(7571) == [("cat_a", "p1"), ("cat_b", "p1")]
+        assert store.images_with_part(12) == [("cat_a", "p1"), ("cat_a", "p2")]
+        assert store.images_with_motor("CAXA") == [("cat_a", "p1")]
+        assert store.image("p2")[0].detections == detections
+        assert store.image("p1")[0].free_text == ["nota"]
+
+        # Re-scanning an image replaces its rows.
+        store.add(_result("p1", [99]), source="cat_a")
+        assert store.images_with_part(7571) == [("cat_b", "p1")]
+        assert [r.part_numbers for r in store.image("p1")] == [[99], [7571]]
+
+
+def test_pages_sharing_a_name_in_one_source_are_kept_apart(temp_folders) -> None:
+    # An archive listing 2021/p1.jpg and 2022/p1.jpg yields two results named "p1"
+    with SqliteResultsStore(temp_folders["dest"] / "results.sqlite") as store:
+        store.add(_result("p1", [2021]), source="catalog.zip", item="2021/p1.jpg")
+        store.add(_result("p1", [2022]), source="catalog.zip", item="2022/p1.jpg")
+        store.add(_result("p1", [2023]), source="catalog.zip", item="2022/p1.jpg")  # re-scanned
+
+        assert store.images_with_part(2021) == [("catalog.zip", "p1")]
+        assert store.images_with_part(2022) == []
+        assert sorted(r.part_numbers for r in store.image("p1")) == [[2021], [2023]]
+
+
+def test_part_and_motor_lookups_search_their_indexes_on_a_large_store(temp_folders) -> None:
+    db = temp_folders["dest"] / "results.sqlite"
+    with SqliteResultsStore(db, batch_size=1000) as store:
+        for i in range(5000):
+            store.add(_result(f"p{i}", [i * 20 + k for k in range(20)], [f"M{i}"]), source="catalog")
+        store.flush()
+
+        def plan(query: str, value: object) -> list[str]:
+            return [row[-1] for row in store.conn.execute(f"EXPLAIN QUERY PLAN {query}", (value,))]
+
+        part_plan = plan(PART_QUERY, 7571)
+        motor_plan = plan(MOTOR_QUERY, "M378")
+        hits = store.images_with_part(7571)
+
+    assert any(step.startswith("SEARCH p USING COVERING INDEX idx_parts_number") for step in part_plan)
+    assert any(step.startswith("SEARCH m USING COVERING INDEX idx_motors_code") for step in motor_plan)
+    assert not any(step.startswith("SCAN") for step in part_plan + motor_plan)
+    assert hits == [("catalog", "p378")]
+
+
+def test_cli_query_prints_matching_images(temp_folders, capsys) -> None:
+    with SqliteResultsStore(temp_folders["dest"] / "numeros_rojos.sqlite") as store:
+        store.add(_result("page7", [7571]), source="catalog")
+
+    assert main(["query", str(temp_folders["dest"]), "--part", "7571"]) == 0
+    assert capsys.readouterr().out.splitlines() == ["page7\tcatalog"]
@@ -0,0 +1,49 @@
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from number_detector.application.settings import DetectionSettings
+from number_detector.infrastructure.imaging import OpenCVRedDetector
+
+
+def _all_boxes(detector: OpenCVRedDetector, image) -> list:
+    return [
+        detector.find_part_bboxes(image),
+        [bb for bb, _ in detector.find_motor_bboxes(image)],
+        [bb for bb, _ in detector.find_free_text_bboxes(image)],
+        [bb for bb, _ in detector.find_body_text_bboxes(image)],
+    ]
+
+
+def test_tiled_detection_matches_full_frame_on_fixtures() -> None:
+    full = OpenCVRedDetector(DetectionSettings(tile_pixels=0))
+    tiled = OpenCVRedDetector(DetectionSettings(tile_pixels=300_000))
+
+    for path in sorted(Path("tests/fixtures").glob("test*.jpg")):
+        image = cv2.imread(str(path))
+        assert _all_boxes(tiled, image) == _all_boxes(full, image)
+
+
+def test_tiled_detection_peak_memory_is_bounded_by_tile_size() -> None:
+    rng = np.random.default_rng(0)
+    page = np.full((6000, 1000, 3), 255, np.uint8)
+    for _ in range(150):
+        origin = (int(rng.integers(0, 900)), int(rng.integers(30, 5990)))
+        cv2.putText(page, str(int(rng.integers(10, 9999))), origin, cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 220), 2)
+
+    def detect(tile_pixels: int) -> tuple[list, int]:
+        detector = OpenCVRedDetector(DetectionSettings(tile_pixels=tile_pixels))
+        tracemalloc.start()
+        try:
+            boxes = detector.find_part_bboxes(page)
+            return boxes, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    full_boxes, full_peak = detect(0)
+    tiled_boxes, tiled_peak = detect(500_000)
+
+    assert tiled_boxes == full_boxes
+    assert tiled_peak < page.nbytes / 2 < full_peak
@@ -0,0 +1,25 @@
+from number_detector.application.admission import MemoryAdmission, low_memory_settings, peak_page_bytes
+from number_detector.application.settings import DetectionSettings
+
+
+def test_peak_estimate_follows_coarse_decode_and_tiling() -> None:
+    plain = DetectionSettings(tile_pixels=0)
+    assert peak_page_bytes(2000, 1000, plain) == 2_000_000 * (3 + 24)
+    assert peak_page_bytes(2000, 1000, DetectionSettings(tile_pixels=0, coarse_factor=2)) == \
+        2_000_000 * 3 + 500_000 * (3 + 24)
+    assert peak_page_bytes(10_000, 10_000, DetectionSettings(tile_pixels=16_000_000)) == \
+        100_000_000 * 3 + 16_000_000 * 24
+
+    budget = 500 * 2**20
+    tiled = low_memory_settings(10_000, 10_000, DetectionSettings(), budget)
+    assert tiled.tile_pixels < 16_000_000 and peak_page_bytes(10_000, 10_000, tiled) <= budget
+    assert low_memory_settings(2000, 1000, plain, budget) is plain
+
+
+def test_admission_keeps_the_sum_under_budget_but_always_admits_a_lone_page() -> None:
+    memory = MemoryAdmission(budget=100)
+    assert memory.try_admit(60) and not memory.try_admit(50) and memory.try_admit(40)
+    memory.release(60)
+    memory.release(40)
+    assert memory.try_admit(500)  # nothing else in flight
+    assert not memory.try_admit(1)
@@ -0,0 +1,57 @@
+from number_detector.application.concurrency import HillClimbingLimit, format_concurrency_report
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _run(limiter: HillClimbingLimit, clock: FakeClock, rate, pages: int) -> None:
+    """Complete ``pages`` tasks at ``rate(limit)`` pages/second."""
+    for _ in range(pages):
+        clock.now += 1 / rate(limiter.limit)
+        limiter.completed()
+
+
+def test_limit_climbs_to_the_throughput_peak_and_settles() -> None:
+    clock = FakeClock()
+    limiter = HillClimbingLimit(minimum=1, maximum=16, start=2, window_seconds=1.0, clock=clock)
+
+    _run(limiter, clock, lambda level: 10 * min(level, 6) - max(0, level - 6) * 5, pages=5000)
+
+    assert limiter.settled and limiter.limit == 6
+    assert [s.limit for s in limiter.history][:5] == [2, 3, 4, 5, 6]
+    assert format_concurrency_report(limiter)[0] == "Concurrencia: 6 tareas en vuelo (estable)"
+
+
+def test_flat_throughput_keeps_one_task_per_worker() -> None:
+    # As configured by the batch scan for 4 workers
+    clock = FakeClock()
+    limiter = HillClimbingLimit(minimum=1, maximum=4, start=4, window_seconds=1.0, clock=clock)
+
+    _run(limiter, clock, lambda level: 20.0, pages=2000)
+
+    assert limiter.settled and limiter.limit == 4
+
+
+def test_flat_throughput_climbing_from_a_low_level_settles_high() -> None:
+    clock = FakeClock()
+    limiter = HillClimbingLimit(minimum=1, maximum=8, start=1, window_seconds=1.0, clock=clock)
+
+    _run(limiter, clock, lambda level: 20.0 + 0.1 * level, pages=4000)
+
+    assert limiter.settled and limiter.limit == 8
+
+
+def test_limit_drops_below_the_worker_count_when_fewer_pages_at_once_are_faster() -> None:
+    # e.g. 4 workers whose pages contend for memory bandwidth: 2 at once is the sweet spot
+    clock = FakeClock()
+    limiter = HillClimbingLimit(minimum=1, maximum=4, start=4, window_seconds=1.0, clock=clock)
+
+    _run(limiter, clock, {1: 20.0, 2: 30.0, 3: 25.0, 4: 22.0}.__getitem__, pages=2000)
+
+    assert limiter.settled and limiter.limit == 2
+    assert [s.limit for s in limiter.history][:3] == [4, 3, 2]
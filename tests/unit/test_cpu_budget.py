@@ -0,0 +1,29 @@
+from number_detector.infrastructure.runtime import cgroup_cpu_quota, plan_cpu_budget
+
+
+def test_cgroup_quota_reads_v2_and_v1_limits(tmp_path) -> None:
+    (tmp_path / "cpu.max").write_text("250000 100000\n")
+    assert cgroup_cpu_quota(tmp_path) == 2.5
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cgroup_cpu_quota(tmp_path) is None
+
+    v1 = tmp_path / "v1"
+    (v1 / "cpu").mkdir(parents=True)
+    (v1 / "cpu" / "cpu.cfs_quota_us").write_text("400000\n")
+    (v1 / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert cgroup_cpu_quota(v1) == 4.0
+    (v1 / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    assert cgroup_cpu_quota(v1) is None
+
+
+def test_budget_splits_cpus_between_workers_and_their_threads() -> None:
+    auto = plan_cpu_budget(0, cpus=list(range(8)))
+    assert (auto.workers, auto.opencv_threads, auto.ocr_threads) == (8, 1, 1)
+
+    few = plan_cpu_budget(3, pin=True, cpus=list(range(8)))
+    assert (few.workers, few.opencv_threads, few.ocr_threads) == (3, 2, 2)
+    assert [few.worker_cpus(i) for i in range(3)] == [(0, 1), (2, 3, 4), (5, 6, 7)]
+
+    many = plan_cpu_budget(10, cpus=[4, 5, 6, 7])
+    assert (many.workers, many.opencv_threads) == (10, 1)
+    assert [many.worker_cpus(i) for i in range(6)] == [(4,), (5,), (6,), (7,), (4,), (5,)]
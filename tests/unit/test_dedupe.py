@@ -0,0 +1,48 @@
+import random
+
+from number_detector.application import dedupe
+from number_detector.application.dedupe import cluster_duplicates, duplicate_groups, hamming
+
+
+def test_near_hashes_join_the_first_representative_and_groups_list_the_copies() -> None:
+    page = 0xF0F0_1234_ABCD_0F0F
+    other = ~page & (2**64 - 1)
+    hashes = [page, other, page ^ 0b101, None, page ^ (0b1111 << 40), other]
+
+    representatives = cluster_duplicates(hashes, max_distance=3)
+
+    assert representatives == [0, 1, 0, 3, 4, 1]
+    assert duplicate_groups(representatives) == {0: [2], 1: [5]}
+    # the pixel check can veto a hash match
+    assert cluster_duplicates(hashes, 3, same_page=lambda rep, i: rep != 0) == [0, 1, 2, 3, 4, 1]
+
+
+def test_chunked_lookup_finds_every_match_a_full_scan_would() -> None:
+    rng = random.Random(7)
+    seeds = [rng.getrandbits(64) for _ in range(20)]
+    hashes = [seeds[rng.randrange(20)] ^ sum(1 << rng.randrange(64) for _ in range(rng.randrange(6))) for _ in range(300)]
+
+    representatives = cluster_duplicates(hashes, max_distance=5)
+
+    expected = []
+    for i, h in enumerate(hashes):
+        reps = [j for j in range(i) if expected[j] == j]
+        expected.append(next((j for j in reps if hamming(h, hashes[j]) <= 5), i))
+    assert representatives == expected
+
+
+def test_chunks_cover_the_hash_exactly_so_unrelated_pages_are_not_compared(monkeypatch) -> None:
+    rng = random.Random(3)
+    hashes = [rng.getrandbits(64) for _ in range(2000)]
+    calls = 0
+
+    def counting_hamming(a: int, b: int) -> int:
+        nonlocal calls
+        calls += 1
+        return hamming(a, b)
+
+    monkeypatch.setattr(dedupe, "hamming", counting_hamming)
+    representatives = cluster_duplicates(hashes, max_distance=8)  # the default dedupe_max_distance
+
+    assert representatives == list(range(2000))
+    assert calls < len(hashes) * (len(hashes) - 1) // 2 // 10
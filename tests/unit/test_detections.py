@@ -0,0 +1,32 @@
+import pickle
+
+from number_detector.domain.models.bounding_box import BoundingBox
+from number_detector.domain.models.detections import Detection, Detections
+
+
+def test_detections_round_trip_rows_and_counts() -> None:
+    detections = Detections()
+    detections.append("parts", BoundingBox(1, 2, 3, 4), "7571", 91.3)
+    detections.append("motors", BoundingBox(5, 6, 7, 8))
+    detections.append("parts", BoundingBox(9, 10, 11, 12), "12")
+
+    assert len(detections) == 3
+    assert detections[1] == Detection("motors", BoundingBox(5, 6, 7, 8), "", -1.0)
+    assert list(detections.rows())[0] == ("parts", 1, 2, 3, 4, "7571", 91.3)
+    assert detections.count("parts") == 2
+    assert detections.count("body_text") == 0
+    assert detections.counts() == {"parts": 2, "motors": 1}
+    assert pickle.loads(pickle.dumps(detections)) == detections
+    copy = detections.copy()
+    copy.append("parts", BoundingBox(0, 0, 1, 1))
+    assert len(detections) == 3 and copy.count("parts") == 3
+
+
+def test_detections_pickle_smaller_than_per_box_objects() -> None:
+    detections = Detections()
+    boxes = []
+    for i in range(500):
+        detections.append("parts", BoundingBox(i, i + 1, 40, 20), str(i), 90.0)
+        boxes.append(Detection("parts", BoundingBox(i, i + 1, 40, 20), str(i), 90.0))
+
+    assert len(pickle.dumps(detections)) * 1.5 < len(pickle.dumps(boxes))
@@ -0,0 +1,8 @@
+from number_detector.application.evaluation import pareto_front
+
+
+def test_pareto_front_keeps_only_non_dominated_points() -> None:
+    # (pages/s, recall, precision)
+    points = [(2.0, 0.9, 1.0), (4.0, 0.8, 1.0), (1.5, 0.85, 1.0), (4.0, 0.8, 0.9), (2.0, 0.9, 1.0)]
+
+    assert pareto_front(points) == [True, True, False, False, True]
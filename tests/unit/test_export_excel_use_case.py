@@ -1,5 +1,9 @@
-from number_detector.application.use_cases.export_excel_use_case import ExportExcelUseCase
+from number_detector.application.job_profiles import apply_job_profile
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.use_cases.export_excel_use_case import ExportExcelUseCase, export_columns
+from number_detector.domain.models.bounding_box import BoundingBox
 from number_detector.domain.models.detection_result import DetectionResult
+from number_detector.domain.models.detections import Detections
 
 
 class FakeExporter:
@@ -31,3 +35,58 @@ def test_export_excel_maps_detection_results_to_rows(tmp_path) -> None:
         ["img-1", 456, "1.5/B38A15P", "Berlina", "Plug-in Hybrid"],
         ["img-2", "", "/ZKU-ZK02", "Station Wagon", "ALLTRACK"],
     ]
+
+
+def test_export_excel_follows_job_profile_columns(tmp_path) -> None:
+    detections = Detections()
+    detections.append("parts", BoundingBox(1, 2, 3, 4), "123", 91.0)
+    results = [
+        DetectionResult("img-1", [123], ["1.5/B38A15P"], ["Plug-in Hybrid"], ["Berlina"], detections=detections),
+        DetectionResult("img-2", [], ["/ZKU-ZK02"]),
+    ]
+    motors = apply_job_profile(DetectionSettings(), "motors")
+    detect_only = apply_job_profile(DetectionSettings(), "detect-only")
+
+    motors_exporter = FakeExporter()
+    ExportExcelUseCase(motors_exporter, settings=motors).execute(results, tmp_path / "motors.xlsx")
+    counts_exporter = FakeExporter()
+    ExportExcelUseCase(counts_exporter, settings=detect_only).execute(results, tmp_path / "counts.xlsx")
+
+    assert export_columns(motors) == ["Archivo", "Motor"]
+    assert motors_exporter.rows == [["img-1", "1.5/B38A15P"], ["img-2", "/ZKU-ZK02"]]
+    assert export_columns(detect_only)[1] == "Numero (regiones)"
+    assert counts_exporter.rows == [["img-1", 1, 0, 0, 0], ["img-2", 0, 0, 0, 0]]
+
+
+def test_export_excel_adds_one_row_per_detection_when_enabled(tmp_path) -> None:
+    class DetectionsExporter(FakeExporter):
+        def export(self, rows, output_path, detection_rows=None):
+            self.detection_rows = detection_rows
+            return super().export(rows, output_path)
+
+    detections = Detections()
+    detections.append("parts", BoundingBox(1, 2, 3, 4), "123", 91.0)
+    results = [DetectionResult("img-1", [123], [], detections=detections)]
+    exporter = DetectionsExporter()
+
+    ExportExcelUseCase(exporter, settings=DetectionSettings(export_detections=True)).execute(results, tmp_path / "r.xlsx")
+
+    assert exporter.detection_rows == [["img-1", "parts", 1, 2, 3, 4, "123", 91.0]]
+
+
+def test_export_excel_lists_pages_copied_from_a_duplicate(tmp_path) -> None:
+    class DuplicatesExporter(FakeExporter):
+        def export(self, rows, output_path, duplicate_rows=None):
+            self.duplicate_rows = duplicate_rows
+            return super().export(rows, output_path)
+
+    results = [
+        DetectionResult("page", [12], []),
+        DetectionResult("page-copy", [12], [], duplicate_of="page"),
+    ]
+    exporter = DuplicatesExporter()
+
+    ExportExcelUseCase(exporter).execute(results, tmp_path / "r.xlsx")
+
+    assert [row[0] for row in exporter.rows] == ["page", "page-copy"]
+    assert exporter.duplicate_rows == [["page-copy", "page"]]
@@ -1,4 +1,8 @@
+import tarfile
+import zipfile
+
 from number_detector.application.use_cases.list_images_use_case import ListImagesUseCase
+from number_detector.infrastructure.archives import ZipTarArchiveReader
 
 
 def test_list_images_returns_supported_files_sorted(temp_folders) -> None:
@@ -18,3 +22,58 @@ def test_list_images_returns_empty_for_missing_folder(temp_folders) -> None:
     result = ListImagesUseCase().execute(temp_folders["base"] / "missing")
 
     assert result.images == []
+
+
+def test_list_images_enumerates_zip_and_tar_members_without_extracting(temp_folders) -> None:
+    folder = temp_folders["base"]
+    with zipfile.ZipFile(folder / "catalog.zip", "w") as zf:
+        zf.writestr("catalog/B.JPG", b"b")
+        zf.writestr("catalog/a.png", b"a")
+        zf.writestr("catalog/notes.txt", b"text")
+        zf.writestr("__MACOSX/catalog/._a.png", b"junk")
+    (folder / "c.png").write_bytes(b"c")
+    with tarfile.open(folder / "catalog.tar", "w") as tf:
+        tf.add(folder / "c.png", arcname="pages/c.png")
+
+    archives = ZipTarArchiveReader()
+    zipped = ListImagesUseCase(archives=archives).execute(folder / "catalog.zip").images
+    tarred = ListImagesUseCase(archives=archives).execute(folder / "catalog.tar").images
+
+    assert [(m.member, m.stem) for m in zipped] == [("catalog/a.png", "a"), ("catalog/B.JPG", "B")]
+    assert [archives.read_member(m) for m in zipped] == [b"a", b"b"]
+    assert [m.name for m in tarred] == ["c.png"]
+    assert archives.read_member(tarred[0]) == b"c"
+    archives.close()
+    assert ListImagesUseCase().execute(folder / "catalog.zip").images == []  # no archive reader
+
+
+class _FakePageCounter:
+    def __init__(self, pages: dict[str, int]):
+        self.pages = pages
+
+    def count_pages(self, image_path) -> int:
+        return self.pages.get(image_path.name, 1)
+
+
+def test_list_images_expands_multipage_tiffs_into_pages(temp_folders) -> None:
+    folder = temp_folders["base"]
+    for name in ("a.png", "catalog.tif", "single.tiff"):
+        (folder / name).write_text("image")
+
+    result = ListImagesUseCase(page_counter=_FakePageCounter({"catalog.tif": 3})).execute(folder)
+
+    assert [item.stem for item in result.images] == ["a", "catalog#p1", "catalog#p2", "catalog#p3", "single"]
+
+
+def test_iter_found_streams_the_listing_that_arrange_orders(temp_folders) -> None:
+    folder = temp_folders["base"]
+    for name in ("c.png", "A.jpg", "b.tif", "skip.txt"):
+        (folder / name).write_text("image")
+    (folder / "dir.png").mkdir()
+
+    uc = ListImagesUseCase()
+    found = list(uc.iter_found(folder))
+
+    assert sorted(p.name for p in found) == ["A.jpg", "b.tif", "c.png"]
+    assert uc.arrange(found) == uc.execute(folder)
+    assert [p.name for p in uc.arrange(reversed(found)).images] == ["A.jpg", "b.tif", "c.png"]
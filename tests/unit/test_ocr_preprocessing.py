@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+
+from number_detector.application.settings import DetectionSettings
+from number_detector.infrastructure.ocr import FastTesseractService, TesseractService
+
+
+def _text_roi(font_scale: float) -> np.ndarray:
+    roi = np.full((int(60 * font_scale), int(220 * font_scale), 3), 255, np.uint8)
+    cv2.putText(roi, "1.5/B38A", (5, int(40 * font_scale)), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (200, 0, 0), max(1, int(3 * font_scale)))
+    return roi
+
+
+def test_adaptive_prep_normalizes_glyph_height_and_reuses_buffers() -> None:
+    service = TesseractService("tesseract", settings=DetectionSettings(ocr_adaptive_scale=True, ocr_max_scale=6.0))
+
+    large_height = service.measure_glyphs(service._prep(_text_roi(2.0), glyph_px=30).copy())[0]
+    small_height = service.measure_glyphs(service._prep(_text_roi(0.5), glyph_px=30).copy())[0]
+    resized_buffer = service.scratch._buffers["resized"]
+    service._prep(_text_roi(2.0), glyph_px=30)
+
+    assert abs(small_height - 30) <= 4
+    assert abs(large_height - 30) <= 4
+    assert service.scratch._buffers["resized"] is resized_buffer
+
+
+def test_fixed_prep_keeps_legacy_scale() -> None:
+    service = TesseractService("tesseract", settings=DetectionSettings(ocr_adaptive_scale=False))
+
+    th = service._prep(_text_roi(1.0), glyph_px=30)
+
+    assert th.shape == (150, 550)
+
+
+def test_fast_pass_honours_glyph_target_but_never_upscales_past_its_scale() -> None:
+    settings = DetectionSettings(ocr_adaptive_scale=True, ocr_max_scale=6.0)
+    fast = FastTesseractService("tesseract", scale=1.0, settings=settings)
+
+    small = _text_roi(0.5)
+    assert fast._prep(small, glyph_px=30).shape == small.shape[:2]  # the full pass would upscale it
+    large = _text_roi(2.0)
+    assert abs(fast.measure_glyphs(fast._prep(large, glyph_px=30).copy())[0] - 30) <= 4
+    assert fast._prep(_text_roi(1.0), scale=3.0).shape == (60, 220)
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+from number_detector.application.prefetch import ReadAhead
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.use_cases import scan_batch_images_use_case
+from number_detector.application.use_cases.scan_batch_images_use_case import ScanImagesBatchUseCase
+from number_detector.domain.models.detection_result import DetectionResult
+
+
+def _write(folder: Path, sizes: list[int]) -> list[Path]:
+    paths = []
+    for i, size in enumerate(sizes):
+        path = folder / f"{i}.jpg"
+        path.write_bytes(bytes([i]) * size)
+        paths.append(path)
+    return paths
+
+
+def test_read_ahead_yields_bytes_in_input_order(temp_folders) -> None:
+    paths = _write(temp_folders["base"], [10, 20, 30, 40])
+
+    with ReadAhead(paths, threads=3) as ahead:
+        items = [(idx, path, data) for idx, path, data in ahead]
+
+    assert [idx for idx, _, _ in items] == [0, 1, 2, 3]
+    assert [data for _, _, data in items] == [p.read_bytes() for p in paths]
+
+
+def test_read_ahead_stays_within_byte_budget_until_released(temp_folders) -> None:
+    paths = _write(temp_folders["base"], [100] * 6)
+    reads: list[Path] = []
+
+    def read(path: Path) -> bytes:
+        reads.append(path)
+        return path.read_bytes()
+
+    with ReadAhead(paths, threads=2, max_bytes=250, read=read) as ahead:
+        items = iter(ahead)
+        first = next(items)
+        second = next(items)
+        assert len(reads) == 2
+        assert ahead.held_bytes == 200
+
+        ahead.release(first[0])
+        assert ahead.held_bytes == 200  # second, plus the third read ahead
+        ahead.release(second[0])
+        assert ahead.held_bytes == 200
+
+        # Past the budget, items the consumer asks for are still read (on demand).
+        rest = list(items)
+
+    assert [idx for idx, _, _ in rest] == [2, 3, 4, 5]
+    assert len(reads) == 6
+
+
+def test_read_ahead_yields_none_for_unreadable_files(temp_folders) -> None:
+    paths = _write(temp_folders["base"], [5])
+    missing = temp_folders["base"] / "missing.jpg"
+
+    with ReadAhead([missing, *paths], threads=1) as ahead:
+        items = list(ahead)
+
+    assert items[0][2] is None
+    assert items[1][2] == paths[0].read_bytes()
+
+
+def _scan(image_path: str, settings: dict, debug: bool, debug_dir, data, name) -> DetectionResult:
+    return DetectionResult(image_name=name, part_numbers=[], motor_codes=[], error=str(data))
+
+
+def test_batch_without_prefetch_threads_builds_no_read_ahead(temp_folders, monkeypatch) -> None:
+    _write(temp_folders["base"], [10, 10])
+
+    def no_read_ahead(*args, **kwargs):
+        raise AssertionError("ReadAhead built with prefetch_threads=0")
+
+    monkeypatch.setattr(scan_batch_images_use_case, "ReadAhead", no_read_ahead)
+    uc = ScanImagesBatchUseCase(settings=DetectionSettings(workers=1, prefetch_threads=0), scan_one=_scan)
+
+    assert [r.error for r in uc.execute(temp_folders["base"])] == ["None", "None"]  # workers read the files
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+from number_detector.application.settings import DetectionSettings
+from number_detector.application.use_cases.process_folder_use_case import ProcessFolderUseCase
+from number_detector.domain.models.detection_result import DetectionResult
+
+
+class _FakeScan:
+    def execute(self, input_dir, on_progress=None, on_result=None, completed=None, images=None):
+        results = [DetectionResult(image_name=n, part_numbers=[1], motor_codes=[]) for n in ("a", "b")]
+        for i, r in enumerate(results, start=1):
+            if on_result:
+                on_result(r, i, len(results), f"{r.image_name}.jpg")
+        return results
+
+
+class _FakeExport:
+    def execute(self, results, output_path):
+        return Path(output_path)
+
+
+class _FakeSink:
+    def __init__(self, path: Path):
+        self.path = path
+        self.added: list[tuple[str, str, str]] = []
+        self.closed = False
+
+    def add(self, result: DetectionResult, source: str = "", item: str = "") -> None:
+        self.added.append((source, item, result.image_name))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_results_are_streamed_into_the_results_store(tmp_path) -> None:
+    sinks: list[_FakeSink] = []
+
+    def open_sink(path: Path) -> _FakeSink:
+        sinks.append(_FakeSink(path))
+        return sinks[-1]
+
+    seen: list[str] = []
+    uc = ProcessFolderUseCase(DetectionSettings(), _FakeScan(), _FakeExport(), results_store=open_sink)
+    uc.execute("in", tmp_path, on_result=lambda r, *_: seen.append(r.image_name))
+    uc.execute(Path("in").resolve(), tmp_path)
+
+    assert sinks[0].path == tmp_path / "numeros_rojos.sqlite"
+    source = str(Path("in").resolve())
+    assert sinks[0].added == [(source, "a.jpg", "a"), (source, "b.jpg", "b")]
+    assert sinks[1].added == sinks[0].added  # relative and absolute paths are the same source
+    assert sinks[0].closed
+    assert seen == ["a", "b"]
@@ -0,0 +1,46 @@
+import pytest
+
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from number_detector.presentation.pyside_app.results_model import ResultsTableModel  # noqa: E402
+
+Qt = QtCore.Qt
+HEADERS = ["Imagen", "Números", "Motores", "Carrocería", "Free text", "Error"]
+
+
+def _column(model, col):
+    return [model.data(model.index(r, col)) for r in range(model.rowCount())]
+
+
+def test_batches_append_in_arrival_order():
+    model = ResultsTableModel(HEADERS)
+    inserted = []
+    model.rowsInserted.connect(lambda _parent, first, last: inserted.append((first, last)))
+
+    model.append_rows([("b.png", "2", "", "", "", ""), ("a.png", "1", "", "", "", "")])
+    model.append_rows([("c.png", "3", "M1", "", "", "")])
+
+    assert inserted == [(0, 1), (2, 2)]  # one notification per batch
+    assert _column(model, 0) == ["b.png", "a.png", "c.png"]
+    assert model.data(model.index(2, 2)) == "M1"
+
+
+def test_sort_and_filter_keep_new_batches_in_place():
+    model = ResultsTableModel(HEADERS)
+    model.append_rows([("b.png", "20", "", "", "", ""), ("a.png", "10", "", "", "", "")])
+    model.sort(0, Qt.SortOrder.DescendingOrder)
+    model.append_rows([("c.png", "30", "", "", "", "")])
+    assert _column(model, 0) == ["c.png", "b.png", "a.png"]
+
+    model.set_filter("  A.PNG ")
+    assert _column(model, 0) == ["a.png"]
+    model.append_rows([("aa.png", "", "", "", "", ""), ("z.png", "", "", "", "", "")])
+    assert _column(model, 0) == ["aa.png", "a.png"]
+
+    model.set_filter("")
+    model.sort(-1)
+    assert _column(model, 0) == ["b.png", "a.png", "c.png", "aa.png", "z.png"]
+    assert model.total_rows() == 5
+
+    model.clear()
+    assert model.rowCount() == 0
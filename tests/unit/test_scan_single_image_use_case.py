@@ -1,8 +1,11 @@
 from pathlib import Path
 
+from number_detector.application.job_profiles import apply_job_profile
+from number_detector.application.settings import DetectionSettings
 from number_detector.application.use_cases.scan_single_image_use_case import ScanSingleImageUseCase
 from number_detector.domain.models.bounding_box import BoundingBox
 from number_detector.domain.models.image_region import ImageRegion
+from number_detector.domain.models.ocr_text import OcrText
 
 
 class FakeImageReader:
@@ -80,3 +83,69 @@ def test_scan_single_image_returns_error_when_image_cannot_be_read() -> None:
     assert result.free_text == []
     assert result.body_text == []
     assert result.error == "No se pudo abrir"
+
+
+def test_scan_single_image_escalates_only_failed_fast_ocr_reads() -> None:
+    class FastOcr(FakeOcr):
+        def read_digits(self, image) -> str:
+            return {"part-1": OcrText("123", 95.0), "part-2": OcrText("1Z3", 95.0)}[image]
+
+        def read_motor_text(self, image) -> str:
+            return OcrText("1.5/B38A15P", 20.0)
+
+    use_case = ScanSingleImageUseCase(FakeImageReader(image=object()), FakeDetector(), FakeOcr(), fast_ocr=FastOcr())
+
+    result = use_case.execute("sample.png")
+
+    assert result.part_numbers == [123, 4567]
+    assert result.motor_codes == ["1.5/B38A15P kw:110 idVeic:123"]
+    assert result.metrics["ocr.parts.fast"] == 2
+    assert result.metrics["ocr.parts.escalated"] == 1
+    assert result.metrics["ocr.motors.escalated"] == 1
+    assert "ocr.free_text.escalated" not in result.metrics
+
+
+def test_scan_single_image_skips_classes_missing_from_color_census() -> None:
+    class FakeCensus:
+        def present_classes(self, image):
+            return {"parts", "motors"}
+
+    use_case = ScanSingleImageUseCase(FakeImageReader(image=object()), FakeDetector(), FakeOcr(), census=FakeCensus())
+
+    result = use_case.execute("sample.png")
+
+    assert result.part_numbers == [123, 4567]
+    assert result.free_text == []
+    assert result.body_text == []
+    assert result.metrics["census.free_text.skipped"] == 1
+    assert result.metrics["census.body_text.skipped"] == 1
+    assert "census.parts.skipped" not in result.metrics
+
+
+def test_scan_single_image_detection_only_profile_emits_boxes_without_ocr() -> None:
+    class NoOcr:
+        def __getattr__(self, name):
+            raise AssertionError(f"OCR should not run: {name}")
+
+    settings = apply_job_profile(DetectionSettings(), "detect-only")
+    use_case = ScanSingleImageUseCase(FakeImageReader(image=object()), FakeDetector(), NoOcr(), settings=settings)
+
+    result = use_case.execute("sample.png")
+
+    assert result.part_numbers == []
+    assert result.region_counts == {"parts": 2, "motors": 1, "free_text": 1, "body_text": 1}
+    assert [(d.region_class, d.bbox, d.text) for d in result.detections][:2] == [
+        ("parts", BoundingBox(0, 0, 1, 1), ""),
+        ("parts", BoundingBox(1, 0, 1, 1), ""),
+    ]
+
+
+def test_scan_single_image_parts_profile_skips_other_classes() -> None:
+    settings = apply_job_profile(DetectionSettings(), "parts")
+    use_case = ScanSingleImageUseCase(FakeImageReader(image=object()), FakeDetector(), FakeOcr(), settings=settings)
+
+    result = use_case.execute("sample.png")
+
+    assert result.part_numbers == [123, 4567]
+    assert result.motor_codes == []
+    assert result.region_counts == {"parts": 2}
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from number_detector.application.settings import DetectionSettings, settings_fingerprint
+from number_detector.application.settings_profile import load_settings_profile, save_settings_profile
+
+
+def test_settings_profile_round_trips_through_json(tmp_path) -> None:
+    settings = DetectionSettings(s_min=120, motor_dilate_kernel=(11, 7), motor_region_pct=0.8, census_enabled=False)
+
+    path = save_settings_profile(settings, tmp_path / "ajustes.json")
+
+    assert json.loads(path.read_text(encoding="utf-8"))["motor_dilate_kernel"] == [11, 7]
+    assert load_settings_profile(path) == settings
+
+
+def test_partial_profiles_keep_other_fields_and_reject_unknown_ones(tmp_path) -> None:
+    path = tmp_path / "ajustes.json"
+    path.write_text('{"part_min_h": 12, "motor_region_pct": 1}', encoding="utf-8")
+
+    loaded = load_settings_profile(path)
+
+    assert loaded.part_min_h == 12 and loaded.motor_region_pct == 1.0
+    assert loaded.s_min == DetectionSettings().s_min
+
+    path.write_text('{"part_min_hh": 12}', encoding="utf-8")
+    with pytest.raises(ValueError, match="part_min_hh"):
+        load_settings_profile(path)
+    path.write_text('{"part_min_h": "12"}', encoding="utf-8")
+    with pytest.raises(ValueError, match="part_min_h"):
+        load_settings_profile(path)
+
+
+def test_settings_fingerprint_ignores_resource_settings() -> None:
+    base = settings_fingerprint(DetectionSettings())
+
+    assert settings_fingerprint(DetectionSettings(workers=7, prefetch_threads=0)) == base
+    assert settings_fingerprint(DetectionSettings(s_min=120)) != base
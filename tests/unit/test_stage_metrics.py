@@ -0,0 +1,15 @@
+from number_detector.application.stage_metrics import escalation_rates, format_stage_metrics, merge_stage_metrics
+from number_detector.domain.models.detection_result import DetectionResult
+
+
+def test_stage_metrics_report_escalation_rate_per_class() -> None:
+    results = [
+        DetectionResult("img-1", [], [], metrics={"ocr.parts.fast": 3, "ocr.parts.escalated": 1}),
+        DetectionResult("img-2", [], [], metrics={"ocr.parts.fast": 1, "ocr.motors.full": 2}),
+    ]
+
+    metrics = merge_stage_metrics(results)
+
+    assert metrics == {"ocr.parts.fast": 4, "ocr.parts.escalated": 1, "ocr.motors.full": 2}
+    assert escalation_rates(metrics) == {"parts": 0.25}
+    assert format_stage_metrics(metrics) == ["OCR parts: 1/4 escalados (25%)"]
@@ -0,0 +1,29 @@
+import pytest
+
+from number_detector.application.sweep import grid_candidates, order_for_reuse, parse_sweep_axis, random_candidates
+
+
+def test_sweep_axes_parse_lists_ranges_and_kernels() -> None:
+    assert parse_sweep_axis("s_min=120,150") == ("s_min", [120, 150])
+    assert parse_sweep_axis("part_min_h=12:18:3") == ("part_min_h", [12, 15, 18])
+    assert parse_sweep_axis("motor_region_pct=0.8:0.9:0.05") == ("motor_region_pct", [0.8, 0.85, 0.9])
+    assert parse_sweep_axis("motor_dilate_kernel=9x5,11x7") == ("motor_dilate_kernel", [(9, 5), (11, 7)])
+    assert parse_sweep_axis("ocr_cascade=true,no") == ("ocr_cascade", [True, False])
+    with pytest.raises(ValueError, match="s_mn"):
+        parse_sweep_axis("s_mn=1")
+    with pytest.raises(ValueError):
+        parse_sweep_axis("s_min=")
+
+
+def test_random_candidates_are_distinct_grid_points_and_reuse_order_groups_upstream_fields() -> None:
+    axes = {"s_min": [120, 150, 180], "part_min_h": [12, 15, 18, 21]}
+    grid = grid_candidates(axes)
+
+    drawn = random_candidates(axes, 5, seed=1)
+    assert len(drawn) == 5 and all(c in grid for c in drawn)
+    assert len({tuple(c.items()) for c in drawn}) == 5
+    assert len(random_candidates(axes, 100, seed=1)) == len(grid) == 12
+
+    order = order_for_reuse(drawn, ["s_min", "part_min_h"])
+    s_min = [drawn[i]["s_min"] for i in order]
+    assert s_min == sorted(s_min)